@@ -0,0 +1,244 @@
+"""
+Absurdle (Wordle adversarial) et recherche minimax sur la matrice de feedbacks.
+
+Dans Absurdle, il n'y a pas de secret fixé : à chaque guess, l'hôte partitionne les
+candidats restants en seaux (un par feedback) et garde le PLUS GRAND seau
+(égalité : le moins d'informations révélées, c.-à-d. le moins de V puis de J ;
+le seau tout vert n'est choisi que s'il est le seul).
+
+Côté joueur, le bon critère n'est plus l'entropie moyenne mais le pire cas :
+    worst(g) = max_p n_p(g)     (taille du seau que l'hôte gardera)
+On minimise worst (tie-break : candidats restants attendus, puis guess candidat).
+Un bloc guesses x candidats de la matrice précalculée suffit : np.bincount puis max.
+
+L'hôte étant déterministe, un coup du joueur détermine entièrement l'état suivant :
+la recherche minimax se réduit à une recherche de chemin sur les guesses, menée en
+faisceau (beam search) sur les `beam` meilleurs guesses de chaque état.
+
+Mode difficile (hard_mode) : les guesses sont limités aux candidats courants.
+
+Utilisation :
+    python absurdle.py --solve [--hard] [--beam 4]
+    python absurdle.py --play  [--hard]
+"""
+
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+
+from entropy_ranker import DEFAULT_BATCH, batch_for, bucket_counts
+from pattern_engine import code_to_pattern
+
+
+# ---------------------------------------------------------------------------
+# Scoring minimax (vectorisé)
+# ---------------------------------------------------------------------------
+def score_minimax(engine, candidates, guesses=None, batch: int = DEFAULT_BATCH):
+    """
+    Pire cas (taille du plus grand seau) et candidats restants attendus, par guess.
+
+    Retour : (guess_idx, worst, expected), tableaux alignés.
+    """
+    candidates = np.asarray(candidates)
+    batch = batch_for(engine.n_patterns, batch)
+    if guesses is None:
+        n = len(engine)
+        guess_idx = np.arange(n, dtype=np.int32)
+        parts = [slice(s, min(s + batch, n)) for s in range(0, n, batch)]
+    else:
+        guess_idx = np.asarray(guesses)
+        parts = [guess_idx[s:s + batch] for s in range(0, guess_idx.size, batch)]
+
+    worst = np.empty(guess_idx.size, dtype=np.int64)
+    expected = np.empty(guess_idx.size, dtype=np.float64)
+    pos = 0
+    for part in parts:
+        counts = bucket_counts(engine.block(part, candidates), engine.n_patterns)
+        b = counts.shape[0]
+        worst[pos:pos + b] = counts.max(axis=1)
+        expected[pos:pos + b] = (counts.astype(np.float64) ** 2).sum(axis=1) / candidates.size
+        pos += b
+    return guess_idx, worst, expected
+
+
+def rank_minimax(engine, candidates, hard_mode: bool = False, top: int = 3, batch: int = DEFAULT_BATCH) -> list:
+    """
+    Classe les guesses par pire cas croissant.
+
+    Retour : [(mot, plus grand seau, candidats restants attendus), ...]
+    """
+    candidates = np.asarray(candidates)
+    if candidates.size == 0:
+        return []
+    if candidates.size == 1:
+        return [(engine.words[candidates[0]], 1, 1.0)]
+
+    guess_idx, worst, expected = score_minimax(
+        engine, candidates, guesses=candidates if hard_mode else None, batch=batch
+    )
+    is_candidate = np.isin(guess_idx, candidates)
+    # np.lexsort : la DERNIÈRE clé est la clé principale
+    order = np.lexsort((guess_idx, ~is_candidate, expected, worst))[:top]
+    return [(engine.words[guess_idx[i]], int(worst[i]), float(expected[i])) for i in order]
+
+
+def format_minimax(ranked: list) -> str:
+    """
+    Même présentation que entropy_ranker.format_decision.
+    """
+    if not ranked:
+        return "No candidate."
+    lines = [f"Chosen word: {ranked[0][0]}", "", "Priority ranking:", ""]
+    for i, (word, worst, expected) in enumerate(ranked, 1):
+        lines.append(f"{i}. {word}  (worst case={worst}, expected remaining={expected:.1f})")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Hôte Absurdle
+# ---------------------------------------------------------------------------
+def _information(code: int, word_length: int) -> tuple:
+    pattern = code_to_pattern(code, word_length)
+    return pattern.count("V"), pattern.count("J")
+
+
+def host_response(engine, candidates, guess: str):
+    """
+    Feedback choisi par l'hôte : seau le plus grand, puis le moins informatif.
+
+    Retour : (feedback, indices des candidats du seau gardé).
+    """
+    candidates = np.asarray(candidates)
+    codes = engine.row(guess)[candidates]
+    sizes = bucket_counts(codes[None, :], engine.n_patterns)[0]
+    all_green = engine.n_patterns - 1
+
+    present = [int(c) for c in np.nonzero(sizes)[0]]
+    if len(present) > 1 and all_green in present:
+        present.remove(all_green)  # l'hôte ne concède la victoire que s'il y est forcé
+    code = min(present, key=lambda c: (-int(sizes[c]), _information(c, engine.word_length), c))
+    return code_to_pattern(code, engine.word_length), candidates[codes == code]
+
+
+class AbsurdleGame:
+    """
+    Partie contre l'hôte adversarial (éventuellement en mode difficile).
+    """
+
+    def __init__(self, engine, hard_mode: bool = False):
+        self.engine = engine
+        self.hard_mode = hard_mode
+        self.candidates = engine.all_indices()
+        self.attempts: list = []
+
+    @property
+    def solved(self) -> bool:
+        return bool(self.attempts) and self.attempts[-1][1] == "V" * self.engine.word_length
+
+    def play(self, guess: str) -> str:
+        guess = guess.strip().upper()
+        i = self.engine.index.get(guess)
+        if i is None:
+            raise ValueError(f"{guess} is not in the dictionary")
+        if self.hard_mode and not np.isin(i, self.candidates):
+            raise ValueError(f"Hard mode: {guess} is not consistent with previous feedback")
+        feedback, self.candidates = host_response(self.engine, self.candidates, guess)
+        self.attempts.append((guess, feedback))
+        return feedback
+
+
+# ---------------------------------------------------------------------------
+# Recherche minimax (faisceau)
+# ---------------------------------------------------------------------------
+def solve_absurdle(
+    engine,
+    hard_mode: bool = False,
+    beam: int = 4,
+    max_guesses: int = 10,
+    candidates=None,
+) -> Optional[list]:
+    """
+    Cherche une suite de guesses courte qui bat l'hôte (dernier feedback tout vert).
+
+    À chaque niveau, chaque état du faisceau est développé par ses `beam` meilleurs
+    guesses minimax ; les `beam` états enfants les plus petits sont gardés. Un état à
+    un seul candidat est résolu au coup suivant.
+
+    Retour : [(guess, feedback), ...] ou None si rien trouvé en `max_guesses` coups.
+    """
+    start = engine.all_indices() if candidates is None else np.asarray(candidates)
+    frontier = [([], start)]
+    seen = set()
+
+    for _ in range(max_guesses):
+        children = []
+        for path, cands in frontier:
+            if cands.size == 1:
+                word = engine.words[cands[0]]
+                return path + [(word, "V" * engine.word_length)]
+            for word, _, _ in rank_minimax(engine, cands, hard_mode=hard_mode, top=beam):
+                feedback, bucket = host_response(engine, cands, word)
+                if feedback == "V" * engine.word_length:
+                    return path + [(word, feedback)]
+                key = bucket.tobytes()
+                if key in seen:
+                    continue
+                seen.add(key)
+                children.append((path + [(word, feedback)], bucket))
+        if not children:
+            return None
+        children.sort(key=lambda child: (child[1].size, len(child[0])))
+        frontier = children[:beam]
+    return None
+
+
+def main():
+    from llm_agent import load_dictionary
+    from pattern_engine import PatternEngine
+
+    parser = argparse.ArgumentParser(description="Absurdle : hôte adversarial et solveur minimax.")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    parser.add_argument("--hard", action="store_true", help="mode difficile (guesses parmi les candidats)")
+    parser.add_argument("--beam", type=int, default=4)
+    parser.add_argument("--solve", action="store_true", help="recherche minimax d'une partie gagnante")
+    parser.add_argument("--play", action="store_true", help="jouer contre l'hôte")
+    args = parser.parse_args()
+
+    words = load_dictionary(args.dictionary)
+    if not words:
+        raise SystemExit("Dictionary is empty.")
+    engine = PatternEngine.load_or_build(words)
+
+    if args.solve:
+        t0 = time.perf_counter()
+        path = solve_absurdle(engine, hard_mode=args.hard, beam=args.beam)
+        elapsed = time.perf_counter() - t0
+        if path is None:
+            print(f"No win found ({elapsed:.1f}s).")
+            return
+        for guess, feedback in path:
+            print(f"{guess} -> {feedback}")
+        print(f"Solved in {len(path)} guesses ({elapsed:.1f}s, beam={args.beam}, hard={args.hard}).")
+
+    if args.play:
+        game = AbsurdleGame(engine, hard_mode=args.hard)
+        print("Enter a guess ('hint' for the minimax suggestion, 'quit' to stop).")
+        while not game.solved:
+            line = input(f"[{game.candidates.size} left] > ").strip()
+            if line.lower() in ("quit", "exit"):
+                break
+            if line.lower() == "hint":
+                print(format_minimax(rank_minimax(engine, game.candidates, hard_mode=args.hard)))
+                continue
+            try:
+                print(game.play(line))
+            except ValueError as e:
+                print(e)
+        if game.solved:
+            print(f"Solved in {len(game.attempts)} guesses.")
+
+
+if __name__ == "__main__":
+    main()
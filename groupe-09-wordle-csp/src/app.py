@@ -1,6 +1,20 @@
 import streamlit as st
 
-from llm_agent import interroger_agent_wordle, load_dictionary
+from llm_agent import (
+    appliquer_tentative,
+    interroger_agent_wordle,
+    load_dictionary,
+    select_candidates_for_llm,
+    stream_llm_ranking,
+)
+from pipeline_trace import PipelineTrace, RollingSummary, TraceLog, stage
+from wordle_session import WordleSession
+
+try:
+    from pattern_engine import PatternEngine
+    ENGINE_AVAILABLE = True
+except Exception:
+    ENGINE_AVAILABLE = False
 
 
 # ------------------------
@@ -16,12 +30,41 @@ st.set_page_config(
 # ------------------------
 # Dictionary + session state
 # ------------------------
-@st.cache_data
+@st.cache_resource
 def get_dictionary():
+    # cache_resource : une seule liste partagée par toutes les sessions
+    # (cache_data la re-dépicklerait à chaque exécution du script)
     return load_dictionary("wordle.txt")
 
 
+@st.cache_resource
+def get_engine(_words):
+    # Partagé entre sessions : la matrice memory-mappée n'est chargée qu'une fois
+    # (`_words` : non haché par Streamlit, le dictionnaire est unique)
+    if not ENGINE_AVAILABLE or not _words:
+        return None
+    return PatternEngine.load_or_build(_words)
+
+
+@st.cache_resource
+def get_opening_book(_engine):
+    # Livre d'ouvertures partagé par toutes les sessions (clé = historique trié)
+    if _engine is None:
+        return None
+    from opening_book import OpeningBook
+
+    return OpeningBook.load_or_build(_engine)
+
+
+@st.cache_resource
+def get_trace_log():
+    # Un seul fichier JSONL (outputs/wordle_traces.jsonl) pour toutes les sessions
+    return TraceLog()
+
+
 DICTIONARY = get_dictionary()
+ENGINE = get_engine(DICTIONARY)
+BOOK = get_opening_book(ENGINE)
 
 if "attempts" not in st.session_state:
     st.session_state.attempts = []  # [(GUESS, FEEDBACK), ...]
@@ -31,6 +74,13 @@ if "history_prompts" not in st.session_state:
     st.session_state.history_prompts = []  # free-text prompts (optional)
 if "last_result" not in st.session_state:
     st.session_state.last_result = None
+if "trace_summary" not in st.session_state:
+    st.session_state.trace_summary = RollingSummary()  # derniers tours instrumentés
+if "last_trace" not in st.session_state:
+    st.session_state.last_trace = None
+if "session" not in st.session_state:
+    # Candidats survivants (incrémental), tenu en phase avec `attempts`
+    st.session_state.session = WordleSession(DICTIONARY, engine=ENGINE)
 
 
 # ------------------------
@@ -52,6 +102,21 @@ mode = st.radio(
     horizontal=True,
 )
 
+ranker_options = ["LLM (Ollama)"] + (
+    ["Entropy (offline, no LLM)", "Minimax (Absurdle)"] if ENGINE is not None else []
+)
+ranker_label = st.radio("Next-guess ranker", ranker_options, horizontal=True)
+RANKER = {"Entropy": "entropy", "Minimax": "minimax"}.get(ranker_label.split(" ")[0], "llm")
+
+# Mode difficile : vérifié par la session (guess parmi les candidats courants)
+st.session_state.session.hard_mode = st.checkbox(
+    "Hard mode (each guess must be consistent with previous feedback)",
+    value=st.session_state.session.hard_mode,
+)
+
+# Instrumentation opt-in : durées par étape, candidats, tokens LLM (pipeline_trace.py)
+TRACE_ENABLED = st.sidebar.checkbox("Trace pipeline (timings)", value=False)
+
 with st.expander("Help / expected format", expanded=False):
     st.write("Feedback letters: **V=green**, **J=yellow**, **G=gray**.")
     st.write("Recommended input: `ORATE GVVJG` or `ORATE -> GVVJG`.")
@@ -89,10 +154,12 @@ else:
 # ------------------------
 # Actions
 # ------------------------
-colA, colB = st.columns([1, 1])
+colA, colB, colC = st.columns([1, 1, 1])
 with colA:
     run_now = st.button("Solve", use_container_width=True)
 with colB:
+    undo_now = st.button("Undo last", use_container_width=True)
+with colC:
     reset_now = st.button("Reset game", use_container_width=True)
 
 
@@ -101,12 +168,28 @@ if reset_now:
     st.session_state.history_inputs = []
     st.session_state.history_prompts = []
     st.session_state.last_result = None
+    st.session_state.session.reset()
     st.success("Reset done.")
 
 
+if undo_now:
+    undone = st.session_state.session.undo()
+    if undone:
+        st.session_state.attempts.pop()
+        g, f = undone
+        if st.session_state.history_inputs and st.session_state.history_inputs[-1] == {"Guess": g, "Feedback": f}:
+            st.session_state.history_inputs.pop()
+        st.session_state.last_result = None
+        st.success(f"Removed {g} -> {f} ({len(st.session_state.session)} candidates left).")
+    else:
+        st.info("Nothing to undo.")
+
+
 # ------------------------
 # Solve
 # ------------------------
+streamed_now = False  # résultat déjà affiché en direct pendant ce run
+
 if run_now:
     if not DICTIONARY:
         st.error("Dictionary is empty. Please check wordle.txt.")
@@ -118,16 +201,66 @@ if run_now:
                 # Keep a history of free-text prompts (optional)
                 if mode == "Free text (LLM extraction)":
                     st.session_state.history_prompts.append(prompt.strip())
-
-                result = interroger_agent_wordle(
-                    prompt_utilisateur=prompt,
-                    dictionary_words=DICTIONARY,
-                    attempts=st.session_state.attempts,
-                )
+                n_attempts = len(st.session_state.attempts)
+                trace = None
+
+                if RANKER == "llm":
+                    # CSP affiché immédiatement, ranking LLM streamé à son arrivée
+                    if TRACE_ENABLED:
+                        trace = PipelineTrace(prompt, ranker="llm")
+                    possible, result = appliquer_tentative(
+                        prompt,
+                        DICTIONARY,
+                        st.session_state.attempts,
+                        engine=ENGINE,
+                        session=st.session_state.session,
+                        trace=trace,
+                    )
+                    if possible is not None:
+                        with stage(trace, "trim"):
+                            candidates_for_llm, note = select_candidates_for_llm(possible)
+                        st.divider()
+                        st.subheader("Result")
+                        st.text(result + note)
+                        st.caption("LLM DECISION")
+                        with stage(trace, "llm_rank"):
+                            content = st.write_stream(
+                                stream_llm_ranking(
+                                    candidates_for_llm, trace=trace, word_length=st.session_state.session.word_length
+                                )
+                            )
+                        result = f"{result}{note}\nLLM DECISION:\n{content}"
+                        streamed_now = True
+                    if trace is not None:
+                        trace.meta.update(
+                            turn=len(st.session_state.attempts),
+                            accepted=possible is not None,
+                            candidates=len(possible) if possible is not None else None,
+                        )
+                        get_trace_log().append(trace)
+                        trace = trace.to_dict()
+                else:
+                    result = interroger_agent_wordle(
+                        prompt_utilisateur=prompt,
+                        dictionary_words=DICTIONARY,
+                        attempts=st.session_state.attempts,
+                        engine=ENGINE,
+                        session=st.session_state.session,
+                        ranker=RANKER,
+                        book=BOOK,
+                        with_trace=TRACE_ENABLED,
+                        trace_log=get_trace_log() if TRACE_ENABLED else None,
+                    )
+                    if TRACE_ENABLED:
+                        result, trace = result
                 st.session_state.last_result = result
+                if trace is not None:
+                    st.session_state.trace_summary.add(trace)
+                    st.session_state.last_trace = trace
 
                 # If the user used the structured mode, log it nicely
-                if mode == "Wordle (guess + feedback)":
+                # (only if the attempt was accepted, e.g. not rejected by hard mode)
+                if mode == "Wordle (guess + feedback)" and len(st.session_state.attempts) > n_attempts:
                     g = guess.strip().upper()
                     f = feedback.strip().upper()
                     if len(g) == 5 and len(f) == 5:
@@ -140,7 +273,7 @@ if run_now:
 # ------------------------
 # Output
 # ------------------------
-if st.session_state.last_result:
+if st.session_state.last_result and not streamed_now:
     st.divider()
     st.subheader("Result")
     st.text(st.session_state.last_result)
@@ -173,6 +306,30 @@ if st.session_state.history_prompts:
             st.write(f"{i}. {p}")
 
 
+# ------------------------
+# Pipeline timings (sidebar)
+# ------------------------
+if TRACE_ENABLED:
+    summary = st.session_state.trace_summary.summary()
+    st.sidebar.subheader("Pipeline timings")
+    if not summary["turns"]:
+        st.sidebar.caption("No traced turn yet.")
+    else:
+        last = st.session_state.last_trace
+        if last is not None:
+            st.sidebar.metric("Last turn", f"{last['total_ms']:.1f} ms")
+            for c in last["constraints"][-3:]:
+                st.sidebar.caption(f"{c['guess']} -> {c['feedback']}: {c['before']} → {c['after']} candidates")
+        st.sidebar.caption(f"Last {summary['turns']} turns")
+        st.sidebar.dataframe(st.session_state.trace_summary.rows(), hide_index=True)
+        llm = summary["llm"]
+        if llm["calls"]:
+            st.sidebar.caption(
+                f"LLM: {llm['calls']} calls ({llm['cache_hits']} cached), "
+                f"{llm['prompt_tokens']} prompt + {llm['output_tokens']} output tokens"
+            )
+
+
 st.divider()
 st.caption("Run with: `streamlit run app.py`")
 
@@ -0,0 +1,281 @@
+"""
+Benchmark hors-ligne (sans Ollama) du solveur Wordle sur tout le dictionnaire.
+
+Chaque mot de `wordle.txt` est joué comme secret ; une politique de choix
+("first", "distinct", "entropy") propose les guesses, le CSP filtre les candidats.
+
+Mesures :
+  - nb de guesses : moyenne / médiane / max, taux d'échec (> 6 guesses)
+  - latence par tour (filtrage + choix du guess) : p50 / p90 / p99 / max
+  - pic mémoire (RSS max du processus principal et des workers)
+
+Sorties :
+  - CSV  : une ligne par partie (secret, nb de guesses, résolu, chemin)
+  - JSON : résumé de la campagne
+
+Exemples :
+    python benchmark.py --policy entropy
+    python benchmark.py --policy distinct --limit 2000 --workers 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from csp_solver import wordle_feedback_vjg
+from llm_agent import load_dictionary
+from wordle_session import WordleSession
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from pattern_engine import PatternEngine
+    ENGINE_AVAILABLE = True
+except Exception:
+    ENGINE_AVAILABLE = False
+
+
+MAX_GUESSES = 6    # limite officielle Wordle (au-delà : échec)
+MAX_TURNS = 30     # garde-fou : on arrête une partie qui ne converge pas
+
+
+# ---------------------------------------------------------------------------
+# Politiques de choix du guess : policy(session) -> str
+# ---------------------------------------------------------------------------
+def policy_first(session) -> str:
+    # Premier candidat (ordre du dictionnaire)
+    return session.words[session.candidate_indices[0]]
+
+
+def policy_distinct(session) -> str:
+    # Heuristique historique de l'agent : plus de lettres distinctes d'abord
+    return max(session.candidates, key=lambda w: len(set(w)))
+
+
+class EntropyPolicy:
+    """
+    Maximisation de l'entropie attendue (entropy_ranker), mémoïsée par historique :
+    tous les secrets partagent le premier coup, et beaucoup partagent les suivants.
+    """
+
+    def __init__(self, all_guesses: bool = False):
+        self.all_guesses = all_guesses
+        self._memo: dict = {}
+
+    def __call__(self, session) -> str:
+        from entropy_ranker import best_guess
+
+        key = tuple(session.attempts)
+        guess = self._memo.get(key)
+        if guess is None:
+            guess = best_guess(session.engine, session.candidate_indices, all_guesses=self.all_guesses)
+            self._memo[key] = guess
+        return guess
+
+
+def make_policy(name: str, all_guesses: bool = False, use_engine: bool = True):
+    if name == "first":
+        return policy_first
+    if name == "distinct":
+        return policy_distinct
+    if name == "entropy":
+        if not ENGINE_AVAILABLE:
+            raise SystemExit("The entropy policy requires NumPy (pip install numpy).")
+        if not use_engine:
+            raise SystemExit("The entropy policy requires the pattern engine (drop --no-engine, "
+                             "or use --policy first/distinct).")
+        return EntropyPolicy(all_guesses=all_guesses)
+    raise ValueError(f"Politique inconnue: {name} (first/distinct/entropy)")
+
+
+# ---------------------------------------------------------------------------
+# Une partie
+# ---------------------------------------------------------------------------
+def play_game(secret: str, session: WordleSession, policy):
+    """
+    Joue une partie complète contre `secret`.
+
+    Retour : (nb_guesses, résolu, latences par tour en secondes, liste des guesses)
+    """
+    session.reset()
+    path, latencies = [], []
+    for _ in range(MAX_TURNS):
+        t0 = time.perf_counter()
+        if len(session) == 0:
+            return len(path), False, latencies, path
+        guess = policy(session)
+        latencies.append(time.perf_counter() - t0)
+
+        path.append(guess)
+        feedback = wordle_feedback_vjg(secret, guess)
+        if feedback == "V" * session.word_length:
+            return len(path), True, latencies, path
+
+        t0 = time.perf_counter()
+        session.push(guess, feedback)
+        latencies[-1] += time.perf_counter() - t0
+    return len(path), False, latencies, path
+
+
+# ---------------------------------------------------------------------------
+# Workers (un dictionnaire + moteur + session par processus)
+# ---------------------------------------------------------------------------
+_WORKER: dict = {}
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    # ru_maxrss est en Ko sous Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _init_worker(dictionary_path: str, policy_name: str, all_guesses: bool, use_engine: bool):
+    words = load_dictionary(dictionary_path)
+    engine = PatternEngine.load_or_build(words) if (use_engine and ENGINE_AVAILABLE) else None
+    _WORKER["session"] = WordleSession(words, engine=engine)
+    _WORKER["policy"] = make_policy(policy_name, all_guesses, use_engine)
+
+
+def _play_chunk(secrets):
+    session, policy = _WORKER["session"], _WORKER["policy"]
+    rows = []
+    for secret in secrets:
+        n, solved, latencies, path = play_game(secret, session, policy)
+        rows.append((secret, n, solved, latencies, path))
+    return rows, _peak_rss_mb()
+
+
+# ---------------------------------------------------------------------------
+# Campagne
+# ---------------------------------------------------------------------------
+def _percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+def ensure_parent_dir(path: str) -> None:
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+
+def run_benchmark(
+    dictionary_path: str = "wordle.txt",
+    policy: str = "entropy",
+    all_guesses: bool = False,
+    workers=None,
+    limit=None,
+    chunk_size: int = 200,
+    use_engine: bool = True,
+    out_csv: str = "outputs/wordle_benchmark.csv",
+    out_json: str = "outputs/wordle_benchmark.json",
+) -> dict:
+    """
+    Joue chaque mot du dictionnaire (ou les `limit` premiers) comme secret.
+
+    workers : nb de processus (None = os.cpu_count()).
+    Retour : le résumé (également écrit dans `out_json`).
+    """
+    words = load_dictionary(dictionary_path)
+    if not words:
+        raise SystemExit("Dictionary is empty.")
+    make_policy(policy, all_guesses, use_engine)  # validation avant de lancer le pool
+
+    secrets = words[:limit] if limit else words
+    chunks = [secrets[i:i + chunk_size] for i in range(0, len(secrets), chunk_size)]
+    workers = max(1, int(workers or os.cpu_count() or 1))
+
+    t0 = time.perf_counter()
+    results, worker_rss = [], []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(dictionary_path, policy, all_guesses, use_engine),
+    ) as pool:
+        for rows, rss in pool.map(_play_chunk, chunks):
+            results.extend(rows)
+            worker_rss.append(rss)
+    wall = time.perf_counter() - t0
+
+    # Résultats par partie
+    ensure_parent_dir(out_csv)
+    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["secret", "guesses", "solved", "total_latency_s", "path"])
+        for secret, n, solved, latencies, path in results:
+            w.writerow([secret, n, int(solved), f"{sum(latencies):.6f}", " ".join(path)])
+
+    # Résumé
+    counts = [n for _, n, solved, _, _ in results if solved]
+    failures = sum(1 for _, n, solved, _, _ in results if not solved or n > MAX_GUESSES)
+    turn_lat = sorted(x for *_, latencies, _ in results for x in latencies)
+
+    summary = {
+        "policy": policy,
+        "all_guesses": all_guesses,
+        "engine": bool(use_engine and ENGINE_AVAILABLE),
+        "games": len(results),
+        "workers": workers,
+        "wall_time_s": wall,
+        "games_per_s": len(results) / wall if wall > 0 else 0.0,
+        "guesses_mean": statistics.mean(counts) if counts else None,
+        "guesses_median": statistics.median(counts) if counts else None,
+        "guesses_max": max(counts) if counts else None,
+        "failure_rate": failures / len(results) if results else 0.0,
+        "turn_latency_ms": {
+            "p50": 1000 * _percentile(turn_lat, 0.50),
+            "p90": 1000 * _percentile(turn_lat, 0.90),
+            "p99": 1000 * _percentile(turn_lat, 0.99),
+            "max": 1000 * (turn_lat[-1] if turn_lat else 0.0),
+        },
+        "peak_rss_mb": {
+            "main": _peak_rss_mb(),
+            "worker_max": max(worker_rss, default=0.0),
+        },
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    ensure_parent_dir(out_json)
+    with open(out_json, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors-ligne du solveur Wordle (sans LLM).")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    parser.add_argument("--policy", choices=["first", "distinct", "entropy"], default="entropy")
+    parser.add_argument("--all-guesses", action="store_true", help="(entropy) score aussi les mots hors candidats")
+    parser.add_argument("--workers", type=int, default=0, help="nb de processus (0 = tous les coeurs)")
+    parser.add_argument("--limit", type=int, default=None, help="ne jouer que les N premiers secrets")
+    parser.add_argument("--no-engine", action="store_true", help="force le filtrage pur Python")
+    parser.add_argument("--out-csv", default="outputs/wordle_benchmark.csv")
+    parser.add_argument("--out-json", default="outputs/wordle_benchmark.json")
+    args = parser.parse_args()
+
+    summary = run_benchmark(
+        dictionary_path=args.dictionary,
+        policy=args.policy,
+        all_guesses=args.all_guesses,
+        workers=args.workers or None,
+        limit=args.limit,
+        use_engine=not args.no_engine,
+        out_csv=args.out_csv,
+        out_json=args.out_json,
+    )
+    print(json.dumps(summary, indent=2))
+    print(f"CSV -> {args.out_csv} | JSON -> {args.out_json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,33 @@
 from collections import Counter
 
+# Longueur du Wordle classique (les variantes 4..N lettres passent word_length)
+WORD_LENGTH = 5
+
+
 def wordle_feedback_vjg(secret: str, guess: str) -> str:
     """
     Feedback Wordle (FR) :
       V = vert, J = jaune, G = gris
     Règles Wordle exactes, y compris doublons.
+    Fonctionne pour toute longueur, tant que secret et guess ont la même.
     """
     secret = secret.strip().upper()
     guess = guess.strip().upper()
-    if len(secret) != 5 or len(guess) != 5:
-        raise ValueError("secret et guess doivent faire 5 lettres")
+    if not secret or len(secret) != len(guess):
+        raise ValueError("secret et guess doivent avoir la même longueur")
 
-    res = ["G"] * 5
+    n = len(guess)
+    res = ["G"] * n
     remaining = Counter(secret)
 
     # 1) Verts
-    for i in range(5):
+    for i in range(n):
         if guess[i] == secret[i]:
             res[i] = "V"
             remaining[guess[i]] -= 1
 
     # 2) Jaunes
-    for i in range(5):
+    for i in range(n):
         if res[i] == "V":
             continue
         ch = guess[i]
@@ -32,36 +38,13 @@ def wordle_feedback_vjg(secret: str, guess: str) -> str:
     return "".join(res)
 
 
-def solve_wordle_csp(possible_words, attempts):
+def clean_attempts(attempts, word_length: int = WORD_LENGTH):
     """
-    Résout Wordle par filtrage de contraintes (approche CSP "par vérification").
-
-    Conceptuellement :
-      - Variables : le mot secret (un mot de 5 lettres)
-      - Domaine   : possible_words (ton dictionnaire de mots 5 lettres)
-      - Contraintes : chaque (guess, feedback) impose une contrainte sur le secret :
-            feedback(secret, guess) == feedback_observé
-
-    Paramètres
-    ----------
-    possible_words : iterable[str]
-        Liste / set / générateur de candidats (mots potentiellement secrets).
-    attempts : list[tuple[str, str]]
-        Liste des tentatives sous la forme [(guess, feedback), ...]
-        - guess : mot proposé (5 lettres)
-        - feedback : chaîne de 5 caractères dans {V, J, G}
-            V = vert, J = jaune, G = gris
+    Nettoie / valide un historique de tentatives [(guess, feedback), ...].
 
-    Retour
-    ------
-    list[str]
-        Tous les mots de possible_words compatibles avec TOUTES les contraintes.
+    Toute entrée mal formée est ignorée plutôt que de faire planter le solver.
+    Les couples conservés sont normalisés (majuscules, sans espaces).
     """
-
-    # -------------------------------------------------------------------------
-    # 1) Nettoyage / validation des contraintes (attempts)
-    #    Objectif : ignorer toute entrée mal formée plutôt que planter le solver.
-    # -------------------------------------------------------------------------
     cleaned_attempts = []
 
     for item in attempts:
@@ -79,8 +62,8 @@ def solve_wordle_csp(possible_words, attempts):
         guess = guess.strip().upper()
         fb = fb.strip().upper()
 
-        # Wordle = 5 lettres, 5 feedbacks
-        if len(guess) != 5 or len(fb) != 5:
+        # Wordle = word_length lettres (5 par défaut), autant de feedbacks
+        if len(guess) != word_length or len(fb) != word_length:
             continue
 
         # Feedback doit contenir uniquement V/J/G
@@ -94,6 +77,43 @@ def solve_wordle_csp(possible_words, attempts):
 
         cleaned_attempts.append((guess, fb))
 
+    return cleaned_attempts
+
+
+def solve_wordle_csp(possible_words, attempts, word_length: int = WORD_LENGTH):
+    """
+    Résout Wordle par filtrage de contraintes (approche CSP "par vérification").
+
+    Conceptuellement :
+      - Variables : le mot secret (un mot de 5 lettres)
+      - Domaine   : possible_words (ton dictionnaire de mots 5 lettres)
+      - Contraintes : chaque (guess, feedback) impose une contrainte sur le secret :
+            feedback(secret, guess) == feedback_observé
+
+    Paramètres
+    ----------
+    possible_words : iterable[str]
+        Liste / set / générateur de candidats (mots potentiellement secrets).
+    attempts : list[tuple[str, str]]
+        Liste des tentatives sous la forme [(guess, feedback), ...]
+        - guess : mot proposé (5 lettres)
+        - feedback : chaîne de 5 caractères dans {V, J, G}
+            V = vert, J = jaune, G = gris
+    word_length : int
+        Longueur des mots (5 pour Wordle ; 6, 7... pour les variantes).
+
+    Retour
+    ------
+    list[str]
+        Tous les mots de possible_words compatibles avec TOUTES les contraintes.
+    """
+
+    # -------------------------------------------------------------------------
+    # 1) Nettoyage / validation des contraintes (attempts)
+    #    Objectif : ignorer toute entrée mal formée plutôt que planter le solver.
+    # -------------------------------------------------------------------------
+    cleaned_attempts = clean_attempts(attempts, word_length)
+
     # -------------------------------------------------------------------------
     # 2) Filtrage du dictionnaire
     #    Pour chaque mot candidat w, on vérifie toutes les contraintes :
@@ -106,8 +126,8 @@ def solve_wordle_csp(possible_words, attempts):
         # Normalisation du candidat
         w = w.strip().upper()
 
-        # On ignore ce qui n'a pas exactement 5 lettres
-        if len(w) != 5:
+        # On ignore ce qui n'a pas exactement word_length lettres
+        if len(w) != word_length:
             continue
 
         # Hypothèse : w est valide tant qu'aucune contrainte ne le contredit
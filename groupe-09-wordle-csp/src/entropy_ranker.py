@@ -0,0 +1,144 @@
+"""
+Recommandation du prochain guess par théorie de l'information (sans LLM).
+
+Pour un guess g et l'ensemble des candidats C, le feedback observé partitionne C
+en "seaux" (un par code base 3). Si n_p candidats donnent le feedback p :
+  - entropie attendue       H(g) = log2|C| - (1/|C|) * sum_p n_p log2 n_p
+  - candidats restants moy. E(g) = (1/|C|) * sum_p n_p^2
+On maximise H (tie-break : E minimal, puis guess faisant partie des candidats).
+
+Tout est vectorisé : un bloc de la matrice de feedbacks (guesses x candidats)
+est compté en une seule fois via np.bincount.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from pattern_engine import N_PATTERNS
+
+
+DEFAULT_BATCH = 2048
+
+# Taille max. du tableau de comptage d'un bloc (B x 3**L) : borne le batch pour L > 5
+MAX_BUCKET_CELLS = 1 << 22
+
+
+def batch_for(n_patterns: int, batch: int = DEFAULT_BATCH) -> int:
+    """
+    Batch effectif : `batch`, réduit si 3**L seaux par guess deviennent trop nombreux.
+    """
+    return max(1, min(batch, MAX_BUCKET_CELLS // n_patterns))
+
+
+def bucket_counts(block: np.ndarray, n_patterns: int = N_PATTERNS) -> np.ndarray:
+    """
+    (B, C) codes de feedback -> (B, n_patterns) tailles des seaux, par guess.
+    """
+    b = block.shape[0]
+    offsets = (np.arange(b, dtype=np.int64)[:, None] * n_patterns + block).ravel()
+    return np.bincount(offsets, minlength=b * n_patterns).reshape(b, n_patterns)
+
+
+def score_block(block: np.ndarray, n_patterns: int = N_PATTERNS):
+    """
+    Entropie attendue et nombre moyen de candidats restants pour chaque ligne du bloc.
+    """
+    n = block.shape[1]
+    counts = bucket_counts(block, n_patterns).astype(np.float64)
+    nlogn = np.zeros_like(counts)
+    np.log2(counts, out=nlogn, where=counts > 0)
+    nlogn *= counts
+    entropy = np.log2(n) - nlogn.sum(axis=1) / n
+    expected = (counts * counts).sum(axis=1) / n
+    return entropy, expected
+
+
+def score_guesses(engine, candidates, guesses=None, batch: int = DEFAULT_BATCH):
+    """
+    Score les `guesses` (indices ; None = tout le dictionnaire) contre `candidates`.
+
+    Retour : (guess_idx, entropy, expected_remaining), tableaux alignés.
+    """
+    candidates = np.asarray(candidates)
+    batch = batch_for(engine.n_patterns, batch)
+    if guesses is None:
+        # Tranches contiguës : lecture séquentielle de la matrice memory-mappée
+        n = len(engine)
+        guess_idx = np.arange(n, dtype=np.int32)
+        parts = [slice(s, min(s + batch, n)) for s in range(0, n, batch)]
+    else:
+        guess_idx = np.asarray(guesses)
+        parts = [guess_idx[s:s + batch] for s in range(0, guess_idx.size, batch)]
+
+    entropy = np.empty(guess_idx.size, dtype=np.float64)
+    expected = np.empty(guess_idx.size, dtype=np.float64)
+    pos = 0
+    for part in parts:
+        h, e = score_block(engine.block(part, candidates), engine.n_patterns)
+        entropy[pos:pos + h.size] = h
+        expected[pos:pos + e.size] = e
+        pos += h.size
+    return guess_idx, entropy, expected
+
+
+def rank_guesses(
+    engine,
+    candidates,
+    all_guesses: bool = False,
+    top: int = 3,
+    batch: int = DEFAULT_BATCH,
+    scorer=None,
+) -> list:
+    """
+    Classe les meilleurs prochains guesses.
+
+    Paramètres
+    ----------
+    engine : PatternEngine
+    candidates : indices des mots encore possibles
+    all_guesses : si True, on score tout le dictionnaire (mots "sondes" autorisés),
+                  sinon uniquement les candidats (on peut gagner à chaque coup)
+    top : nombre de propositions retournées
+    scorer : ParallelScorer optionnel (parallel_scoring.py) pour répartir le
+             scoring sur plusieurs processus
+
+    Retour
+    ------
+    list[tuple[str, float, float]]
+        [(mot, entropie en bits, candidats restants attendus), ...] du meilleur au moins bon.
+    """
+    candidates = np.asarray(candidates)
+    if candidates.size == 0:
+        return []
+    if candidates.size <= 2:
+        # Avec 1 ou 2 candidats, jouer un candidat est optimal
+        return [(engine.words[i], float(np.log2(candidates.size)), 1.0) for i in candidates[:top]]
+
+    guesses = None if all_guesses else candidates
+    if scorer is not None:
+        guess_idx, entropy, expected = scorer.score_guesses(candidates, guesses=guesses)
+    else:
+        guess_idx, entropy, expected = score_guesses(engine, candidates, guesses=guesses, batch=batch)
+
+    is_candidate = np.isin(guess_idx, candidates)
+    # np.lexsort : la DERNIÈRE clé est la clé principale
+    order = np.lexsort((guess_idx, ~is_candidate, expected, -np.round(entropy, 9)))[:top]
+    return [(engine.words[guess_idx[i]], float(entropy[i]), float(expected[i])) for i in order]
+
+
+def best_guess(engine, candidates, all_guesses: bool = False, scorer=None) -> Optional[str]:
+    ranked = rank_guesses(engine, candidates, all_guesses=all_guesses, top=1, scorer=scorer)
+    return ranked[0][0] if ranked else None
+
+
+def format_decision(ranked: list) -> str:
+    """
+    Même présentation que la réponse attendue du LLM (Chosen word + ranking).
+    """
+    if not ranked:
+        return "No candidate."
+    lines = [f"Chosen word: {ranked[0][0]}", "", "Priority ranking:", ""]
+    for i, (word, entropy, expected) in enumerate(ranked, 1):
+        lines.append(f"{i}. {word}  (entropy={entropy:.3f} bits, expected remaining={expected:.1f})")
+    return "\n".join(lines)
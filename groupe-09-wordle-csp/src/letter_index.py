@@ -0,0 +1,177 @@
+"""
+Index lettre/position du dictionnaire pour élaguer les candidats AVANT la
+vérification exacte du feedback (pur Python, sans NumPy).
+
+1) Chaque tentative (guess, feedback) est compilée en contraintes simples :
+     - masque de lettres autorisées par position (26 bits) :
+         V -> uniquement la lettre du guess ; J/G -> tout sauf cette lettre
+     - nombre minimal d'occurrences de chaque lettre (nb de V + J)
+     - nombre maximal (= minimal) dès qu'une occurrence de la lettre est grise
+2) Le dictionnaire est indexé par des bitsets (entiers Python, 1 bit par mot) :
+     - pos[i][c]      : mots ayant la lettre c à la position i
+     - count_ge[c][k] : mots contenant au moins k fois la lettre c
+   Les candidats s'obtiennent par intersections / différences de bitsets.
+3) wordle_feedback_vjg n'est appelé que sur les survivants, comme vérification
+   finale (les contraintes compilées sont nécessaires mais pas toujours
+   suffisantes, ex. un feedback impossible "gris puis jaune" sur une même lettre).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from csp_solver import WORD_LENGTH, clean_attempts, wordle_feedback_vjg
+
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+FULL_MASK = (1 << len(ALPHABET)) - 1
+
+
+def _bit(ch: str) -> int:
+    return 1 << (ord(ch) - ord("A"))
+
+
+@dataclass(frozen=True)
+class CompiledConstraint:
+    allowed: Tuple[int, ...]     # masque 26 bits des lettres autorisées, par position
+    min_count: Dict[str, int]    # lettre -> nb minimal d'occurrences
+    max_count: Dict[str, int]    # lettre -> nb maximal (absent = pas de borne)
+
+
+def compile_constraint(guess: str, feedback: str) -> CompiledConstraint:
+    """
+    (guess, feedback) normalisés -> masques positionnels + bornes de comptage.
+    """
+    allowed = [FULL_MASK] * len(guess)
+    present: Dict[str, int] = {}
+    grey: Dict[str, int] = {}
+
+    for i, (ch, fb) in enumerate(zip(guess, feedback)):
+        if fb == "V":
+            allowed[i] = _bit(ch)
+            present[ch] = present.get(ch, 0) + 1
+        else:
+            # Jaune ou gris : la lettre n'est pas à cette position (sinon ce serait vert)
+            allowed[i] &= ~_bit(ch)
+            if fb == "J":
+                present[ch] = present.get(ch, 0) + 1
+            else:
+                grey[ch] = grey.get(ch, 0) + 1
+
+    min_count = {ch: n for ch, n in present.items()}
+    max_count = {ch: present.get(ch, 0) for ch in grey}
+
+    # Lettre absente du secret : interdite partout
+    for ch, n in max_count.items():
+        if n == 0:
+            allowed = [m & ~_bit(ch) for m in allowed]
+
+    return CompiledConstraint(tuple(allowed), min_count, max_count)
+
+
+class LetterIndex:
+    """
+    Index inversé (position, lettre) et (lettre, nb d'occurrences) -> bitset de mots.
+    """
+
+    def __init__(self, dictionary_words, word_length: int = WORD_LENGTH):
+        # Même normalisation que solve_wordle_csp
+        self.word_length = word_length
+        words = (w.strip().upper() for w in dictionary_words)
+        self.words = [w for w in words if len(w) == word_length and w.isascii() and w.isalpha()]
+        self.all_bits = (1 << len(self.words)) - 1
+
+        pos = [[0] * len(ALPHABET) for _ in range(word_length)]
+        count_ge = [[0] * (word_length + 1) for _ in range(len(ALPHABET))]
+        for idx, w in enumerate(self.words):
+            b = 1 << idx
+            seen: Dict[int, int] = {}
+            for i, ch in enumerate(w):
+                c = ord(ch) - ord("A")
+                pos[i][c] |= b
+                seen[c] = seen.get(c, 0) + 1
+            for c, n in seen.items():
+                for k in range(1, n + 1):
+                    count_ge[c][k] |= b
+
+        self.pos = pos
+        self.count_ge = count_ge
+        self._positions = None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def position(self, word: str):
+        """
+        Indice de `word` dans self.words, ou None (table construite au premier appel).
+        """
+        if self._positions is None:
+            self._positions = {w: i for i, w in enumerate(self.words)}
+        return self._positions.get(word)
+
+    # -- élagage par bitsets --------------------------------------------------
+    def prune(self, cc: CompiledConstraint, bits: int) -> int:
+        """
+        Restreint le bitset `bits` par une contrainte compilée (sans simuler de feedback).
+        """
+        for i, mask in enumerate(cc.allowed):
+            if mask & (mask - 1) == 0:
+                # Une seule lettre autorisée (vert) : intersection directe
+                bits &= self.pos[i][mask.bit_length() - 1]
+            else:
+                forbidden = FULL_MASK & ~mask
+                while forbidden:
+                    low = forbidden & -forbidden
+                    bits &= ~self.pos[i][low.bit_length() - 1]
+                    forbidden ^= low
+            if not bits:
+                return 0
+
+        for ch, n in cc.min_count.items():
+            if n > 0:
+                bits &= self.count_ge[ord(ch) - ord("A")][n]
+        for ch, n in cc.max_count.items():
+            if n < self.word_length:
+                bits &= ~self.count_ge[ord(ch) - ord("A")][n + 1]
+        return bits
+
+    def iter_indices(self, bits: int):
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def to_bits(self, indices) -> int:
+        bits = 0
+        for i in indices:
+            bits |= 1 << i
+        return bits
+
+    # -- filtrage complet -----------------------------------------------------
+    def filter_bits(self, bits: int, guess: str, feedback: str) -> int:
+        """
+        Élagage par index puis vérification exacte des seuls survivants.
+        """
+        pruned = self.prune(compile_constraint(guess, feedback), bits)
+        verified = 0
+        for i in self.iter_indices(pruned):
+            if wordle_feedback_vjg(self.words[i], guess) == feedback:
+                verified |= 1 << i
+        return verified
+
+    def solve(self, attempts) -> list:
+        """
+        Équivalent de solve_wordle_csp(self.words, attempts), via l'index.
+        """
+        cleaned = clean_attempts(attempts, self.word_length)
+        bits = self.all_bits
+        for guess, fb in cleaned:
+            bits = self.prune(compile_constraint(guess, fb), bits)
+            if not bits:
+                return []
+
+        # Vérification finale exacte (doublons compris)
+        return [
+            self.words[i]
+            for i in self.iter_indices(bits)
+            if all(wordle_feedback_vjg(self.words[i], g) == fb for g, fb in cleaned)
+        ]
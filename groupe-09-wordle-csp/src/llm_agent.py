@@ -1,27 +1,43 @@
+import asyncio
 import json
+import os
 import re
+import time
 from typing import Optional
 
 import ollama
 
-from csp_solver import solve_wordle_csp
+from csp_solver import WORD_LENGTH, solve_wordle_csp
+from llm_cache import LLMCache, request_key, response_to_dict
+from pipeline_trace import PipelineTrace, stage
+from word_store import clean_words, open_compiled
 
 
 # ---------------------------------------------------------------------------
 # Dictionary loader
 # ---------------------------------------------------------------------------
-def load_dictionary(filename: str) -> list[str]:
+def load_dictionary(filename: str, word_length: int = WORD_LENGTH, use_compiled: bool = True) -> list[str]:
     """
     Charge un dictionnaire de mots depuis un fichier texte.
 
+    Si une version compilée à jour existe (python word_store.py --compile), elle est
+    memory-mappée au lieu de parser le texte ligne par ligne : le résultat est alors un
+    WordStore (séquence de str en lecture seule, mots triés, décodés à la demande).
+
     Retourne :
-      - une liste de mots (str) en uppercase, longueur 5
+      - une liste de mots (str) en uppercase, longueur `word_length` (5 par défaut),
+        triés et dédoublonnés comme à la compilation (ou un WordStore équivalent) :
+        même empreinte, donc mêmes matrice et livre d'ouvertures en cache
       - [] si le fichier n'est pas trouvé
     """
+    if use_compiled:
+        store = open_compiled(filename, word_length)
+        if store is not None:
+            return store
+
     try:
         with open(filename, "r", encoding="utf-8") as f:
-            # On filtre sur len(line.strip()) == 5 AVANT upper() : équivalent ici.
-            return [line.strip().upper() for line in f if len(line.strip()) == 5]
+            return clean_words(f, word_length)
     except FileNotFoundError:
         print(f"File '{filename}' not found.")
         return []
@@ -30,14 +46,14 @@ def load_dictionary(filename: str) -> list[str]:
 # ---------------------------------------------------------------------------
 # Normalization helpers
 # ---------------------------------------------------------------------------
-def normalize_guess(s: str) -> Optional[str]:
+def normalize_guess(s: str, word_length: int = WORD_LENGTH) -> Optional[str]:
     """
     Valide + normalise un guess Wordle.
 
     Règles :
       - doit être une str
       - strip + uppercase
-      - longueur 5
+      - longueur `word_length` (5 par défaut)
       - uniquement A-Z (pas d'accents, pas de tirets)
 
     Retour :
@@ -49,7 +65,7 @@ def normalize_guess(s: str) -> Optional[str]:
 
     s = s.strip().upper()
 
-    if len(s) != 5:
+    if len(s) != word_length:
         return None
 
     # Contrôle strict A-Z (utile pour éviter des caractères invisibles / accents)
@@ -59,14 +75,14 @@ def normalize_guess(s: str) -> Optional[str]:
     return s
 
 
-def normalize_feedback(s: str) -> Optional[str]:
+def normalize_feedback(s: str, word_length: int = WORD_LENGTH) -> Optional[str]:
     """
     Valide + normalise un feedback Wordle au format V/J/G.
 
     Règles :
       - doit être une str
       - strip + uppercase
-      - longueur 5
+      - longueur `word_length` (5 par défaut)
       - uniquement dans {V, J, G}
 
     Retour :
@@ -78,7 +94,7 @@ def normalize_feedback(s: str) -> Optional[str]:
 
     s = s.strip().upper()
 
-    if len(s) != 5:
+    if len(s) != word_length:
         return None
 
     if any(c not in "VJG" for c in s):
@@ -94,30 +110,88 @@ def normalize_feedback(s: str) -> Optional[str]:
 #   "ORATE GVVJG"
 #   "ORATE->GVVJG"
 #   "ORATE -> GVVJG"
-_DIRECT = re.compile(r"^\s*([A-Za-z]{5})\s*(?:->\s*)?([VvJjGg]{5})\s*$")
+def direct_pattern(word_length: int = WORD_LENGTH) -> re.Pattern:
+    """
+    Regex "GUESS [->] FEEDBACK" pour une longueur de mot donnée.
+    """
+    n = int(word_length)
+    return re.compile(rf"^\s*([A-Za-z]{{{n}}})\s*(?:->\s*)?([VvJjGg]{{{n}}})\s*$")
+
+
+_DIRECT = direct_pattern(WORD_LENGTH)
 
 
 # ---------------------------------------------------------------------------
-# LLM extraction (fallback)
+# Ollama : client, cache persistant, timeouts
 # ---------------------------------------------------------------------------
-def extract_attempt_from_text(user_text: str) -> Optional[dict]:
+# OLLAMA_HOST (variable d'environnement) permet de pointer vers un autre serveur,
+# par exemple le stub local `ollama_stub.py` pour tester sans modèle.
+LLM_MODEL = "llama3.1"
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST")
+LLM_TIMEOUT_S = 120.0
+
+_llm_cache = None
+
+
+def get_llm_cache() -> LLMCache:
     """
-    Utilise le LLM pour extraire EXACTEMENT une tentative Wordle depuis du texte libre.
+    Cache prompt -> réponse partagé par le processus (créé au premier appel).
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
 
-    Objectif :
-      - l'utilisateur peut écrire : "j'ai joué orate et j'ai eu g v v j g"
-      - on veut récupérer un couple (guess, feedback) strict
 
-    Stratégie :
-      - on force le modèle à répondre via un "tool call" (fonction extract_wordle_attempt)
-      - on revalide ensuite côté Python 
+def chat_cached(use_cache: bool = True, trace=None, trace_stage: str = "llm", **request) -> dict:
+    """
+    ollama.chat avec cache persistant. Retourne toujours un dict.
 
-    Retour :
-      - {"guess": "ORATE", "feedback": "GVVJG"} si extraction OK
-      - None sinon
+    `trace` (PipelineTrace, optionnel) : latence, cache et tokens de l'appel, sous `trace_stage`.
+    """
+    t0 = time.perf_counter()
+    key = request_key(**request)
+    if use_cache:
+        hit = get_llm_cache().get(key)
+        if hit is not None:
+            if trace is not None:
+                trace.llm_call(trace_stage, hit, (time.perf_counter() - t0) * 1000, cached=True)
+            return hit
+
+    client = ollama.Client(host=OLLAMA_HOST, timeout=LLM_TIMEOUT_S)
+    response = response_to_dict(client.chat(**request))
+    if trace is not None:
+        trace.llm_call(trace_stage, response, (time.perf_counter() - t0) * 1000, cached=False)
+    if use_cache:
+        get_llm_cache().set(key, response)
+    return response
+
+
+async def achat_cached(timeout_s: float = LLM_TIMEOUT_S, use_cache: bool = True, **request) -> dict:
     """
-    response = ollama.chat(
-        model="llama3.1",
+    Version asynchrone (ollama.AsyncClient) de chat_cached, bornée par `timeout_s`.
+    Lève asyncio.TimeoutError si le LLM ne répond pas à temps.
+    """
+    key = request_key(**request)
+    if use_cache:
+        hit = get_llm_cache().get(key)
+        if hit is not None:
+            return hit
+
+    client = ollama.AsyncClient(host=OLLAMA_HOST)
+    response = await asyncio.wait_for(client.chat(**request), timeout=timeout_s)
+    response = response_to_dict(response)
+    if use_cache:
+        get_llm_cache().set(key, response)
+    return response
+
+
+# ---------------------------------------------------------------------------
+# LLM extraction (fallback)
+# ---------------------------------------------------------------------------
+def _extraction_request(user_text: str, word_length: int = WORD_LENGTH) -> dict:
+    return dict(
+        model=LLM_MODEL,
         messages=[
             {
                 "role": "user",
@@ -126,8 +200,8 @@ def extract_attempt_from_text(user_text: str) -> Optional[dict]:
                     "Task: extract EXACTLY ONE Wordle attempt from the user's text.\n\n"
                     "You MUST return ONLY a tool call to extract_wordle_attempt.\n"
                     "Rules:\n"
-                    "- guess: a 5-letter ENGLISH word (A-Z)\n"
-                    "- feedback: a 5-character string using ONLY V, J, G\n"
+                    f"- guess: a {word_length}-letter ENGLISH word (A-Z)\n"
+                    f"- feedback: a {word_length}-character string using ONLY V, J, G\n"
                     "  V=green, J=yellow, G=gray\n"
                     "- Do NOT invent data: if guess or feedback is missing/unclear, "
                     'return guess="" and feedback="".\n\n'
@@ -155,6 +229,8 @@ def extract_attempt_from_text(user_text: str) -> Optional[dict]:
         ],
     )
 
+
+def _parse_extraction(response: dict, word_length: int = WORD_LENGTH) -> Optional[dict]:
     # Ollama renvoie typiquement un dict avec "message"
     msg = response.get("message", {}) or {}
     tool_calls = msg.get("tool_calls") or []
@@ -174,8 +250,8 @@ def extract_attempt_from_text(user_text: str) -> Optional[dict]:
         return None
 
     # Re-validation côté code : sécurité + robustesse.
-    guess = normalize_guess(args.get("guess", ""))
-    feedback = normalize_feedback(args.get("feedback", ""))
+    guess = normalize_guess(args.get("guess", ""), word_length)
+    feedback = normalize_feedback(args.get("feedback", ""), word_length)
 
     if not guess or not feedback:
         return None
@@ -183,41 +259,91 @@ def extract_attempt_from_text(user_text: str) -> Optional[dict]:
     return {"guess": guess, "feedback": feedback}
 
 
+def extract_attempt_from_text(user_text: str, trace=None, word_length: int = WORD_LENGTH) -> Optional[dict]:
+    """
+    Utilise le LLM pour extraire EXACTEMENT une tentative Wordle depuis du texte libre.
+
+    Objectif :
+      - l'utilisateur peut écrire : "j'ai joué orate et j'ai eu g v v j g"
+      - on veut récupérer un couple (guess, feedback) strict
+
+    Stratégie :
+      - on force le modèle à répondre via un "tool call" (fonction extract_wordle_attempt)
+      - on revalide ensuite côté Python 
+      - un même texte n'est envoyé qu'une fois au LLM (cache persistant)
+
+    Retour :
+      - {"guess": "ORATE", "feedback": "GVVJG"} si extraction OK
+      - None sinon
+    """
+    request = _extraction_request(user_text, word_length)
+    return _parse_extraction(chat_cached(trace=trace, trace_stage="llm_extract", **request), word_length)
+
+
+async def aextract_attempt_from_text(
+    user_text: str, timeout_s: float = LLM_TIMEOUT_S, word_length: int = WORD_LENGTH
+) -> Optional[dict]:
+    """
+    Version asynchrone de extract_attempt_from_text (None si timeout).
+    """
+    try:
+        response = await achat_cached(timeout_s=timeout_s, **_extraction_request(user_text, word_length))
+    except asyncio.TimeoutError:
+        return None
+    return _parse_extraction(response, word_length)
+
+
 # ---------------------------------------------------------------------------
 # Full agent (CSP + LLM ranking)
 # ---------------------------------------------------------------------------
 MAX_CANDIDATES_TO_LLM = 40
 
 
-def interroger_agent_wordle(prompt_utilisateur: str, dictionary_words, attempts: list):
+def session_word_length(engine=None, session=None) -> int:
     """
-    Pipeline complet de l'agent Wordle.
+    Longueur des mots : celle de la session / du moteur (variantes 6, 7... lettres).
+    """
+    if session is not None:
+        return session.word_length
+    if engine is not None:
+        return engine.word_length
+    return WORD_LENGTH
+
+
+def appliquer_tentative(
+    prompt_utilisateur: str,
+    dictionary_words,
+    attempts: list,
+    engine=None,
+    session=None,
+    trace=None,
+):
+    """
+    Partie déterministe du pipeline (étapes 1 à 4 de interroger_agent_wordle).
 
-    Entrées :
-      - prompt_utilisateur : texte brut utilisateur (ex: "ORATE -> GVVJG" ou phrase libre)
-      - dictionary_words : liste de mots 5 lettres (domaine CSP)
-      - attempts : historique MUTABLE des tentatives [(guess, feedback), ...]
-                  (persisté entre tours côté Streamlit/session_state)
+    `trace` (PipelineTrace, optionnel) : durées des étapes et candidats avant / après
+    chaque contrainte.
 
-    Étapes :
-      1) parse direct via regex (rapide, déterministe)
-      2) fallback extraction via LLM si le texte est libre
-      3) append dans l'historique
-      4) CSP: filtrage des candidats compatibles
-      5) si trop de candidats, on sous-échantillonne ceux envoyés au LLM (coût/latence)
-      6) LLM: propose un ranking / next guess parmi les candidats
+    Retour :
+      - (possible, texte) : candidats CSP + résumé affichable tout de suite
+      - (None, message)   : si la tentative est invalide ou les contraintes incohérentes
     """
 
+    word_length = session_word_length(engine, session)
+    pattern = _DIRECT if word_length == WORD_LENGTH else direct_pattern(word_length)
+
     # 1) Parsing direct : si l'utilisateur donne un format structuré, pas besoin de LLM
-    m = _DIRECT.match(prompt_utilisateur or "")
+    with stage(trace, "parse"):
+        m = pattern.match(prompt_utilisateur or "")
     if m:
         guess = m.group(1).upper()
         feedback = m.group(2).upper()
     else:
         # 2) Fallback : extraction sémantique via LLM (cas "texte libre")
-        extracted = extract_attempt_from_text(prompt_utilisateur)
+        with stage(trace, "llm_extract"):
+            extracted = extract_attempt_from_text(prompt_utilisateur, trace=trace, word_length=word_length)
         if not extracted:
-            return (
+            return None, (
                 "Could not extract a valid attempt.\n"
                 "Expected format: 'ORATE GVVJG' or 'ORATE -> GVVJG' "
                 "(V=green, J=yellow, G=gray)."
@@ -226,27 +352,82 @@ def interroger_agent_wordle(prompt_utilisateur: str, dictionary_words, attempts:
         feedback = extracted["feedback"]
 
     # Optionnel mais utile : revalider même après regex (cohérence + sécurité)
-    guess = normalize_guess(guess)
-    feedback = normalize_feedback(feedback)
+    with stage(trace, "normalize"):
+        guess = normalize_guess(guess, word_length)
+        feedback = normalize_feedback(feedback, word_length)
     if not guess or not feedback:
-        return "Invalid guess/feedback after normalization. Please use 5 letters and V/J/G."
+        return None, (
+            f"Invalid guess/feedback after normalization. Please use {word_length} letters and V/J/G."
+        )
 
     # 3) Mise à jour de l'historique des contraintes
     attempts.append((guess, feedback))
 
     # 4) CSP solving = filtrage du domaine par toutes les contraintes collectées
-    possible = solve_wordle_csp(dictionary_words, attempts)
+    #    - session : incrémental, seule la nouvelle contrainte est appliquée
+    #    - engine  : matrice de feedbacks précalculée (NumPy)
+    with stage(trace, "csp"):
+        if session is not None:
+            before = len(session)
+            try:
+                possible = session.push(guess, feedback)
+            except ValueError as e:
+                # Tentative refusée par la session (ex. mode difficile) : historique inchangé
+                attempts.pop()
+                return None, str(e)
+            if trace is not None:
+                trace.constraint(guess, feedback, before, len(possible))
+        elif trace is not None:
+            # Instrumenté : contrainte par contrainte (même résultat, tailles intermédiaires)
+            possible = _solve_traced(dictionary_words, attempts, engine, word_length, trace)
+        elif engine is not None:
+            possible = engine.solve(attempts)
+        else:
+            possible = solve_wordle_csp(dictionary_words, attempts, word_length)
 
     # Si plus aucun mot ne satisfait les contraintes, il y a incohérence (erreur feedback,
     # mot hors dictionnaire, ou extraction incorrecte)
     if not possible:
-        return (
+        return None, (
             "No solution matches the current constraints.\n"
             f"Last attempt: {guess} -> {feedback}\n"
             f"History: {attempts}"
         )
 
-    # 5) On limite le nombre de candidats envoyés au LLM (latence + coût)
+    # Affichage "humain" : on montre un extrait des candidats CSP
+    shown = ", ".join(possible[:30]) + ("..." if len(possible) > 30 else "")
+    return possible, (
+        f"ADDED ATTEMPT: {guess} -> {feedback}\n"
+        f"POSSIBLE WORDS ({len(possible)}):\n{shown}\n"
+    )
+
+
+def _solve_traced(dictionary_words, attempts: list, engine, word_length: int, trace) -> list:
+    """
+    Filtrage CSP une contrainte à la fois, en notant la taille avant / après chacune.
+    """
+    if engine is not None:
+        current = engine.all_indices()
+        for guess, feedback in attempts:
+            narrowed = engine.filter(current, guess, feedback)
+            trace.constraint(guess, feedback, current.size, narrowed.size)
+            current = narrowed
+        return [engine.words[i] for i in current]
+
+    current = list(dictionary_words)
+    for guess, feedback in attempts:
+        narrowed = solve_wordle_csp(current, [(guess, feedback)], word_length)
+        trace.constraint(guess, feedback, len(current), len(narrowed))
+        current = narrowed
+    return current
+
+
+def select_candidates_for_llm(possible: list):
+    """
+    On limite le nombre de candidats envoyés au LLM (latence + coût).
+
+    Retour : (candidats envoyés, note à afficher ou "")
+    """
     candidates_for_llm = possible[:]
 
     if len(candidates_for_llm) > MAX_CANDIDATES_TO_LLM:
@@ -256,11 +437,21 @@ def interroger_agent_wordle(prompt_utilisateur: str, dictionary_words, attempts:
             candidates_for_llm, key=lambda w: len(set(w)), reverse=True
         )[:MAX_CANDIDATES_TO_LLM]
 
-    # 6) LLM ranking : on lui donne la liste, et on lui interdit d'inventer
+    note = ""
+    if len(possible) > MAX_CANDIDATES_TO_LLM:
+        note = (
+            f"\n(Note: CSP found {len(possible)} words; "
+            f"only {MAX_CANDIDATES_TO_LLM} were sent to the LLM.)\n"
+        )
+    return candidates_for_llm, note
+
+
+def _ranking_request(candidates_for_llm: list, word_length: int = WORD_LENGTH) -> dict:
+    # LLM ranking : on lui donne la liste, et on lui interdit d'inventer
     prompt_final = f"""
 You are an expert Wordle solver.
 
-You are given a list of valid 5-letter ENGLISH words.
+You are given a list of valid {word_length}-letter ENGLISH words.
 You MUST choose words ONLY from this list.
 It is strictly forbidden to invent or modify any word.
 
@@ -277,28 +468,218 @@ Priority ranking:
 2. <WORD>
 3. <WORD>
 """
+    return dict(model=LLM_MODEL, messages=[{"role": "user", "content": prompt_final}])
+
+
+def rank_with_llm(candidates_for_llm: list, trace=None, word_length: int = WORD_LENGTH) -> str:
+    """
+    Ranking LLM bloquant (avec cache). Retour : le texte de la réponse.
+    """
+    request = _ranking_request(candidates_for_llm, word_length)
+    response = chat_cached(trace=trace, trace_stage="llm_rank", **request)
+    return response["message"]["content"]
+
+
+def stream_llm_ranking(candidates_for_llm: list, trace=None, word_length: int = WORD_LENGTH):
+    """
+    Générateur (synchrone) des morceaux de la réponse LLM, pour un affichage progressif
+    (ex. st.write_stream). Une réponse déjà en cache est renvoyée d'un bloc.
+
+    `trace` : durée totale, délai du premier morceau et tokens (dernier morceau, done=True).
+    """
+    t0 = time.perf_counter()
+    request = _ranking_request(candidates_for_llm, word_length)
+    key = request_key(**request)
+    hit = get_llm_cache().get(key)
+    if hit is not None:
+        if trace is not None:
+            trace.llm_call("llm_rank", hit, (time.perf_counter() - t0) * 1000, cached=True)
+        yield hit["message"]["content"]
+        return
+
+    client = ollama.Client(host=OLLAMA_HOST, timeout=LLM_TIMEOUT_S)
+    parts, first_ms, last = [], None, None
+    for chunk in client.chat(stream=True, **request):
+        if first_ms is None:
+            first_ms = (time.perf_counter() - t0) * 1000
+        last = chunk
+        piece = chunk["message"]["content"]
+        parts.append(piece)
+        yield piece
+    if trace is not None:
+        elapsed = (time.perf_counter() - t0) * 1000
+        trace.llm_call("llm_rank", _final_chunk(last), elapsed, cached=False, first_chunk_ms=first_ms)
+    get_llm_cache().set(key, {"message": {"role": "assistant", "content": "".join(parts)}})
+
+
+async def astream_llm_ranking(
+    candidates_for_llm: list, timeout_s: float = LLM_TIMEOUT_S, trace=None, word_length: int = WORD_LENGTH
+):
+    """
+    Générateur asynchrone (ollama.AsyncClient) des morceaux de la réponse LLM.
+
+    `timeout_s` borne l'attente de CHAQUE morceau : asyncio.TimeoutError si le
+    serveur ne répond plus. La réponse complète est mise en cache.
+    """
+    t0 = time.perf_counter()
+    request = _ranking_request(candidates_for_llm, word_length)
+    key = request_key(**request)
+    hit = get_llm_cache().get(key)
+    if hit is not None:
+        if trace is not None:
+            trace.llm_call("llm_rank", hit, (time.perf_counter() - t0) * 1000, cached=True)
+        yield hit["message"]["content"]
+        return
+
+    client = ollama.AsyncClient(host=OLLAMA_HOST)
+    stream = await asyncio.wait_for(client.chat(stream=True, **request), timeout=timeout_s)
+    iterator = stream.__aiter__()
+    parts, first_ms, last = [], None, None
+    while True:
+        try:
+            chunk = await asyncio.wait_for(iterator.__anext__(), timeout=timeout_s)
+        except StopAsyncIteration:
+            break
+        if first_ms is None:
+            first_ms = (time.perf_counter() - t0) * 1000
+        last = chunk
+        piece = chunk["message"]["content"]
+        parts.append(piece)
+        yield piece
+    if trace is not None:
+        elapsed = (time.perf_counter() - t0) * 1000
+        trace.llm_call("llm_rank", _final_chunk(last), elapsed, cached=False, first_chunk_ms=first_ms)
+    get_llm_cache().set(key, {"message": {"role": "assistant", "content": "".join(parts)}})
+
+
+def _final_chunk(chunk) -> dict:
+    # Le dernier morceau d'un stream Ollama (done=True) porte les compteurs de tokens
+    return response_to_dict(chunk) if chunk is not None else {}
+
+
+def interroger_agent_wordle(
+    prompt_utilisateur: str,
+    dictionary_words,
+    attempts: list,
+    engine=None,
+    session=None,
+    ranker: str = "llm",
+    all_guesses: bool = False,
+    scorer=None,
+    book=None,
+    with_trace: bool = False,
+    trace_log=None,
+):
+    """
+    Pipeline complet de l'agent Wordle.
+
+    Entrées :
+      - prompt_utilisateur : texte brut utilisateur (ex: "ORATE -> GVVJG" ou phrase libre)
+      - dictionary_words : liste de mots 5 lettres (domaine CSP)
+      - attempts : historique MUTABLE des tentatives [(guess, feedback), ...]
+                  (persisté entre tours côté Streamlit/session_state)
+      - engine : PatternEngine optionnel (pattern_engine.py, NumPy) construit sur
+                 dictionary_words ; si fourni, le filtrage CSP est vectorisé
+      - session : WordleSession optionnelle (wordle_session.py) tenue en phase avec
+                  `attempts` ; si fournie, seuls les survivants du tour précédent
+                  sont filtrés par la nouvelle tentative (filtrage incrémental)
+      - ranker : "llm" (Ollama, défaut), "entropy" (entropy_ranker.py, déterministe,
+                 sans LLM, sur TOUS les candidats ; nécessite `engine`) ou "minimax"
+                 (absurdle.py : plus petit pire cas, contre un hôte adversarial)
+      - all_guesses : en mode "entropy"/"minimax", score aussi les mots hors candidats
+                      (ignoré si la session est en mode difficile)
+      - scorer : ParallelScorer optionnel (parallel_scoring.py), scoring multi-processus
+      - book : OpeningBook optionnel (opening_book.py) ; en mode "entropy", les états
+               connus (premiers coups) sont servis par lookup avant tout calcul
+      - with_trace : si True, retourne (texte, trace) où trace est le dict d'une
+                     PipelineTrace (pipeline_trace.py) : durée par étape, candidats
+                     avant / après chaque contrainte, latence et tokens LLM
+      - trace_log : TraceLog optionnel, la trace du tour y est ajoutée (JSONL)
+
+    Étapes :
+      1) parse direct via regex (rapide, déterministe)
+      2) fallback extraction via LLM si le texte est libre
+      3) append dans l'historique
+      4) CSP: filtrage des candidats compatibles
+      5) si trop de candidats, on sous-échantillonne ceux envoyés au LLM (coût/latence)
+      6) LLM: propose un ranking / next guess parmi les candidats
+         (ou, si ranker="entropy", classement par entropie attendue sans LLM)
+
+    Les étapes 1-4 sont aussi disponibles seules (appliquer_tentative), pour afficher
+    le résultat CSP immédiatement puis streamer le ranking LLM (astream_llm_ranking).
+    """
+    trace = None
+    if with_trace or trace_log is not None:
+        trace = PipelineTrace(prompt_utilisateur, ranker=ranker)
 
-    final_response = ollama.chat(
-        model="llama3.1",
-        messages=[{"role": "user", "content": prompt_final}],
+    text = _run_agent(
+        prompt_utilisateur, dictionary_words, attempts, engine, session, ranker, all_guesses, scorer, book, trace
     )
+    if trace is None:
+        return text
 
-    content = final_response["message"]["content"]
+    trace.meta["turn"] = len(attempts)
+    trace.finish()
+    if trace_log is not None:
+        trace_log.append(trace)
+    return (text, trace.to_dict()) if with_trace else text
 
-    # Affichage "humain" : on montre un extrait des candidats CSP
-    shown = ", ".join(possible[:30]) + ("..." if len(possible) > 30 else "")
 
-    note = ""
-    if len(possible) > MAX_CANDIDATES_TO_LLM:
-        note = (
-            f"\n(Note: CSP found {len(possible)} words; "
-            f"only {MAX_CANDIDATES_TO_LLM} were sent to the LLM.)\n"
-        )
+def _run_agent(
+    prompt_utilisateur, dictionary_words, attempts, engine, session, ranker, all_guesses, scorer, book, trace
+):
+    """
+    Corps de interroger_agent_wordle (étapes 1 à 6), instrumenté si `trace` est fourni.
+    """
+    possible, text = appliquer_tentative(
+        prompt_utilisateur, dictionary_words, attempts, engine=engine, session=session, trace=trace
+    )
+    if trace is not None:
+        trace.meta["accepted"] = possible is not None
+        trace.meta["candidates"] = len(possible) if possible is not None else None
+    if possible is None:
+        return text
+
+    # 5bis) Ranking déterministe (entropie ou minimax) : aucun appel LLM, tous les candidats
+    if ranker in ("entropy", "minimax"):
+        if engine is None:
+            raise ValueError(f"The {ranker} ranker requires NumPy (pattern_engine).")
+        # Mode difficile : seuls les candidats sont des guesses autorisés
+        if session is not None and session.hard_mode:
+            all_guesses = False
+        if session is not None and session.engine is engine:
+            candidate_idx = session.candidate_indices
+        else:
+            candidate_idx = [engine.index[w] for w in possible]
+
+        if ranker == "minimax":
+            from absurdle import format_minimax, rank_minimax
+
+            with stage(trace, "rank"):
+                ranked = rank_minimax(engine, candidate_idx, hard_mode=not all_guesses)
+            return f"{text}\nMINIMAX DECISION:\n{format_minimax(ranked)}"
+
+        from entropy_ranker import format_decision, rank_guesses
+
+        with stage(trace, "book"):
+            ranked = book.lookup(attempts) if book is not None else None
+        if trace is not None:
+            trace.meta["book_hit"] = ranked is not None
+        if ranked is None:
+            with stage(trace, "rank"):
+                ranked = rank_guesses(engine, candidate_idx, all_guesses=all_guesses, scorer=scorer)
+        return f"{text}\nENTROPY DECISION:\n{format_decision(ranked)}"
+
+    # 5) + 6) Sous-échantillonnage puis ranking LLM
+    with stage(trace, "trim"):
+        candidates_for_llm, note = select_candidates_for_llm(possible)
+    if trace is not None:
+        trace.meta["sent_to_llm"] = len(candidates_for_llm)
+    with stage(trace, "llm_rank"):
+        content = rank_with_llm(candidates_for_llm, trace=trace, word_length=session_word_length(engine, session))
 
     return (
-        f"ADDED ATTEMPT: {guess} -> {feedback}\n"
-        f"POSSIBLE WORDS ({len(possible)}):\n{shown}\n"
+        f"{text}"
         f"{note}\n"
         f"LLM DECISION:\n{content}"
     )
-
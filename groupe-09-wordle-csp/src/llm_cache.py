@@ -0,0 +1,123 @@
+"""
+Cache persistant des réponses LLM (SQLite) : prompt -> réponse.
+
+- clé   : SHA-256 de la requête complète (modèle, messages, outils) en JSON canonique
+- TTL   : une entrée plus vieille que `ttl_s` est ignorée puis supprimée
+- LRU   : au-delà de `max_entries`, les entrées les moins récemment lues sont évincées
+
+Les réponses sont stockées en JSON (dict), ce qui rend le résultat identique que la
+réponse vienne du cache ou d'Ollama.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+DEFAULT_CACHE_PATH = os.path.join("cache", "llm_cache.sqlite")
+DEFAULT_TTL_S = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def request_key(**request) -> str:
+    """
+    Empreinte stable d'une requête chat (ordre des clés indifférent).
+    """
+    blob = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def response_to_dict(response) -> dict:
+    """
+    ChatResponse (pydantic, ollama >= 0.4) ou dict -> dict JSON-sérialisable.
+    """
+    if hasattr(response, "model_dump"):
+        return response.model_dump(exclude_none=True)
+    return dict(response)
+
+
+class LLMCache:
+    """
+    Cache clé -> réponse JSON, partagé entre processus via SQLite.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        # check_same_thread=False : Streamlit exécute les scripts dans plusieurs threads
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl_s is not None and now - created > self.ttl_s:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return json.loads(value)
+
+    def set(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        # TTL puis LRU (appelé sous verrou)
+        if self.ttl_s is not None:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_s,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN"
+                " (SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
+
+    def close(self) -> None:
+        self._db.close()
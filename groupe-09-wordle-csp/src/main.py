@@ -1,3 +1,6 @@
+import argparse
+import asyncio
+import atexit
 import sys
 
 # ---------------------------------------------------------------------------
@@ -14,7 +17,96 @@ try:
 except Exception:
     KEYBOARD_AVAILABLE = False
 
-from llm_agent import interroger_agent_wordle, load_dictionary
+# ---------------------------------------------------------------------------
+# Optional dependency: NumPy (moteur de feedback vectorisé)
+# ---------------------------------------------------------------------------
+# Sans NumPy, on retombe sur le filtrage CSP pur Python (solve_wordle_csp).
+try:
+    from pattern_engine import PatternEngine
+    ENGINE_AVAILABLE = True
+except Exception:
+    ENGINE_AVAILABLE = False
+
+from csp_solver import WORD_LENGTH
+from llm_agent import (
+    LLM_TIMEOUT_S,
+    appliquer_tentative,
+    astream_llm_ranking,
+    interroger_agent_wordle,
+    load_dictionary,
+    select_candidates_for_llm,
+)
+from pipeline_trace import DEFAULT_TRACE_PATH, PipelineTrace, TraceLog, stage
+from wordle_session import WordleSession
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Wordle Solver (CSP + Ollama).")
+    p.add_argument(
+        "--ranker",
+        choices=["llm", "entropy", "minimax"],
+        default="llm",
+        help="llm: ranking via Ollama | entropy: ranking déterministe (entropie attendue, sans LLM)"
+        " | minimax: plus petit pire cas (Absurdle)",
+    )
+    p.add_argument(
+        "--build-matrix",
+        action="store_true",
+        help="(entropy) construit la matrice de feedbacks si elle manque (une fois, ~480 Mo dans cache/)",
+    )
+    p.add_argument(
+        "--hard",
+        action="store_true",
+        help="mode difficile : chaque guess doit être compatible avec les feedbacks précédents",
+    )
+    p.add_argument(
+        "--all-guesses",
+        action="store_true",
+        help="(entropy/minimax) score aussi les mots hors candidats (ignoré en mode difficile)",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="(entropy) nb de processus pour le scoring des guesses (0 = tous les coeurs)",
+    )
+    p.add_argument(
+        "--llm-timeout",
+        type=float,
+        default=LLM_TIMEOUT_S,
+        help="(llm) délai max d'attente de chaque morceau de réponse (secondes)",
+    )
+    p.add_argument(
+        "--trace",
+        nargs="?",
+        const=DEFAULT_TRACE_PATH,
+        default=None,
+        metavar="PATH",
+        help=f"mesure chaque étape du pipeline et ajoute une ligne JSON par tour (défaut : {DEFAULT_TRACE_PATH})",
+    )
+    return p
+
+
+def format_timings(trace: dict) -> str:
+    """
+    Une ligne : durée totale puis durée de chaque étape (ms).
+    """
+    stages = ", ".join(f"{s['stage']}={s['ms']:.1f}" for s in trace["stages"])
+    return f"[trace] total={trace['total_ms']:.1f} ms ({stages})"
+
+
+async def print_llm_ranking(candidates_for_llm, timeout_s: float, trace=None, word_length: int = WORD_LENGTH) -> None:
+    """
+    Affiche la réponse du LLM au fil de l'eau (les candidats CSP sont déjà affichés).
+    """
+    try:
+        async for piece in astream_llm_ranking(
+            candidates_for_llm, timeout_s=timeout_s, trace=trace, word_length=word_length
+        ):
+            print(piece, end="", flush=True)
+        print()
+    except asyncio.TimeoutError:
+        print(f"\n(LLM timeout after {timeout_s:.0f}s: ranking unavailable)")
 
 
 def main():
@@ -31,9 +123,12 @@ def main():
               * filtre les candidats via CSP
               * demande au LLM de proposer un ranking / next guess
     """
+    args = build_parser().parse_args()
+
     print("--- Wordle Solver (Ollama + CSP) ---")
     print("Input format: GUESS FEEDBACK  (V=green, J=yellow, G=gray)")
     print("Examples: ORATE GVVJG   |   ORATE -> GVVJG")
+    print("Undo last attempt: type 'undo'.")
     print("Quit: type 'quit' or press Ctrl+C.\n")
 
     # 1) Chargement du dictionnaire (domaine CSP)
@@ -43,8 +138,47 @@ def main():
         print("Dictionary is empty. Please check 'wordle.txt'.")
         sys.exit(1)
 
+    # Moteur vectorisé : matrice memory-mappée si déjà construite
+    # (python pattern_engine.py --build ou --build-matrix), sinon lignes calculées à la demande
+    engine = None
+    if ENGINE_AVAILABLE:
+        if args.build_matrix:
+            print("Building the pattern matrix if missing (one-time, may take a few minutes)...")
+        engine = PatternEngine.load_or_build(dictionary, precompute=args.build_matrix)
+    if args.ranker in ("entropy", "minimax") and engine is None:
+        print(f"The {args.ranker} ranker requires NumPy (pip install numpy).")
+        sys.exit(1)
+    if args.ranker == "entropy" and engine.matrix is None:
+        # Sans matrice, chaque tour calcule les lignes de tous les guesses (~9 s contre ~1 s)
+        print(
+            "Hint: no precomputed pattern matrix, each entropy turn will be slow.\n"
+            "      Build it once: python pattern_engine.py --build (or rerun with --build-matrix).\n"
+        )
+    if args.hard:
+        args.all_guesses = False
+
+    # Scoring multi-processus (matrice partagée via memmap / mémoire partagée)
+    scorer = None
+    if args.ranker == "entropy" and args.workers != 1:
+        from parallel_scoring import ParallelScorer
+
+        scorer = ParallelScorer(engine, workers=args.workers or None)
+        atexit.register(scorer.close)  # arrêt du pool + libération de la mémoire partagée
+
+    # Livre d'ouvertures (python opening_book.py --build) : premiers coups par lookup
+    book = None
+    if args.ranker == "entropy":
+        from opening_book import OpeningBook
+
+        book = OpeningBook.load_or_build(engine, all_guesses=args.all_guesses)
+
     # 2) Historique des tentatives (contraintes) conservé pendant la session
+    #    + état incrémental des candidats (seule la nouvelle tentative est filtrée)
     attempts = []
+    session = WordleSession(dictionary, engine=engine, hard_mode=args.hard)
+
+    # Instrumentation optionnelle (pipeline_trace.py) : une ligne JSON par tour
+    trace_log = TraceLog(args.trace) if args.trace else None
 
     # 3) Boucle interactive
     while True:
@@ -63,13 +197,59 @@ def main():
             # Entrée vide : on redemande
             continue
 
+        if user_text.lower() == "undo":
+            undone = session.undo()
+            if undone:
+                attempts.pop()
+                print(f"Removed attempt: {undone[0]} -> {undone[1]} ({len(session)} candidates)\n")
+            else:
+                print("Nothing to undo.\n")
+            continue
+
         print("\nThinking...\n")
 
         try:
-            # L'agent modifie `attempts` (il append la tentative validée).
-            # Il renvoie une string prête à afficher.
-            result = interroger_agent_wordle(user_text, dictionary, attempts)
-            print(result)
+            if args.ranker == "llm":
+                # CSP d'abord (affiché immédiatement), puis ranking LLM streamé
+                trace = PipelineTrace(user_text, ranker="llm") if trace_log is not None else None
+                possible, text = appliquer_tentative(
+                    user_text, dictionary, attempts, engine=engine, session=session, trace=trace
+                )
+                print(text)
+                if possible is not None:
+                    with stage(trace, "trim"):
+                        candidates_for_llm, note = select_candidates_for_llm(possible)
+                    print(f"{note}\nLLM DECISION:")
+                    with stage(trace, "llm_rank"):
+                        asyncio.run(print_llm_ranking(candidates_for_llm, args.llm_timeout, trace, session.word_length))
+                if trace is not None:
+                    trace.meta.update(
+                        turn=len(attempts),
+                        accepted=possible is not None,
+                        candidates=len(possible) if possible is not None else None,
+                    )
+                    trace_log.append(trace)
+                    print(format_timings(trace.to_dict()))
+            else:
+                # L'agent modifie `attempts` (il append la tentative validée).
+                # Il renvoie une string prête à afficher.
+                result = interroger_agent_wordle(
+                    user_text,
+                    dictionary,
+                    attempts,
+                    engine=engine,
+                    session=session,
+                    ranker=args.ranker,
+                    all_guesses=args.all_guesses,
+                    scorer=scorer,
+                    book=book,
+                    with_trace=trace_log is not None,
+                    trace_log=trace_log,
+                )
+                if trace_log is not None:
+                    result, trace = result
+                    result = f"{result}\n{format_timings(trace)}"
+                print(result)
         except Exception as e:
             # On catch pour éviter de casser la session CLI sur une erreur ponctuelle
             print(f"Error: {e}")
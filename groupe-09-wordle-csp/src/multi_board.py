@@ -0,0 +1,333 @@
+"""
+Mode multi-grilles (Dordle K=2, Quordle K=4, ...) : K secrets, UN seul flux de guesses.
+
+Chaque guess est joué sur toutes les grilles non résolues ; chaque grille renvoie son
+propre feedback et garde son propre ensemble de candidats (une WordleSession par
+grille, même dictionnaire / même PatternEngine).
+
+Choix du guess (information jointe) : les secrets étant indépendants, l'entropie du
+n-uplet de feedbacks est la SOMME des entropies par grille :
+    H(g) = sum_k H_k(g)       E(g) = sum_k E_k(g)
+Un bloc de la matrice de feedbacks (guesses x candidats de TOUTES les grilles,
+concaténés) est compté en un seul np.bincount, chaque grille décalée de 3**L seaux.
+Les grilles ayant le même ensemble de candidats (ex. au premier coup) ne sont scorées
+qu'une fois, puis pondérées par leur multiplicité ; si toutes les grilles actives ont
+le même historique, le livre d'ouvertures (opening_book.py) sert le classement.
+
+Utilisation :
+    python multi_board.py --boards 4
+    python multi_board.py --boards 2 --simulate 200
+"""
+
+import argparse
+import random
+import time
+from typing import Optional
+
+import numpy as np
+
+from csp_solver import WORD_LENGTH, clean_attempts
+from entropy_ranker import DEFAULT_BATCH, MAX_BUCKET_CELLS, format_decision
+from letter_index import LetterIndex
+from wordle_session import WordleSession
+
+
+DEFAULT_BOARDS = 4
+
+
+# ---------------------------------------------------------------------------
+# Session multi-grilles
+# ---------------------------------------------------------------------------
+class MultiBoardSession:
+    """
+    K grilles partageant le même flux de guesses.
+
+    - `boards[k]` : WordleSession de la grille k
+    - `solved[k]` : True dès que la grille k a reçu un feedback tout vert
+    - `history`   : [(guess, (fb_0, ..., fb_K-1)), ...] (None pour une grille déjà résolue)
+    """
+
+    def __init__(self, boards: int = DEFAULT_BOARDS, dictionary_words=None, engine=None, word_length: int = WORD_LENGTH):
+        if boards < 1:
+            raise ValueError("boards doit être >= 1")
+        index = None if engine is not None else LetterIndex(dictionary_words or [], word_length)
+        self.boards = [WordleSession(dictionary_words, engine, word_length, index=index) for _ in range(boards)]
+        self.engine = engine
+        self.words = self.boards[0].words
+        self.word_length = self.boards[0].word_length
+        self.solved = [False] * boards
+        self.history: list = []
+
+    def __len__(self) -> int:
+        return len(self.boards)
+
+    @property
+    def active(self) -> list:
+        """
+        Indices des grilles encore à résoudre.
+        """
+        return [k for k, done in enumerate(self.solved) if not done]
+
+    @property
+    def finished(self) -> bool:
+        return all(self.solved)
+
+    @property
+    def candidates(self) -> list:
+        return [board.candidates for board in self.boards]
+
+    # -- transitions ----------------------------------------------------------
+    def push(self, guess: str, feedbacks) -> list:
+        """
+        Joue `guess` sur toutes les grilles actives.
+
+        feedbacks : un feedback par grille (K valeurs ; None/"-" pour une grille résolue),
+                    ou un feedback par grille ACTIVE, dans l'ordre.
+        Retour : la liste des candidats de chaque grille.
+        Lève ValueError si un feedback est mal formé (aucune grille n'est alors modifiée).
+        """
+        active = self.active
+        feedbacks = list(feedbacks)
+        if len(feedbacks) == len(active) and len(active) != len(self.boards):
+            feedbacks = dict(zip(active, feedbacks))
+        elif len(feedbacks) == len(self.boards):
+            feedbacks = dict(enumerate(feedbacks))
+        else:
+            raise ValueError(f"Expected {len(self.boards)} feedbacks (or {len(active)} for active boards)")
+
+        # Validation de TOUTES les grilles avant de modifier l'état
+        played = {}
+        for k in active:
+            cleaned = clean_attempts([(guess, feedbacks[k] or "")], self.word_length)
+            if not cleaned:
+                raise ValueError(f"Invalid attempt on board {k + 1}: {guess!r} -> {feedbacks[k]!r}")
+            played[k] = cleaned[0]
+
+        guess = next(iter(played.values()))[0] if played else guess.strip().upper()
+        for k, (g, fb) in played.items():
+            self.boards[k].push(g, fb)
+            if fb == "V" * self.word_length:
+                self.solved[k] = True
+
+        self.history.append((guess, tuple(played[k][1] if k in played else None for k in range(len(self.boards)))))
+        return self.candidates
+
+    def undo(self):
+        """
+        Annule le dernier guess sur toutes les grilles où il avait été joué.
+        """
+        if not self.history:
+            return None
+        guess, feedbacks = self.history.pop()
+        for k, fb in enumerate(feedbacks):
+            if fb is not None:
+                self.boards[k].undo()
+                self.solved[k] = False
+        return guess, feedbacks
+
+    def reset(self) -> None:
+        for board in self.boards:
+            board.reset()
+        self.solved = [False] * len(self.boards)
+        self.history.clear()
+
+
+# ---------------------------------------------------------------------------
+# Scoring joint (vectorisé)
+# ---------------------------------------------------------------------------
+def score_guesses_multi(engine, boards, guesses=None, batch: int = DEFAULT_BATCH):
+    """
+    Score les `guesses` (indices ; None = tout le dictionnaire) contre plusieurs grilles.
+
+    boards : liste de tableaux d'indices de candidats (un par grille active, non vide).
+    Retour : (guess_idx, entropie jointe, somme des candidats restants attendus).
+    """
+    # Grilles identiques -> scorées une fois, pondérées
+    groups: dict = {}
+    for cands in boards:
+        cands = np.asarray(cands, dtype=np.int32)
+        key = cands.tobytes()
+        if key in groups:
+            groups[key][1] += 1
+        else:
+            groups[key] = [cands, 1]
+    uniq = [c for c, _ in groups.values()]
+    weights = np.array([w for _, w in groups.values()], dtype=np.float64)
+    sizes = np.array([c.size for c in uniq], dtype=np.float64)
+
+    n_patterns = engine.n_patterns
+    n_bins = len(uniq) * n_patterns
+    columns = np.concatenate(uniq)
+    shift = np.repeat(np.arange(len(uniq), dtype=np.int64) * n_patterns, [c.size for c in uniq])
+    batch = max(1, min(batch, MAX_BUCKET_CELLS // max(n_bins, columns.size)))
+
+    if guesses is None:
+        n = len(engine)
+        guess_idx = np.arange(n, dtype=np.int32)
+        parts = [slice(s, min(s + batch, n)) for s in range(0, n, batch)]
+    else:
+        guess_idx = np.asarray(guesses)
+        parts = [guess_idx[s:s + batch] for s in range(0, guess_idx.size, batch)]
+
+    entropy = np.empty(guess_idx.size, dtype=np.float64)
+    expected = np.empty(guess_idx.size, dtype=np.float64)
+    pos = 0
+    for part in parts:
+        block = engine.block(part, columns)
+        b = block.shape[0]
+        flat = (np.arange(b, dtype=np.int64)[:, None] * n_bins + shift[None, :] + block).ravel()
+        counts = np.bincount(flat, minlength=b * n_bins).reshape(b, len(uniq), n_patterns).astype(np.float64)
+
+        nlogn = np.zeros_like(counts)
+        np.log2(counts, out=nlogn, where=counts > 0)
+        nlogn *= counts
+        h = np.log2(sizes) - nlogn.sum(axis=2) / sizes  # (b, grilles)
+        e = (counts * counts).sum(axis=2) / sizes
+
+        entropy[pos:pos + b] = h @ weights
+        expected[pos:pos + b] = e @ weights
+        pos += b
+    return guess_idx, entropy, expected
+
+
+def rank_guesses_multi(
+    engine,
+    session: MultiBoardSession,
+    all_guesses: bool = False,
+    top: int = 3,
+    batch: int = DEFAULT_BATCH,
+    book=None,
+) -> list:
+    """
+    Classe les prochains guesses pour l'ensemble des grilles actives.
+
+    - un mot qui est le SEUL candidat d'une grille passe en tête (grille résolue à coup sûr)
+    - puis entropie jointe maximale, E minimal, guess candidat d'au moins une grille
+    - book : OpeningBook optionnel, utilisé tant que les grilles actives sont dans le même
+             état (même classement qu'une grille seule, scores multipliés par K)
+
+    Retour : [(mot, entropie jointe en bits, candidats restants attendus), ...]
+    """
+    active = [session.boards[k] for k in session.active]
+    if book is not None and active and all(b.attempts == active[0].attempts for b in active):
+        ranked = book.lookup(active[0].attempts)
+        if ranked is not None:
+            k = len(active)
+            return [(w, h * k, e * k) for w, h, e in ranked[:top]]
+
+    boards = [np.asarray(session.boards[k].candidate_indices, dtype=np.int32) for k in session.active]
+    boards = [c for c in boards if c.size > 0]
+    if not boards:
+        return []
+
+    pool = np.unique(np.concatenate(boards))
+    guess_idx, entropy, expected = score_guesses_multi(
+        engine, boards, guesses=None if all_guesses else pool, batch=batch
+    )
+
+    certain = np.isin(guess_idx, [c[0] for c in boards if c.size == 1])
+    is_candidate = np.isin(guess_idx, pool)
+    # np.lexsort : la DERNIÈRE clé est la clé principale
+    order = np.lexsort((guess_idx, ~is_candidate, expected, -np.round(entropy, 9), ~certain))[:top]
+    return [(engine.words[guess_idx[i]], float(entropy[i]), float(expected[i])) for i in order]
+
+
+def best_guess_multi(engine, session: MultiBoardSession, all_guesses: bool = False, book=None) -> Optional[str]:
+    ranked = rank_guesses_multi(engine, session, all_guesses=all_guesses, top=1, book=book)
+    return ranked[0][0] if ranked else None
+
+
+def format_boards(session: MultiBoardSession, shown: int = 8) -> str:
+    lines = []
+    for k, board in enumerate(session.boards):
+        if session.solved[k]:
+            lines.append(f"Board {k + 1}: solved")
+            continue
+        cands = board.candidates
+        extract = ", ".join(cands[:shown]) + ("..." if len(cands) > shown else "")
+        lines.append(f"Board {k + 1} ({len(cands)}): {extract}")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Simulation (auto-jeu) et boucle interactive
+# ---------------------------------------------------------------------------
+def play_multi(secrets, session: MultiBoardSession, all_guesses: bool = False, book=None, max_turns: int = 30):
+    """
+    Joue une partie contre `secrets` (un par grille). Retour : (nb de guesses, latences par tour).
+    """
+    from csp_solver import wordle_feedback_vjg
+
+    session.reset()
+    latencies = []
+    while not session.finished and len(session.history) < max_turns:
+        t0 = time.perf_counter()
+        guess = best_guess_multi(session.engine, session, all_guesses=all_guesses, book=book)
+        latencies.append(time.perf_counter() - t0)
+        if guess is None:
+            break
+        session.push(guess, [None if session.solved[k] else wordle_feedback_vjg(s, guess) for k, s in enumerate(secrets)])
+    return len(session.history), latencies
+
+
+def main():
+    from llm_agent import load_dictionary
+    from opening_book import OpeningBook
+    from pattern_engine import PatternEngine
+
+    parser = argparse.ArgumentParser(description="Wordle multi-grilles (Dordle / Quordle).")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    parser.add_argument("--boards", type=int, default=DEFAULT_BOARDS)
+    parser.add_argument("--length", type=int, default=WORD_LENGTH, help="longueur des mots (5 = Wordle)")
+    parser.add_argument("--all-guesses", action="store_true")
+    parser.add_argument("--simulate", type=int, default=0, metavar="GAMES", help="auto-jeu sur GAMES parties aléatoires")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    words = load_dictionary(args.dictionary, args.length)
+    if not words:
+        raise SystemExit("Dictionary is empty.")
+    engine = PatternEngine.load_or_build(words)
+    book = OpeningBook.load_or_build(engine, all_guesses=args.all_guesses)
+    session = MultiBoardSession(args.boards, engine=engine)
+
+    if args.simulate:
+        rng = random.Random(args.seed)
+        turns, latencies = [], []
+        for _ in range(args.simulate):
+            n, lat = play_multi(rng.sample(words, args.boards), session, all_guesses=args.all_guesses, book=book)
+            turns.append(n)
+            latencies.extend(lat)
+        print(
+            f"{args.simulate} games x {args.boards} boards | guesses mean={np.mean(turns):.2f} max={max(turns)}"
+            f" | turn latency p50={np.percentile(latencies, 50) * 1000:.1f} ms"
+            f" p99={np.percentile(latencies, 99) * 1000:.1f} ms"
+        )
+        return
+
+    print(f"{args.boards} boards, {len(words)} words of {args.length} letters.")
+    print("Enter: GUESS FB1 FB2 ... (one feedback per board, '-' for solved boards), 'undo' or 'quit'.")
+    while not session.finished:
+        print(format_decision(rank_guesses_multi(engine, session, all_guesses=args.all_guesses, book=book)))
+        line = input("> ").strip()
+        if line.lower() in ("quit", "exit"):
+            break
+        if line.lower() == "undo":
+            print(f"Undone: {session.undo()}")
+            continue
+        parts = line.split()
+        if len(parts) < 2:
+            print("Expected: GUESS FB1 FB2 ...")
+            continue
+        try:
+            session.push(parts[0], [None if p == "-" else p for p in parts[1:]])
+        except ValueError as e:
+            print(e)
+            continue
+        print(format_boards(session))
+    if session.finished:
+        print(f"All boards solved in {len(session.history)} guesses.")
+
+
+if __name__ == "__main__":
+    main()
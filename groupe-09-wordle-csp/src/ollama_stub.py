@@ -0,0 +1,132 @@
+"""
+Serveur local minimal imitant l'API chat d'Ollama (POST /api/chat).
+
+Sert à tester l'agent (cache, chemin asynchrone, timeouts, streaming) sans modèle :
+  - requête avec `tools` (extraction) : renvoie un tool call extract_wordle_attempt
+    construit par regex sur le texte utilisateur
+  - requête de ranking : choisit les 3 premiers mots de la liste fournie
+  - `--delay` simule la latence d'un vrai modèle (utile pour tester les timeouts)
+
+Utilisation :
+    python ollama_stub.py --port 11435
+    OLLAMA_HOST=http://127.0.0.1:11435 python main.py
+"""
+
+import argparse
+import ast
+import json
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+_WORD = re.compile(r"\b([A-Za-z]{5})\b")
+_FEEDBACK = re.compile(r"\b([VvJjGg](?:\s*[VvJjGg]){4})\b")
+_LIST = re.compile(r"List of possible words:\s*(\[.*?\])", re.S)
+
+
+def _extraction_reply(text: str) -> dict:
+    text = text.split("USER TEXT:", 1)[-1]
+    fb = _FEEDBACK.search(text)
+    feedback = re.sub(r"\s+", "", fb.group(1)).upper() if fb else ""
+    words = [w for w in _WORD.findall(text) if not fb or w.upper() != feedback]
+    guess = words[0].upper() if words else ""
+    return {
+        "role": "assistant",
+        "content": "",
+        "tool_calls": [
+            {"function": {"name": "extract_wordle_attempt", "arguments": {"guess": guess, "feedback": feedback}}}
+        ],
+    }
+
+
+def _ranking_reply(text: str) -> dict:
+    m = _LIST.search(text)
+    words = ast.literal_eval(m.group(1)) if m else []
+    top = (words + ["?????"] * 3)[:3]
+    content = f"Chosen word: {top[0]}\n\nPriority ranking:\n\n1. {top[0]}\n2. {top[1]}\n3. {top[2]}"
+    return {"role": "assistant", "content": content}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay_s = 0.0
+    model = "llama3.1"
+
+    def log_message(self, fmt, *args):  # silencieux
+        pass
+
+    def _send(self, status: int, body: bytes, ctype: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client parti (timeout côté agent)
+
+    def do_GET(self):
+        self._send(200, b"Ollama is running", "text/plain")
+
+    def do_POST(self):
+        if self.path != "/api/chat":
+            self._send(404, b'{"error": "not found"}')
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        text = "\n".join(m.get("content", "") for m in request.get("messages", []))
+        message = _extraction_reply(text) if request.get("tools") else _ranking_reply(text)
+
+        time.sleep(self.delay_s)
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        base = {"model": request.get("model", self.model), "created_at": created}
+
+        if not request.get("stream", False):
+            body = dict(base, message=message, done=True, eval_count=len(message["content"].split()))
+            self._send(200, json.dumps(body).encode("utf-8"))
+            return
+
+        # Streaming NDJSON : un morceau par ligne (envoyé au fil de l'eau),
+        # puis un message final done=true ; la fin du flux = fermeture (HTTP/1.0)
+        lines = []
+        for piece in re.findall(r"\S+\s*", message["content"]) or [""]:
+            lines.append(dict(base, message={"role": "assistant", "content": piece}, done=False))
+        lines.append(dict(base, message={"role": "assistant", "content": ""}, done=True))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for line in lines:
+                self.wfile.write((json.dumps(line) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(self.delay_s / len(lines))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 11435, delay_s: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Crée le serveur (à lancer avec .serve_forever(), éventuellement dans un thread).
+    """
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"delay_s": delay_s})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub local de l'API Ollama (tests sans modèle).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--delay", type=float, default=0.0, help="latence simulée (secondes)")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.delay)
+    print(f"Ollama stub listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
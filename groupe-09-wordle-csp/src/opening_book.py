@@ -0,0 +1,178 @@
+"""
+Livre d'ouvertures Wordle : arbre de décision précalculé pour les premiers coups.
+
+Les premiers guesses sont identiques pour toutes les parties (même dictionnaire,
+même politique) : on les calcule une fois avec entropy_ranker, pour chaque état
+atteignable sur les `depth` premiers niveaux, puis on les sert par lookup O(1).
+
+Clé d'un état : l'historique de tentatives normalisé puis TRIÉ
+    "ORATE:GGGJG|SLUNK:GGGGG"
+(l'ensemble des candidats ne dépend pas de l'ordre des tentatives, donc deux
+historiques permutés partagent la même entrée). État initial : "".
+
+Format sur disque : JSON gzippé
+    {"digest": ..., "depth": ..., "all_guesses": ..., "book": {clé: [[mot, H, E], ...]}}
+
+Construction hors-ligne :
+    python opening_book.py --build --depth 2
+"""
+
+import argparse
+import gzip
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+from csp_solver import clean_attempts
+from entropy_ranker import bucket_counts, rank_guesses
+from pattern_engine import DEFAULT_CACHE_DIR, WORD_LENGTH, code_to_pattern, dictionary_digest
+
+
+def state_key(attempts, word_length: int = WORD_LENGTH) -> str:
+    """
+    Clé de cache d'un état de partie (historique normalisé et trié).
+    """
+    return "|".join(sorted(f"{g}:{fb}" for g, fb in clean_attempts(attempts, word_length)))
+
+
+class OpeningBook:
+    """
+    Table état -> classement [(mot, entropie, candidats restants attendus), ...].
+    """
+
+    def __init__(self, entries: dict, digest: str, depth: int, all_guesses: bool, word_length: int = WORD_LENGTH):
+        self.entries = entries
+        self.digest = digest
+        self.depth = depth
+        self.all_guesses = all_guesses
+        self.word_length = word_length
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, attempts) -> Optional[list]:
+        ranked = self.entries.get(state_key(attempts, self.word_length))
+        return [tuple(r) for r in ranked] if ranked else None
+
+    # -- persistance ----------------------------------------------------------
+    def save(self, path: str) -> None:
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        payload = {
+            "digest": self.digest,
+            "depth": self.depth,
+            "all_guesses": self.all_guesses,
+            "word_length": self.word_length,
+            "book": self.entries,
+        }
+        tmp = path + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "OpeningBook":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        return cls(
+            payload["book"],
+            payload["digest"],
+            payload["depth"],
+            payload["all_guesses"],
+            payload.get("word_length", WORD_LENGTH),
+        )
+
+    @staticmethod
+    def cache_path(words, depth: int, all_guesses: bool, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+        suffix = "_all" if all_guesses else ""
+        return os.path.join(cache_dir, f"opening_{dictionary_digest(words)}_d{depth}{suffix}.json.gz")
+
+    @classmethod
+    def load_or_build(
+        cls,
+        engine,
+        depth: int = 2,
+        all_guesses: bool = False,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        precompute: bool = False,
+    ) -> Optional["OpeningBook"]:
+        """
+        Charge le livre correspondant au dictionnaire s'il existe ;
+        sinon le construit si `precompute`, sinon None (calcul live uniquement).
+        """
+        path = cls.cache_path(engine.words, depth, all_guesses, cache_dir)
+        if os.path.exists(path):
+            return cls.load(path)
+        if not precompute:
+            return None
+        book = build_opening_book(engine, depth=depth, all_guesses=all_guesses)
+        book.save(path)
+        return book
+
+
+def build_opening_book(engine, depth: int = 2, all_guesses: bool = False, top: int = 3, scorer=None) -> OpeningBook:
+    """
+    Parcourt l'arbre de décision sur `depth` niveaux :
+      - au niveau 0, meilleur guess sur le dictionnaire complet ;
+      - pour chaque feedback possible de ce guess, meilleur guess sur le seau de candidats
+        correspondant, etc.
+    """
+    entries: dict = {}
+    all_green = engine.n_patterns - 1  # "VVVVV"
+    frontier = [([], engine.all_indices())]
+
+    for _ in range(depth):
+        next_frontier = []
+        for attempts, candidates in frontier:
+            ranked = rank_guesses(engine, candidates, all_guesses=all_guesses, top=top, scorer=scorer)
+            if not ranked:
+                continue
+            entries[state_key(attempts, engine.word_length)] = [[w, round(h, 6), round(e, 6)] for w, h, e in ranked]
+
+            # Enfants : un seau de candidats par feedback possible du guess choisi
+            guess = ranked[0][0]
+            codes = engine.row(guess)[candidates]
+            sizes = bucket_counts(codes[None, :], engine.n_patterns)[0]
+            for code in np.nonzero(sizes > 1)[0]:
+                if code == all_green:
+                    continue
+                child = attempts + [(guess, code_to_pattern(code, engine.word_length))]
+                next_frontier.append((child, candidates[codes == code]))
+        frontier = next_frontier
+
+    return OpeningBook(entries, dictionary_digest(engine.words), depth, all_guesses, engine.word_length)
+
+
+def main():
+    from llm_agent import load_dictionary
+    from pattern_engine import PatternEngine
+
+    parser = argparse.ArgumentParser(description="Construction du livre d'ouvertures Wordle.")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--all-guesses", action="store_true")
+    parser.add_argument("--build", action="store_true")
+    args = parser.parse_args()
+
+    words = load_dictionary(args.dictionary)
+    if not words:
+        raise SystemExit("Dictionary is empty.")
+
+    path = OpeningBook.cache_path(words, args.depth, args.all_guesses, args.cache_dir)
+    if not args.build:
+        status = "present" if os.path.exists(path) else "missing"
+        print(f"Opening book {path}: {status}")
+        return
+
+    engine = PatternEngine.load_or_build(words, cache_dir=args.cache_dir)
+    book = build_opening_book(engine, depth=args.depth, all_guesses=args.all_guesses)
+    book.save(path)
+    print(f"Opening book saved -> {path} ({len(book)} states, depth={args.depth})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Scoring des guesses réparti sur plusieurs processus (ProcessPoolExecutor).
+
+Les données volumineuses ne sont JAMAIS picklées par tâche :
+  - si la matrice de feedbacks est sur disque (.npy), chaque worker l'ouvre en
+    memory-map (pages partagées par l'OS entre processus) ;
+  - sinon, les mots encodés (N x L uint8) sont placés en mémoire partagée
+    (multiprocessing.shared_memory) et chaque worker calcule ses blocs.
+
+Seuls les indices des candidats et les bornes de la tranche de guesses
+transitent entre processus.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from entropy_ranker import DEFAULT_BATCH, batch_for, score_block, score_guesses
+from pattern_engine import compute_patterns, n_patterns
+
+
+# En dessous de ce volume (guesses x candidats), le calcul reste dans le processus courant
+MIN_PARALLEL_WORK = 2_000_000
+
+# État global de chaque worker (initialisé une fois par processus)
+_WORKER: dict = {}
+
+
+def _init_worker(matrix_path, shm_name, n_words, word_length):
+    _WORKER["n_patterns"] = n_patterns(word_length)
+    if matrix_path is not None:
+        _WORKER["matrix"] = np.load(matrix_path, mmap_mode="r")
+    else:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _WORKER["shm"] = shm  # garder une référence, sinon le segment est fermé
+        _WORKER["encoded"] = np.ndarray((n_words, word_length), dtype=np.uint8, buffer=shm.buf)
+
+
+def _score_shard(start: int, stop: int, candidates: np.ndarray, batch: int):
+    entropy = np.empty(stop - start, dtype=np.float64)
+    expected = np.empty(stop - start, dtype=np.float64)
+    matrix = _WORKER.get("matrix")
+    for s in range(start, stop, batch):
+        e = min(s + batch, stop)
+        if matrix is not None:
+            block = np.take(matrix[s:e], candidates, axis=1)
+        else:
+            encoded = _WORKER["encoded"]
+            block = compute_patterns(encoded[s:e], encoded[candidates])
+        entropy[s - start:e - start], expected[s - start:e - start] = score_block(block, _WORKER["n_patterns"])
+    return start, entropy, expected
+
+
+class ParallelScorer:
+    """
+    Pool de workers pour scorer des guesses contre un ensemble de candidats.
+
+    Utilisation :
+        with ParallelScorer(engine, workers=4) as scorer:
+            rank_guesses(engine, candidates, all_guesses=True, scorer=scorer)
+
+    workers : nombre de processus (None = os.cpu_count()).
+    """
+
+    def __init__(self, engine, workers=None, batch: int = DEFAULT_BATCH):
+        self.engine = engine
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.batch = batch_for(engine.n_patterns, batch)
+        self._shm = None
+
+        if engine.matrix_path is not None:
+            initargs = (engine.matrix_path, None, len(engine), engine.word_length)
+        else:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, engine.encoded.nbytes))
+            shared = np.ndarray(engine.encoded.shape, dtype=np.uint8, buffer=self._shm.buf)
+            shared[:] = engine.encoded
+            initargs = (None, self._shm.name, len(engine), engine.word_length)
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=initargs
+        )
+
+    def score_guesses(self, candidates, guesses=None):
+        """
+        Même contrat que entropy_ranker.score_guesses.
+
+        Le parallélisme s'applique au scoring de tout le dictionnaire (guesses=None),
+        découpé en tranches contiguës ; une liste explicite de guesses (en pratique,
+        les candidats) est scorée dans le processus courant.
+        """
+        candidates = np.asarray(candidates, dtype=np.int32)
+        n = len(self.engine)
+        if (
+            guesses is not None
+            or self.workers == 1
+            or n * candidates.size < MIN_PARALLEL_WORK
+        ):
+            return score_guesses(self.engine, candidates, guesses=guesses, batch=self.batch)
+
+        # Une tranche par worker (+ marge pour équilibrer la charge)
+        n_shards = self.workers * 2
+        bounds = np.linspace(0, n, n_shards + 1, dtype=np.int64)
+        futures = [
+            self._pool.submit(_score_shard, int(a), int(b), candidates, self.batch)
+            for a, b in zip(bounds[:-1], bounds[1:])
+            if b > a
+        ]
+
+        entropy = np.empty(n, dtype=np.float64)
+        expected = np.empty(n, dtype=np.float64)
+        for fut in futures:
+            start, h, e = fut.result()
+            entropy[start:start + h.size] = h
+            expected[start:start + e.size] = e
+        return np.arange(n, dtype=np.int32), entropy, expected
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,332 @@
+"""
+Moteur de feedback vectorisé (optionnel, nécessite NumPy).
+
+Idée :
+  - chaque mot est encodé UNE fois en tableau uint8 (A=0 .. Z=25)
+  - le feedback V/J/G d'un couple (guess, secret) est compacté en un entier
+    base 3 (G=0, J=1, V=2, position i -> poids 3**i), donc dans [0, 242]
+  - on précalcule (ou on mémoïse ligne par ligne) la matrice
+        patterns[guess, answer] = code du feedback
+  - filtrer les candidats devient UNE comparaison vectorisée :
+        candidats[patterns[guess, candidats] == code_observé]
+
+La matrice complète (≈ 22k x 22k = ~480 Mo) peut être sauvegardée en `.npy`
+et rechargée en memory-map : le coût de construction n'est payé qu'une fois.
+
+Longueur variable : pour des mots de L lettres, il y a 3**L feedbacks ; les codes
+tiennent en uint8 jusqu'à L = 5, en uint16 jusqu'à L = 10 (uint32 au-delà).
+
+Construction hors-ligne :
+    python pattern_engine.py --build
+"""
+
+import argparse
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from csp_solver import WORD_LENGTH, clean_attempts
+
+
+N_PATTERNS = 3 ** WORD_LENGTH  # 243 feedbacks possibles (Wordle 5 lettres)
+
+_FB_DIGIT = {"G": 0, "J": 1, "V": 2}
+_DIGIT_FB = "GJV"
+
+DEFAULT_CACHE_DIR = "cache"
+
+
+# ---------------------------------------------------------------------------
+# Encodage mots / feedbacks
+# ---------------------------------------------------------------------------
+def n_patterns(word_length: int = WORD_LENGTH) -> int:
+    """
+    Nombre de feedbacks possibles pour des mots de `word_length` lettres.
+    """
+    return 3 ** word_length
+
+
+def code_dtype(word_length: int = WORD_LENGTH) -> np.dtype:
+    """
+    Plus petit type entier non signé contenant les codes [0, 3**L - 1].
+    """
+    return np.min_scalar_type(n_patterns(word_length) - 1)
+
+
+def encode_words(words, word_length: int = WORD_LENGTH) -> np.ndarray:
+    """
+    Encode une liste de mots (A-Z, `word_length` lettres, majuscules) en tableau (N, L) uint8.
+    """
+    words = list(words)
+    if not words:
+        return np.zeros((0, word_length), dtype=np.uint8)
+    raw = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8)
+    return (raw.reshape(len(words), word_length) - ord("A")).astype(np.uint8)
+
+
+def pattern_to_code(feedback: str) -> int:
+    """
+    "GVVJG" -> entier base 3 dans [0, 3**L - 1] (242 pour 5 lettres).
+    """
+    return sum(_FB_DIGIT[c] * 3 ** i for i, c in enumerate(feedback))
+
+
+def code_to_pattern(code: int, word_length: int = WORD_LENGTH) -> str:
+    """
+    Entier base 3 -> feedback "V/J/G" (inverse de pattern_to_code).
+    """
+    code = int(code)
+    out = []
+    for _ in range(word_length):
+        out.append(_DIGIT_FB[code % 3])
+        code //= 3
+    return "".join(out)
+
+
+def compute_patterns(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+    """
+    Calcule les codes de feedback pour tous les couples (guess, answer).
+
+    guesses : (B, L) uint8, answers : (N, L) uint8
+    Retour  : (B, N) codes base 3 (uint8 pour L <= 5, voir code_dtype).
+
+    Règles exactes (doublons compris) :
+      - vert  : même lettre à la même position
+      - jaune : la k-ième occurrence NON verte d'une lettre du guess est jaune
+                si le secret contient au moins k occurrences non vertes
+                de cette lettre
+    """
+    length = guesses.shape[1]
+    dtype = code_dtype(length)
+    powers = (3 ** np.arange(length)).astype(dtype)
+
+    green = guesses[:, None, :] == answers[None, :, :]  # (B, N, L)
+    not_green = ~green
+
+    # Nombre d'occurrences de chaque lettre dans chaque secret : (26, N)
+    counts = np.zeros((26, answers.shape[0]), dtype=np.uint8)
+    for j in range(length):
+        np.add.at(counts, (answers[:, j], np.arange(answers.shape[0])), 1)
+
+    out = np.zeros((guesses.shape[0], answers.shape[0]), dtype=dtype)
+    for i in range(length):
+        same = guesses == guesses[:, i][:, None]  # (B, L) : positions du guess avec la même lettre
+
+        # Occurrences non vertes de la lettre g[i] dans le secret
+        # (une position verte j avec g[j] == g[i] consomme une occurrence)
+        avail = counts[guesses[:, i]].copy()  # (B, N)
+        for j in range(length):
+            avail -= green[:, :, j] & same[:, j][:, None]
+
+        # Occurrences non vertes de la même lettre déjà vues plus tôt dans le guess
+        prior = np.zeros(out.shape, dtype=np.uint8)
+        for k in range(i):
+            prior += not_green[:, :, k] & same[:, k][:, None]
+
+        yellow = not_green[:, :, i] & (avail > prior)
+        out += powers[i] * (2 * green[:, :, i] + yellow).astype(dtype)
+    return out
+
+
+def dictionary_digest(words) -> str:
+    """
+    Empreinte courte d'un dictionnaire (sert de clé de cache sur disque).
+    """
+    if hasattr(words, "sha1"):
+        return words.sha1()[:12]  # WordStore : même empreinte, sans décoder les mots
+    h = hashlib.sha1("\n".join(words).encode("ascii"))
+    return h.hexdigest()[:12]
+
+
+# ---------------------------------------------------------------------------
+# Moteur
+# ---------------------------------------------------------------------------
+class PatternEngine:
+    """
+    Dictionnaire encodé + matrice de feedbacks (complète ou mémoïsée).
+
+    - `matrix` : (N, N) codes si précalculée / chargée (éventuellement memmap)
+    - sinon les lignes sont calculées à la demande et gardées dans un LRU
+    - la longueur des mots est déduite du dictionnaire (5 si vide)
+    - `words` peut être un WordStore (word_store.py) : mots encodés depuis la vue
+      memory-mappée et index par recherche dichotomique, sans liste ni dict en mémoire
+    """
+
+    def __init__(self, words, matrix: Optional[np.ndarray] = None, max_cached_rows: int = 4096):
+        if hasattr(words, "letters"):
+            self.words = words
+            self.word_length = words.word_length
+            self.index = words.positions
+            self.encoded = words.letters - np.uint8(ord("A"))
+        else:
+            self.words = list(words)
+            self.word_length = len(self.words[0]) if self.words else WORD_LENGTH
+            if any(len(w) != self.word_length for w in self.words):
+                raise ValueError("Tous les mots du dictionnaire doivent avoir la même longueur")
+            self.index = {w: i for i, w in enumerate(self.words)}
+            self.encoded = encode_words(self.words, self.word_length)
+        self.n_patterns = n_patterns(self.word_length)
+        self.matrix = matrix
+        self.matrix_path: Optional[str] = None
+        self.max_cached_rows = max_cached_rows
+        self._rows: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    # -- lignes de la matrice -------------------------------------------------
+    def row(self, guess: str) -> np.ndarray:
+        """
+        Codes de feedback de `guess` contre TOUS les mots du dictionnaire.
+        Fonctionne aussi pour un guess hors dictionnaire.
+        """
+        i = self.index.get(guess)
+        if i is not None and self.matrix is not None:
+            return self.matrix[i]
+
+        cached = self._rows.get(guess)
+        if cached is not None:
+            self._rows.move_to_end(guess)
+            return cached
+
+        r = compute_patterns(encode_words([guess], self.word_length), self.encoded)[0]
+        self._rows[guess] = r
+        if len(self._rows) > self.max_cached_rows:
+            self._rows.popitem(last=False)
+        return r
+
+    def build(self, chunk: int = 256) -> np.ndarray:
+        """
+        Précalcule la matrice complète (N, N), par blocs de `chunk` guesses.
+        """
+        n = len(self.words)
+        matrix = np.empty((n, n), dtype=code_dtype(self.word_length))
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            matrix[start:stop] = compute_patterns(self.encoded[start:stop], self.encoded)
+        self.matrix = matrix
+        self._rows.clear()
+        return matrix
+
+    def block(self, guess_idx, answer_idx) -> np.ndarray:
+        """
+        Sous-matrice (len(guess_idx), len(answer_idx)) des codes de feedback.
+        `guess_idx` peut être une tranche (slice) : lecture contiguë du memmap.
+        """
+        if self.matrix is not None:
+            return np.take(self.matrix[guess_idx], answer_idx, axis=1)
+        return compute_patterns(self.encoded[guess_idx], self.encoded[answer_idx])
+
+    # -- persistance ----------------------------------------------------------
+    def save(self, path: str) -> None:
+        """
+        Sauvegarde la matrice en `.npy` (écriture atomique via fichier temporaire).
+        """
+        if self.matrix is None:
+            self.build()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.asarray(self.matrix))
+        os.replace(tmp, path)
+        self.matrix_path = path
+
+    @staticmethod
+    def cache_path(words, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+        return os.path.join(cache_dir, f"patterns_{dictionary_digest(words)}.npy")
+
+    @classmethod
+    def load(cls, words, path: str, mmap: bool = True) -> "PatternEngine":
+        """
+        Recharge une matrice sauvegardée (memory-map par défaut : démarrage instantané).
+        """
+        matrix = np.load(path, mmap_mode="r" if mmap else None)
+        if matrix.shape != (len(words), len(words)):
+            raise ValueError(f"Matrice {path} incompatible avec le dictionnaire")
+        engine = cls(words, matrix=matrix)
+        engine.matrix_path = path
+        return engine
+
+    @classmethod
+    def load_or_build(
+        cls,
+        words,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        precompute: bool = False,
+    ) -> "PatternEngine":
+        """
+        - si une matrice correspondant au dictionnaire existe dans `cache_dir` : memmap
+        - sinon, si `precompute` : construit + sauvegarde
+        - sinon : moteur paresseux (lignes calculées à la demande, sans coût au démarrage)
+        """
+        path = cls.cache_path(words, cache_dir)
+        if os.path.exists(path):
+            return cls.load(words, path)
+        engine = cls(words)
+        if precompute:
+            engine.build()
+            engine.save(path)
+        return engine
+
+    # -- filtrage CSP ---------------------------------------------------------
+    def all_indices(self) -> np.ndarray:
+        return np.arange(len(self.words), dtype=np.int32)
+
+    def filter(self, candidates: np.ndarray, guess: str, feedback: str) -> np.ndarray:
+        """
+        Garde les indices `candidates` compatibles avec (guess, feedback).
+        """
+        code = pattern_to_code(feedback)
+        return candidates[self.row(guess)[candidates] == code]
+
+    def solve_indices(self, attempts) -> np.ndarray:
+        candidates = self.all_indices()
+        for guess, fb in clean_attempts(attempts, self.word_length):
+            candidates = self.filter(candidates, guess, fb)
+            if candidates.size == 0:
+                break
+        return candidates
+
+    def solve(self, attempts) -> list:
+        """
+        Équivalent vectorisé de solve_wordle_csp(self.words, attempts).
+        """
+        return [self.words[i] for i in self.solve_indices(attempts)]
+
+
+# ---------------------------------------------------------------------------
+# Construction hors-ligne
+# ---------------------------------------------------------------------------
+def main():
+    from llm_agent import load_dictionary
+
+    parser = argparse.ArgumentParser(description="Précalcul de la matrice de feedbacks Wordle.")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--length", type=int, default=WORD_LENGTH, help="longueur des mots (5 = Wordle)")
+    parser.add_argument("--build", action="store_true", help="construit et sauvegarde la matrice")
+    args = parser.parse_args()
+
+    words = load_dictionary(args.dictionary, args.length)
+    if not words:
+        raise SystemExit("Dictionary is empty.")
+
+    path = PatternEngine.cache_path(words, args.cache_dir)
+    if not args.build:
+        status = "present" if os.path.exists(path) else "missing"
+        print(f"{len(words)} words | pattern matrix {path}: {status}")
+        return
+
+    engine = PatternEngine(words)
+    engine.build()
+    engine.save(path)
+    print(f"Pattern matrix saved -> {path} ({engine.matrix.nbytes / 1e6:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Instrumentation (opt-in) du pipeline de l'agent Wordle.
+
+Une `PipelineTrace` suit UN tour de interroger_agent_wordle / appliquer_tentative :
+  - durée de chaque étape (parse, llm_extract, normalize, csp, trim, rank, llm_rank...)
+  - taille de l'ensemble de candidats avant / après chaque contrainte
+  - appels LLM : latence, cache, tokens (prompt_eval_count / eval_count d'Ollama),
+    débit de génération et délai du premier morceau en streaming
+
+Sorties :
+  - structure JSON (`trace.to_dict()`), renvoyée par interroger_agent_wordle(with_trace=True)
+  - `TraceLog` : une ligne JSON par tour (outputs/wordle_traces.jsonl), pour analyse hors-ligne
+  - `RollingSummary` : moyenne / p50 / p95 par étape sur les derniers tours (barre latérale Streamlit)
+
+Sans trace (trace=None, défaut), le pipeline ne mesure rien.
+
+Analyse d'un fichier de traces :
+    python pipeline_trace.py [--path outputs/wordle_traces.jsonl]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+DEFAULT_TRACE_PATH = os.path.join("outputs", "wordle_traces.jsonl")
+DEFAULT_WINDOW = 50
+
+
+# ---------------------------------------------------------------------------
+# Trace d'un tour
+# ---------------------------------------------------------------------------
+class PipelineTrace:
+    """
+    Mesures d'un tour du pipeline (étapes, candidats, appels LLM).
+    """
+
+    def __init__(self, prompt: Optional[str] = None, **meta):
+        self.timestamp = time.time()
+        self.prompt = prompt
+        self.meta = dict(meta)
+        self.stages: list = []       # [{"stage", "ms"}, ...] dans l'ordre d'exécution
+        self.constraints: list = []  # [{"guess", "feedback", "before", "after"}, ...]
+        self.llm_calls: list = []    # [{"stage", "ms", "cached", "prompt_tokens", ...}, ...]
+        self._t0 = time.perf_counter()
+        self.total_ms: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Chronomètre un bloc : `with trace.stage("csp"): ...`
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append({"stage": name, "ms": (time.perf_counter() - t0) * 1000})
+
+    def constraint(self, guess: str, feedback: str, before: int, after: int) -> None:
+        self.constraints.append({"guess": guess, "feedback": feedback, "before": int(before), "after": int(after)})
+
+    def llm_call(
+        self,
+        stage: str,
+        response: Optional[dict],
+        elapsed_ms: float,
+        cached: bool,
+        first_chunk_ms: Optional[float] = None,
+    ) -> None:
+        """
+        Enregistre un appel LLM. Les compteurs viennent de la réponse Ollama
+        (durées en nanosecondes) ; une réponse servie par le cache n'a coûté aucun token.
+        """
+        response = response or {}
+        call = {"stage": stage, "ms": elapsed_ms, "cached": cached}
+        if first_chunk_ms is not None:
+            call["first_chunk_ms"] = first_chunk_ms
+        if not cached:
+            prompt_tokens = response.get("prompt_eval_count")
+            output_tokens = response.get("eval_count")
+            eval_ns = response.get("eval_duration")
+            call["prompt_tokens"] = prompt_tokens
+            call["output_tokens"] = output_tokens
+            if response.get("total_duration"):
+                call["server_ms"] = response["total_duration"] / 1e6
+            if output_tokens and eval_ns:
+                call["tokens_per_s"] = output_tokens / (eval_ns / 1e9)
+        self.llm_calls.append(call)
+
+    def finish(self) -> "PipelineTrace":
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self._t0) * 1000
+        return self
+
+    def timings(self) -> dict:
+        """
+        {étape: durée totale (ms)} (une étape peut apparaître plusieurs fois).
+        """
+        out: dict = {}
+        for s in self.stages:
+            out[s["stage"]] = out.get(s["stage"], 0.0) + s["ms"]
+        return out
+
+    def to_dict(self) -> dict:
+        self.finish()
+        return {
+            "timestamp": self.timestamp,
+            "prompt": self.prompt,
+            **self.meta,
+            "total_ms": self.total_ms,
+            "stages": self.stages,
+            "constraints": self.constraints,
+            "llm_calls": self.llm_calls,
+        }
+
+
+def stage(trace: Optional[PipelineTrace], name: str):
+    """
+    `with stage(trace, "csp"):` ne mesure rien si trace est None.
+    """
+    return trace.stage(name) if trace is not None else nullcontext()
+
+
+# ---------------------------------------------------------------------------
+# Persistance JSONL et résumé glissant
+# ---------------------------------------------------------------------------
+class TraceLog:
+    """
+    Fichier JSONL en ajout seul (une trace par ligne), partagé entre threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_TRACE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    def append(self, trace) -> None:
+        record = trace.to_dict() if isinstance(trace, PipelineTrace) else trace
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def load_traces(path: str = DEFAULT_TRACE_PATH) -> list:
+    """
+    Relit un fichier de traces (lignes illisibles ignorées, ex. écriture interrompue).
+    """
+    traces = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    traces.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return traces
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def summarize(traces) -> dict:
+    """
+    Agrège des traces (PipelineTrace ou dicts) :
+    {"turns", "stages": {étape: {"n", "mean_ms", "p50_ms", "p95_ms"}}, "total": {...}, "llm": {...}}
+    """
+    records = [t.to_dict() if isinstance(t, PipelineTrace) else t for t in traces]
+    per_stage: dict = {}
+    for r in records:
+        turn: dict = {}
+        for s in r.get("stages", []):
+            turn[s["stage"]] = turn.get(s["stage"], 0.0) + s["ms"]
+        for name, ms in turn.items():
+            per_stage.setdefault(name, []).append(ms)
+
+    def stats(values: list) -> dict:
+        return {
+            "n": len(values),
+            "mean_ms": sum(values) / len(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+        }
+
+    calls = [c for r in records for c in r.get("llm_calls", [])]
+    fresh = [c for c in calls if not c.get("cached")]
+    rates = [c["tokens_per_s"] for c in fresh if c.get("tokens_per_s")]
+    totals = [r["total_ms"] for r in records if r.get("total_ms") is not None]
+    return {
+        "turns": len(records),
+        "stages": {name: stats(v) for name, v in per_stage.items()},
+        "total": stats(totals) if totals else None,
+        "llm": {
+            "calls": len(calls),
+            "cache_hits": len(calls) - len(fresh),
+            "prompt_tokens": sum(c.get("prompt_tokens") or 0 for c in fresh),
+            "output_tokens": sum(c.get("output_tokens") or 0 for c in fresh),
+            "mean_ms": sum(c["ms"] for c in fresh) / len(fresh) if fresh else None,
+            "mean_tokens_per_s": sum(rates) / len(rates) if rates else None,
+        },
+    }
+
+
+class RollingSummary:
+    """
+    Résumé des `window` derniers tours (ex. barre latérale Streamlit).
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._traces: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, trace) -> None:
+        record = trace.to_dict() if isinstance(trace, PipelineTrace) else trace
+        with self._lock:
+            self._traces.append(record)
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+    def summary(self) -> dict:
+        with self._lock:
+            records = list(self._traces)
+        return summarize(records)
+
+    def rows(self) -> list:
+        """
+        Une ligne par étape, prête pour st.table / un affichage texte.
+        """
+        out = []
+        for name, s in self.summary()["stages"].items():
+            out.append({
+                "Stage": name,
+                "n": s["n"],
+                "mean (ms)": round(s["mean_ms"], 2),
+                "p50 (ms)": round(s["p50_ms"], 2),
+                "p95 (ms)": round(s["p95_ms"], 2),
+            })
+        return out
+
+
+def format_summary(summary: dict) -> str:
+    if not summary["turns"]:
+        return "No trace."
+    lines = [f"{summary['turns']} turns"]
+    if summary["total"]:
+        t = summary["total"]
+        lines.append(f"total       mean={t['mean_ms']:9.2f} ms  p50={t['p50_ms']:9.2f}  p95={t['p95_ms']:9.2f}")
+    for name, s in summary["stages"].items():
+        lines.append(f"{name:<11} mean={s['mean_ms']:9.2f} ms  p50={s['p50_ms']:9.2f}  p95={s['p95_ms']:9.2f}")
+    llm = summary["llm"]
+    if llm["calls"]:
+        lines.append(
+            f"LLM: {llm['calls']} calls ({llm['cache_hits']} cached), "
+            f"{llm['prompt_tokens']} prompt + {llm['output_tokens']} output tokens"
+            + (f", {llm['mean_tokens_per_s']:.1f} tok/s" if llm["mean_tokens_per_s"] else "")
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Résumé d'un fichier de traces du pipeline Wordle.")
+    parser.add_argument("--path", default=DEFAULT_TRACE_PATH)
+    parser.add_argument("--last", type=int, default=0, help="seulement les N dernières traces (0 = toutes)")
+    args = parser.parse_args()
+
+    traces = load_traces(args.path)
+    if args.last:
+        traces = traces[-args.last:]
+    print(format_summary(summarize(traces)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Service HTTP/JSON (application ASGI, sans framework) : résolution de lots de parties.
+
+Un seul dictionnaire, un seul PatternEngine (matrice memory-mappée) et un seul livre
+d'ouvertures sont chargés au démarrage (lifespan) puis partagés par toutes les requêtes.
+Chaque requête porte un LOT d'états de partie ; la réponse donne, pour chacun, le
+nombre de candidats et les guesses recommandés.
+
+    POST /solve
+    {
+      "games": [
+        {"id": "g1", "attempts": [["ORATE", "GVVJG"]]},
+        {"id": "g2", "attempts": [], "hard": true, "ranker": "minimax"}
+      ],
+      "top": 3,              (optionnel, défaut 3)
+      "all_guesses": false   (optionnel, défaut pour tout le lot)
+    }
+    -> {"results": [{"id": "g1", "count": 12, "candidates": [...], "ranked": [...]}, ...],
+        "elapsed_ms": ...}
+
+    GET /health -> {"status": "ok", "words": ..., "matrix": ..., "book": ...}
+
+Concurrence : les états identiques (premiers coups, préfixes communs) sont servis par
+deux LRU (candidats par préfixe d'historique, classements par état) ; le calcul NumPy
+est exécuté dans UN thread dédié (l'event loop reste libre pour les I/O). Pour plusieurs
+coeurs : plusieurs processus (`--workers N`), qui partagent les pages de la matrice et
+du dictionnaire compilé via memory-map.
+
+Lancement (nécessite uvicorn, optionnel) :
+    python service.py --port 8000 [--workers 2]
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from csp_solver import clean_attempts
+from entropy_ranker import rank_guesses
+from opening_book import OpeningBook, state_key
+from pattern_engine import PatternEngine
+
+try:
+    import uvicorn
+    UVICORN_AVAILABLE = True
+except ImportError:
+    UVICORN_AVAILABLE = False
+
+
+MAX_GAMES_PER_REQUEST = 1000
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_CANDIDATES_SHOWN = 20
+MAX_ATTEMPTS_PER_GAME = 30  # au-delà, la partie est refusée (même garde-fou que MAX_TURNS du benchmark)
+RANKERS = ("entropy", "minimax")
+
+
+# ---------------------------------------------------------------------------
+# Cœur du service (synchrone, indépendant d'ASGI)
+# ---------------------------------------------------------------------------
+class _LRU:
+    """
+    OrderedDict borné, protégé par un verrou.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SolverService:
+    """
+    Résolution d'états de partie [(guess, feedback), ...] sur un moteur partagé.
+    """
+
+    def __init__(self, engine, book=None, max_cached_states: int = 20000):
+        self.engine = engine
+        self.book = book
+        self._candidates = _LRU(max_cached_states)  # préfixe ordonné -> indices
+        self._rankings = _LRU(max_cached_states)    # état -> classement
+
+    def candidates(self, attempts: tuple, hard: bool = False) -> np.ndarray:
+        """
+        Candidats après `attempts` (tuple de couples normalisés), préfixe par préfixe :
+        on repart du plus long préfixe en cache, et chaque préfixe filtré est mis en cache.
+        En mode difficile, chaque guess doit être candidat de l'état qui le précède.
+        """
+        start, current = len(attempts), self._candidates.get((attempts, hard))
+        while current is None and start > 0:
+            start -= 1
+            current = self._candidates.get((attempts[:start], hard))
+        if current is None:
+            current = self.engine.all_indices()
+            self._candidates.set(((), hard), current)
+
+        for n in range(start + 1, len(attempts) + 1):
+            guess, feedback = attempts[n - 1]
+            if hard:
+                i = self.engine.index.get(guess)
+                k = int(np.searchsorted(current, i)) if i is not None else current.size
+                if k >= current.size or current[k] != i:
+                    raise ValueError(f"Hard mode: {guess} is not consistent with previous feedback")
+            current = self.engine.filter(current, guess, feedback)
+            self._candidates.set((attempts[:n], hard), current)
+        return current
+
+    def rank(self, attempts: tuple, candidates: np.ndarray, ranker: str, all_guesses: bool, top: int) -> list:
+        key = (state_key(attempts), ranker, all_guesses, top)
+        cached = self._rankings.get(key)
+        if cached is not None:
+            return cached
+
+        ranked = None
+        if ranker == "minimax":
+            from absurdle import rank_minimax
+
+            ranked = rank_minimax(self.engine, candidates, hard_mode=not all_guesses, top=top)
+        else:
+            if self.book is not None and self.book.all_guesses == all_guesses:
+                # Le livre ne garde que ses `top` premiers guesses : au-delà, classement complet
+                ranked = self.book.lookup(list(attempts))
+                ranked = ranked[:top] if ranked is not None and top <= len(ranked) else None
+            if ranked is None:
+                ranked = rank_guesses(self.engine, candidates, all_guesses=all_guesses, top=top)
+        self._rankings.set(key, ranked)
+        return ranked
+
+    def solve_game(self, game: dict, top: int = 3, all_guesses: bool = False) -> dict:
+        """
+        Un état de partie -> {"id", "count", "candidates", "ranked"} (ou {"id", "error"}).
+        """
+        game_id = game.get("id")
+        raw = game.get("attempts", [])
+        if not isinstance(raw, list):
+            return {"id": game_id, "error": "attempts must be a list of [guess, feedback] pairs"}
+        if len(raw) > MAX_ATTEMPTS_PER_GAME:
+            return {"id": game_id, "error": f"at most {MAX_ATTEMPTS_PER_GAME} attempts per game"}
+        attempts = tuple(clean_attempts(raw, self.engine.word_length))
+        if len(attempts) != len(raw):
+            return {"id": game_id, "error": "invalid attempt(s): expected [guess, feedback] with V/J/G feedback"}
+
+        ranker = game.get("ranker", "entropy")
+        if ranker not in RANKERS:
+            return {"id": game_id, "error": f"unknown ranker {ranker!r} (expected one of {list(RANKERS)})"}
+        hard = game.get("hard", False)
+        all_guesses = game.get("all_guesses", all_guesses)
+        if not isinstance(hard, bool) or not isinstance(all_guesses, bool):
+            return {"id": game_id, "error": "hard and all_guesses must be booleans"}
+        all_guesses = all_guesses and not hard
+
+        try:
+            candidates = self.candidates(attempts, hard)
+        except ValueError as e:
+            return {"id": game_id, "error": str(e)}
+
+        words = self.engine.words
+        ranked = self.rank(attempts, candidates, ranker, all_guesses, top) if candidates.size else []
+        score_name = "worst_case" if ranker == "minimax" else "entropy"
+        return {
+            "id": game_id,
+            "count": int(candidates.size),
+            "candidates": [words[i] for i in candidates[:MAX_CANDIDATES_SHOWN]],
+            "ranked": [{"word": w, score_name: s, "expected": e} for w, s, e in ranked],
+        }
+
+    def solve_batch(self, games: list, top: int = 3, all_guesses: bool = False) -> list:
+        return [
+            self.solve_game(g, top, all_guesses) if isinstance(g, dict)
+            else {"id": None, "error": "each game must be an object"}
+            for g in games
+        ]
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "words": len(self.engine),
+            "matrix": self.engine.matrix is not None,
+            "book": self.book is not None,
+            "cached_states": len(self._candidates),
+        }
+
+
+def load_service(dictionary_path: str = "wordle.txt") -> SolverService:
+    """
+    Dictionnaire (compilé si disponible) + moteur memory-mappé + livre d'ouvertures.
+    """
+    from llm_agent import load_dictionary
+
+    words = load_dictionary(dictionary_path)
+    if not words:
+        raise RuntimeError(f"Dictionary {dictionary_path!r} is empty.")
+    engine = PatternEngine.load_or_build(words)
+    return SolverService(engine, book=OpeningBook.load_or_build(engine))
+
+
+# ---------------------------------------------------------------------------
+# Application ASGI
+# ---------------------------------------------------------------------------
+class ServiceApp:
+    """
+    Application ASGI 3 minimale : /health et /solve, plus le protocole lifespan.
+
+    `factory` construit le SolverService (au démarrage du serveur, ou au premier appel).
+    """
+
+    def __init__(self, factory=load_service):
+        self.factory = factory
+        self.service: Optional[SolverService] = None
+        # Un seul thread de calcul : le moteur (LRU de lignes) n'est pas partagé entre threads
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordle-solver")
+        self._startup_lock = asyncio.Lock()
+
+    async def _ensure_service(self) -> SolverService:
+        async with self._startup_lock:
+            if self.service is None:
+                loop = asyncio.get_running_loop()
+                self.service = await loop.run_in_executor(self._executor, self.factory)
+        return self.service
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self._ensure_service()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        method, path = scope["method"], scope["path"]
+        if path == "/health" and method == "GET":
+            service = await self._ensure_service()
+            await _send_json(send, 200, service.health())
+            return
+        if path != "/solve":
+            await _send_json(send, 404, {"error": "not found"})
+            return
+        if method != "POST":
+            await _send_json(send, 405, {"error": "method not allowed"})
+            return
+
+        body = await _read_body(receive)
+        if body is None:
+            await _send_json(send, 413, {"error": f"request body larger than {MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            await _send_json(send, 400, {"error": f"invalid JSON: {e}"})
+            return
+
+        games = payload.get("games") if isinstance(payload, dict) else None
+        if not isinstance(games, list):
+            await _send_json(send, 400, {"error": "expected {\"games\": [{\"attempts\": [...]}, ...]}"})
+            return
+        if len(games) > MAX_GAMES_PER_REQUEST:
+            await _send_json(send, 400, {"error": f"at most {MAX_GAMES_PER_REQUEST} games per request"})
+            return
+        top = payload.get("top", 3)
+        if not isinstance(top, int) or isinstance(top, bool) or not 1 <= top <= 50:
+            await _send_json(send, 400, {"error": "top must be an integer in [1, 50]"})
+            return
+        all_guesses = payload.get("all_guesses", False)
+        if not isinstance(all_guesses, bool):
+            await _send_json(send, 400, {"error": "all_guesses must be a boolean"})
+            return
+
+        service = await self._ensure_service()
+        t0 = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            self._executor, service.solve_batch, games, top, all_guesses
+        )
+        await _send_json(send, 200, {"results": results, "elapsed_ms": (time.perf_counter() - t0) * 1000})
+
+
+async def _read_body(receive) -> Optional[bytes]:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _send_json(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# Point d'entrée ASGI : `uvicorn service:app`
+app = ServiceApp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP/JSON de résolution Wordle (ASGI).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="nb de processus (matrice partagée en memmap)")
+    args = parser.parse_args()
+
+    if not UVICORN_AVAILABLE:
+        raise SystemExit("uvicorn is required to serve the app (pip install uvicorn).")
+    uvicorn.run("service:app", host=args.host, port=args.port, workers=args.workers, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Simulation en lot (lock-step) : N parties Wordle avancées ensemble, tour par tour.
+
+Au lieu de jouer les parties une par une (benchmark.py : une WordleSession par
+partie, un filtrage par tour et par partie), on tient pour un bloc de G parties
+une matrice booléenne `alive` (G x N mots) : alive[g, w] = w est encore candidat
+dans la partie g. À chaque tour :
+  1) la politique choisit un guess par partie (vectorisée, ou une fois par ÉTAT
+     distinct pour l'entropie : les parties au même historique partagent le calcul)
+  2) feedback de chaque partie = une lecture de la matrice de feedbacks
+  3) filtrage de TOUTES les parties en une opération par guess distinct :
+         alive[parties de g] &= (row(g) == code de chaque partie)
+
+Mémoire : G x N octets pour `alive` (bloc de 1024 parties x 21 953 mots ≈ 22 Mo),
+plus une ligne de feedbacks par guess distinct ; `--chunk` règle le compromis.
+
+Exemples :
+    python simulator.py --policy entropy
+    python simulator.py --policy distinct --limit 5000 --chunk 2048
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+
+from benchmark import MAX_GUESSES, MAX_TURNS, _peak_rss_mb, ensure_parent_dir
+
+DEFAULT_CHUNK = 1024
+POLICIES = ("first", "distinct", "entropy")
+
+
+# ---------------------------------------------------------------------------
+# Politiques vectorisées : choose(alive, states) -> indices des guesses (G,)
+# ---------------------------------------------------------------------------
+class FirstChooser:
+    # Premier candidat (ordre du dictionnaire), comme benchmark.policy_first
+    def __call__(self, alive: np.ndarray, states: np.ndarray) -> np.ndarray:
+        return alive.argmax(axis=1)
+
+
+class DistinctChooser:
+    """
+    Plus de lettres distinctes d'abord (benchmark.policy_distinct) : argmax ligne à
+    ligne de alive x (score + 1), premier maximum = même départage que max().
+    """
+
+    def __init__(self, engine):
+        distinct = [len(set(w)) for w in engine.words]
+        self.weight = np.asarray(distinct, dtype=np.uint8) + 1
+
+    def __call__(self, alive: np.ndarray, states: np.ndarray) -> np.ndarray:
+        return (alive * self.weight).argmax(axis=1)
+
+
+class EntropyChooser:
+    """
+    Entropie attendue maximale (entropy_ranker.best_guess), calculée une fois par état
+    distinct (même historique => mêmes candidats), mémoïsée sur toute la simulation.
+    """
+
+    def __init__(self, engine, all_guesses: bool = False):
+        self.engine = engine
+        self.all_guesses = all_guesses
+        self._memo: dict = {}
+
+    def __call__(self, alive: np.ndarray, states: np.ndarray) -> np.ndarray:
+        from entropy_ranker import best_guess
+
+        unique, first, inverse = np.unique(states, return_index=True, return_inverse=True)
+        chosen = np.empty(unique.size, dtype=np.int64)
+        for k, (state, g) in enumerate(zip(unique.tolist(), first.tolist())):
+            guess = self._memo.get(state)
+            if guess is None:
+                word = best_guess(self.engine, np.flatnonzero(alive[g]), all_guesses=self.all_guesses)
+                guess = self.engine.index[word]
+                self._memo[state] = guess
+            chosen[k] = guess
+        return chosen[inverse]
+
+
+def make_chooser(name: str, engine, all_guesses: bool = False):
+    if name == "first":
+        return FirstChooser()
+    if name == "distinct":
+        return DistinctChooser(engine)
+    if name == "entropy":
+        return EntropyChooser(engine, all_guesses=all_guesses)
+    raise ValueError(f"Politique inconnue: {name} ({'/'.join(POLICIES)})")
+
+
+# ---------------------------------------------------------------------------
+# Simulateur
+# ---------------------------------------------------------------------------
+class LockstepSimulator:
+    """
+    Joue des blocs de parties en lock-step sur un PatternEngine partagé.
+
+    Les états (historiques) sont numérotés : (état parent, guess, code) -> id. Deux
+    parties ayant joué les mêmes coups avec les mêmes feedbacks ont le même id.
+    """
+
+    def __init__(self, engine, chooser, chunk: int = DEFAULT_CHUNK):
+        self.engine = engine
+        self.chooser = chooser
+        self.chunk = chunk
+        self._states: dict = {}
+        self.stats = {"turns": 0, "distinct_guesses": 0, "alive_mb": 0.0}
+
+    def _state_ids(self, parent: np.ndarray, guesses: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        out = np.empty(parent.size, dtype=np.int64)
+        for k, key in enumerate(zip(parent.tolist(), guesses.tolist(), codes.tolist())):
+            out[k] = self._states.setdefault(key, len(self._states) + 1)
+        return out
+
+    def play_chunk(self, secrets: np.ndarray):
+        """
+        Joue les parties d'un bloc (indices des secrets) jusqu'à résolution.
+
+        Retour : (nb de guesses (G,), résolu (G,), chemins [[guess idx, ...], ...])
+        """
+        engine = self.engine
+        g_count, n = secrets.size, len(engine)
+        alive = np.ones((g_count, n), dtype=bool)
+        self.stats["alive_mb"] = max(self.stats["alive_mb"], alive.nbytes / 1e6)
+
+        states = np.zeros(g_count, dtype=np.int64)  # 0 = aucun coup joué
+        n_guesses = np.zeros(g_count, dtype=np.int64)
+        solved = np.zeros(g_count, dtype=bool)
+        paths = [[] for _ in range(g_count)]
+        active = np.arange(g_count)
+
+        for _ in range(MAX_TURNS):
+            if active.size == 0:
+                break
+            guesses = self.chooser(alive[active], states[active])
+            codes = np.empty(active.size, dtype=np.int64)
+
+            # Feedback + filtrage, groupés par guess distinct
+            order = np.argsort(guesses, kind="stable")
+            distinct, starts = np.unique(guesses[order], return_index=True)
+            bounds = np.append(starts, order.size)
+            for u, lo, hi in zip(distinct.tolist(), bounds[:-1].tolist(), bounds[1:].tolist()):
+                members = order[lo:hi]
+                games = active[members]
+                row = engine.row(engine.words[u])
+                game_codes = row[secrets[games]].astype(np.int64)
+                codes[members] = game_codes
+                alive[games] &= row[None, :] == game_codes[:, None]
+            self.stats["turns"] += 1
+            self.stats["distinct_guesses"] += int(distinct.size)
+
+            n_guesses[active] += 1
+            for g, guess in zip(active.tolist(), guesses.tolist()):
+                paths[g].append(guess)
+            won = guesses == secrets[active]
+            solved[active[won]] = True
+            states[active] = self._state_ids(states[active], guesses, codes)
+            active = active[~won]
+        return n_guesses, solved, paths
+
+    def run(self, secrets):
+        """
+        Toutes les parties, bloc par bloc. Retour : (n_guesses, solved, paths, durée par bloc).
+        """
+        secrets = np.asarray(secrets, dtype=np.int64)
+        all_n, all_solved, all_paths, chunk_times = [], [], [], []
+        for s in range(0, secrets.size, self.chunk):
+            t0 = time.perf_counter()
+            n, solved, paths = self.play_chunk(secrets[s:s + self.chunk])
+            chunk_times.append(time.perf_counter() - t0)
+            all_n.append(n)
+            all_solved.append(solved)
+            all_paths.extend(paths)
+        if not all_n:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool), [], []
+        return np.concatenate(all_n), np.concatenate(all_solved), all_paths, chunk_times
+
+
+def run_simulation(
+    dictionary_path: str = "wordle.txt",
+    policy: str = "entropy",
+    all_guesses: bool = False,
+    limit=None,
+    chunk: int = DEFAULT_CHUNK,
+    out_json: str = "outputs/wordle_simulation.json",
+) -> dict:
+    """
+    Simule une partie par mot du dictionnaire (ou les `limit` premiers).
+
+    Retour : le résumé (également écrit dans `out_json`).
+    """
+    from llm_agent import load_dictionary
+    from pattern_engine import PatternEngine
+
+    words = load_dictionary(dictionary_path)
+    if not words:
+        raise SystemExit("Dictionary is empty.")
+    t_load = time.perf_counter()
+    engine = PatternEngine.load_or_build(words)
+    load_s = time.perf_counter() - t_load
+
+    chooser = make_chooser(policy, engine, all_guesses)
+    sim = LockstepSimulator(engine, chooser, chunk=chunk)
+    n_games = min(limit, len(engine)) if limit else len(engine)
+
+    t0 = time.perf_counter()
+    n_guesses, solved, _, chunk_times = sim.run(np.arange(n_games))
+    wall = time.perf_counter() - t0
+
+    counts = n_guesses[solved].tolist()
+    failures = int(np.count_nonzero(~solved | (n_guesses > MAX_GUESSES)))
+    summary = {
+        "policy": policy,
+        "all_guesses": all_guesses,
+        "games": n_games,
+        "chunk": chunk,
+        "engine_load_s": load_s,
+        "wall_time_s": wall,
+        "games_per_s": n_games / wall if wall > 0 else 0.0,
+        "guesses_mean": statistics.mean(counts) if counts else None,
+        "guesses_median": statistics.median(counts) if counts else None,
+        "guesses_max": max(counts) if counts else None,
+        "failure_rate": failures / n_games if n_games else 0.0,
+        "lockstep_turns": sim.stats["turns"],
+        "distinct_guesses_per_turn": sim.stats["distinct_guesses"] / max(1, sim.stats["turns"]),
+        "distinct_states": len(sim._states),
+        "chunk_time_s_max": max(chunk_times, default=0.0),
+        "memory_mb": {
+            "alive_matrix": sim.stats["alive_mb"],
+            "pattern_matrix": (engine.matrix.nbytes / 1e6) if engine.matrix is not None else 0.0,
+            "peak_rss": _peak_rss_mb(),
+        },
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    ensure_parent_dir(out_json)
+    with open(out_json, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulation lock-step de N parties Wordle (sans LLM).")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    parser.add_argument("--policy", choices=POLICIES, default="entropy")
+    parser.add_argument("--all-guesses", action="store_true", help="(entropy) score aussi les mots hors candidats")
+    parser.add_argument("--limit", type=int, default=None, help="ne jouer que les N premiers secrets")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="parties par bloc (mémoire ~ chunk x N octets)")
+    parser.add_argument("--out-json", default="outputs/wordle_simulation.json")
+    args = parser.parse_args()
+
+    summary = run_simulation(
+        dictionary_path=args.dictionary,
+        policy=args.policy,
+        all_guesses=args.all_guesses,
+        limit=args.limit,
+        chunk=args.chunk,
+        out_json=args.out_json,
+    )
+    print(json.dumps(summary, indent=2))
+    print(f"JSON -> {args.out_json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+Dictionnaire compilé au format binaire (chargement sans parsing, memory-map).
+
+Format du fichier (petit-boutiste) :
+    en-tête 16 octets : magic "WDIC" | version u16 | longueur des mots u16 | nb de mots u32 | crc32 u32
+    données           : nb_mots x longueur octets ASCII A-Z, triés, sans doublon, sans séparateur
+
+Au chargement, le fichier est memory-mappé : les pages sont partagées par l'OS entre
+tous les processus (workers Streamlit, pool du benchmark) et, avec NumPy, exposées
+sans copie en vue (N,) de type "S5" (recherche dichotomique) ou (N, 5) uint8.
+
+WordStore est une séquence de str en lecture seule : les mots sont décodés à la
+demande, et PatternEngine s'en sert directement (mots encodés = vue NumPy, index
+mot -> position = recherche dichotomique), sans liste ni dict de 22k entrées.
+
+Le chargeur texte de llm_agent.load_dictionary reste le fallback : fichier compilé
+absent, plus ancien que le .txt, ou corrompu (crc32 invalide). Il nettoie les mots
+de la même façon (clean_words) : même liste, donc même empreinte de dictionnaire,
+et la matrice de feedbacks / le livre d'ouvertures en cache servent aux deux.
+
+Utilisation :
+    python word_store.py --compile               # wordle.txt -> cache/wordle_5.wdb
+    python word_store.py --benchmark --repeat 5  # démarrage texte vs binaire
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import operator
+import os
+import struct
+import subprocess
+import sys
+import zlib
+from collections.abc import Sequence
+from typing import Optional
+
+from csp_solver import WORD_LENGTH
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+MAGIC = b"WDIC"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+HEADER_SIZE = _HEADER.size  # 16
+
+DEFAULT_CACHE_DIR = "cache"
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+def compiled_path(text_path: str, word_length: int = WORD_LENGTH, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """
+    "wordle.txt" -> "cache/wordle_5.wdb".
+    """
+    stem = os.path.splitext(os.path.basename(text_path))[0]
+    return os.path.join(cache_dir, f"{stem}_{word_length}.wdb")
+
+
+def clean_words(words, word_length: int = WORD_LENGTH) -> list:
+    """
+    Mots normalisés (majuscules), filtrés A-Z / longueur, triés, dédoublonnés.
+    """
+    return sorted({
+        w for w in (w.strip().upper() for w in words)
+        if len(w) == word_length and w.isascii() and w.isalpha()
+    })
+
+
+def compile_words(words, out_path: str, word_length: int = WORD_LENGTH) -> int:
+    """
+    Écrit les mots (nettoyés par clean_words) au format binaire.
+    Retour : nombre de mots écrits.
+    """
+    cleaned = clean_words(words, word_length)
+    payload = "".join(cleaned).encode("ascii")
+    header = _HEADER.pack(MAGIC, VERSION, word_length, len(cleaned), zlib.crc32(payload))
+
+    folder = os.path.dirname(out_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp, out_path)
+    return len(cleaned)
+
+
+def compile_dictionary(
+    text_path: str,
+    out_path: Optional[str] = None,
+    word_length: int = WORD_LENGTH,
+) -> str:
+    """
+    Compile un dictionnaire texte (un mot par ligne) ; retour : chemin du fichier binaire.
+    """
+    out_path = out_path or compiled_path(text_path, word_length)
+    with open(text_path, "r", encoding="utf-8") as f:
+        compile_words(f, out_path, word_length)
+    return out_path
+
+
+# ---------------------------------------------------------------------------
+# Chargement
+# ---------------------------------------------------------------------------
+class WordStore(Sequence):
+    """
+    Vue en lecture seule sur un dictionnaire compilé (memory-map).
+
+    - `store[i]`, `len(store)`, `word in store` : séquence de str décodée à la demande
+    - `words`   : liste de str, décodée une seule fois à la demande
+    - `array`   : vue NumPy (N,) de type "S<L>" triée (sans copie)
+    - `letters` : vue NumPy (N, L) uint8, codes ASCII (sans copie)
+    - `positions` : mapping mot -> indice (recherche dichotomique)
+
+    Picklable : seul le chemin est transmis, le processus destinataire re-mappe le fichier.
+    """
+
+    def __init__(self, path: str, verify: bool = True):
+        self.path = path
+        self.verify = verify
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < HEADER_SIZE:
+            raise ValueError(f"{path}: fichier tronqué")
+        magic, version, word_length, count, crc = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: format inconnu ({magic!r}, v{version})")
+        if len(self._mm) != HEADER_SIZE + count * word_length:
+            raise ValueError(f"{path}: taille incohérente avec l'en-tête")
+        if verify and zlib.crc32(memoryview(self._mm)[HEADER_SIZE:]) != crc:
+            raise ValueError(f"{path}: checksum invalide")
+
+        self.word_length = word_length
+        self.count = count
+        self.crc32 = crc
+        self._words: Optional[list] = None
+        self.positions = _Positions(self)
+
+    def __reduce__(self):
+        return (WordStore, (self.path, False))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if self._words is not None:
+            return self._words[i]
+        i = operator.index(i)
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("word index out of range")
+        start = HEADER_SIZE + i * self.word_length
+        return self._mm[start:start + self.word_length].decode("ascii")
+
+    def __iter__(self):
+        return iter(self.words)
+
+    @property
+    def payload(self) -> memoryview:
+        return memoryview(self._mm)[HEADER_SIZE:]
+
+    @property
+    def words(self) -> list:
+        if self._words is None:
+            text = bytes(self.payload).decode("ascii")
+            n = self.word_length
+            self._words = [text[i:i + n] for i in range(0, len(text), n)]
+        return self._words
+
+    @property
+    def array(self):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for the array view.")
+        return np.frombuffer(self._mm, dtype=f"S{self.word_length}", count=self.count, offset=HEADER_SIZE)
+
+    @property
+    def letters(self):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for the array view.")
+        return np.frombuffer(self._mm, dtype=np.uint8, count=self.count * self.word_length, offset=HEADER_SIZE).reshape(
+            self.count, self.word_length
+        )
+
+    def find(self, word) -> int:
+        """
+        Indice de `word` par recherche dichotomique sur les données triées, ou -1.
+        """
+        if not isinstance(word, str) or len(word) != self.word_length or not word.isascii():
+            return -1
+        key = word.encode("ascii")
+        lo, hi, n = 0, self.count, self.word_length
+        mm = self._mm
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = HEADER_SIZE + mid * n
+            if mm[start:start + n] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = HEADER_SIZE + lo * n
+        return lo if lo < self.count and mm[start:start + n] == key else -1
+
+    def __contains__(self, word) -> bool:
+        return self.find(word) >= 0
+
+    def index(self, word, *args) -> int:
+        i = self.find(word)
+        if i < 0:
+            raise ValueError(f"{word!r} is not in the dictionary")
+        return i
+
+    def digest_bytes(self) -> bytes:
+        """
+        Même contenu que "\n".join(mots).encode() (cf. pattern_engine.dictionary_digest),
+        construit sans décoder les mots.
+        """
+        if self.count == 0:
+            return b""
+        if NUMPY_AVAILABLE:
+            rows = np.empty((self.count, self.word_length + 1), dtype=np.uint8)
+            rows[:, :-1] = self.letters
+            rows[:, -1] = ord("\n")
+            return rows.tobytes()[:-1]
+        n = self.word_length
+        return b"\n".join(self._mm[HEADER_SIZE + i * n:HEADER_SIZE + (i + 1) * n] for i in range(self.count))
+
+    def sha1(self) -> str:
+        return hashlib.sha1(self.digest_bytes()).hexdigest()
+
+
+class _Positions:
+    """
+    Mapping mot -> indice d'un WordStore (même interface que le dict PatternEngine.index).
+    """
+
+    def __init__(self, store: WordStore):
+        self._store = store
+
+    def get(self, word, default=None):
+        i = self._store.find(word)
+        return i if i >= 0 else default
+
+    def __getitem__(self, word) -> int:
+        i = self._store.find(word)
+        if i < 0:
+            raise KeyError(word)
+        return i
+
+    def __contains__(self, word) -> bool:
+        return self._store.find(word) >= 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+def open_compiled(
+    text_path: str,
+    word_length: int = WORD_LENGTH,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+) -> Optional[WordStore]:
+    """
+    WordStore du dictionnaire compilé associé à `text_path`, ou None s'il faut
+    retomber sur le texte : fichier absent, plus ancien que le .txt, ou invalide.
+    """
+    path = compiled_path(text_path, word_length, cache_dir)
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(text_path) and os.path.getmtime(text_path) > os.path.getmtime(path):
+        return None  # .txt modifié depuis la compilation
+    try:
+        store = WordStore(path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring compiled dictionary {path}: {e}")
+        return None
+    return store if store.word_length == word_length else None
+
+
+# ---------------------------------------------------------------------------
+# Benchmark de démarrage (processus neufs : cache Python / imports non partagés)
+# ---------------------------------------------------------------------------
+_STARTUP_SNIPPET = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+from llm_agent import load_dictionary
+t1 = time.perf_counter()
+words = load_dictionary(sys.argv[1], use_compiled=sys.argv[2] == "binary")
+t2 = time.perf_counter()
+engine_s = None
+try:
+    from pattern_engine import PatternEngine
+    PatternEngine.load_or_build(words)
+    engine_s = time.perf_counter() - t2
+except ImportError:
+    pass
+print(json.dumps({
+    "words": len(words),
+    "import_s": t1 - t0,
+    "load_s": t2 - t1,
+    "engine_s": engine_s,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def benchmark_startup(text_path: str, repeat: int = 5) -> dict:
+    """
+    Mesure le chargement du dictionnaire (texte vs binaire) dans `repeat` processus neufs.
+    Retour : {mode: {mesure: médiane}}.
+    """
+    import statistics
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for mode in ("text", "binary"):
+        runs = []
+        for _ in range(repeat):
+            out = subprocess.run(
+                [sys.executable, "-c", _STARTUP_SNIPPET, text_path, mode],
+                capture_output=True, text=True, check=True, cwd=os.getcwd(),
+                env=dict(os.environ, PYTHONPATH=here),
+            )
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        results[mode] = {
+            key: statistics.median(r[key] for r in runs) if runs[0][key] is not None else None
+            for key in runs[0]
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dictionnaire Wordle compilé (format binaire).")
+    parser.add_argument("--dictionary", default="wordle.txt")
+    parser.add_argument("--length", type=int, default=WORD_LENGTH)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--compile", action="store_true", help="compile le .txt en .wdb")
+    parser.add_argument("--benchmark", action="store_true", help="compare le démarrage texte / binaire")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = compiled_path(args.dictionary, args.length, args.cache_dir)
+    if args.compile:
+        compile_dictionary(args.dictionary, path, args.length)
+        store = WordStore(path)
+        print(f"Compiled {len(store)} words -> {path} ({os.path.getsize(path)} bytes, crc32={store.crc32:08x})")
+    if args.benchmark:
+        if not os.path.exists(path):
+            raise SystemExit(f"{path} missing: run with --compile first.")
+        results = benchmark_startup(args.dictionary, args.repeat)
+        for mode, r in results.items():
+            engine = f" | engine {r['engine_s'] * 1000:.1f} ms" if r["engine_s"] is not None else ""
+            print(
+                f"{mode:>6}: load {r['load_s'] * 1000:.1f} ms{engine}"
+                f" | imports {r['import_s'] * 1000:.0f} ms | peak RSS {r['peak_rss_mb']:.1f} MB"
+            )
+    if not args.compile and not args.benchmark:
+        status = "present" if os.path.exists(path) else "missing"
+        print(f"Compiled dictionary {path}: {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+from csp_solver import WORD_LENGTH, clean_attempts
+from letter_index import LetterIndex
+
+try:
+    import numpy as np
+except ImportError:  # sans NumPy, pas de PatternEngine : seul le chemin LetterIndex sert
+    np = None
+
+
+class WordleSession:
+    """
+    État incrémental d'une partie Wordle.
+
+    Au lieu de refiltrer tout le dictionnaire avec TOUTES les tentatives à chaque tour,
+    la session garde l'ensemble des candidats survivants (tableau d'indices dans le
+    dictionnaire) et ne le restreint qu'avec la NOUVELLE tentative :
+        coût d'un tour ≈ O(nb de survivants), et non O(N x nb de tentatives).
+
+    Une pile d'états permet undo() / reset() (bouton "Reset game" de Streamlit).
+
+    Paramètres
+    ----------
+    dictionary_words : iterable[str]
+        Domaine CSP (mots de `word_length` lettres).
+    engine : PatternEngine, optionnel
+        Si fourni (NumPy), les candidats sont un tableau d'indices filtré par
+        comparaison vectorisée ; sinon les candidats sont un bitset élagué par
+        l'index lettre/position (letter_index.py), et wordle_feedback_vjg n'est
+        vérifié que sur les survivants.
+    word_length : int
+        Longueur des mots sans moteur (avec moteur : celle du dictionnaire du moteur).
+    index : LetterIndex, optionnel
+        Index déjà construit à partager (ex. les K grilles de multi_board.py).
+    hard_mode : bool
+        Mode difficile : chaque guess doit être compatible avec tous les feedbacks
+        précédents, c.-à-d. faire partie des candidats courants. Vérifié par simple
+        appartenance à l'ensemble des survivants (sans resimuler de feedback).
+    """
+
+    def __init__(
+        self,
+        dictionary_words=None,
+        engine=None,
+        word_length: int = WORD_LENGTH,
+        index=None,
+        hard_mode: bool = False,
+    ):
+        if engine is not None:
+            self.index = None
+            self.words = engine.words
+            self.word_length = engine.word_length
+            initial = engine.all_indices()
+        else:
+            self.index = index if index is not None else LetterIndex(dictionary_words or [], word_length)
+            self.word_length = self.index.word_length
+            self.words = self.index.words
+            initial = self.index.all_bits
+
+        self.engine = engine
+        self.hard_mode = hard_mode
+        self.attempts: list = []
+        self._stack = [initial]
+
+    # -- état courant ---------------------------------------------------------
+    @property
+    def candidate_indices(self):
+        if self.index is not None:
+            return list(self.index.iter_indices(self._stack[-1]))
+        return self._stack[-1]
+
+    @property
+    def candidates(self) -> list:
+        return [self.words[i] for i in self.candidate_indices]
+
+    def __len__(self) -> int:
+        if self.index is not None:
+            return bin(self._stack[-1]).count("1")
+        return len(self._stack[-1])
+
+    def is_candidate(self, word: str) -> bool:
+        """
+        `word` fait-il partie des survivants ? (test d'appartenance sur l'index, O(log n))
+        """
+        word = word.strip().upper()
+        if self.index is not None:
+            i = self.index.position(word)
+            return i is not None and (self._stack[-1] >> i) & 1 == 1
+        i = self.engine.index.get(word)
+        if i is None:
+            return False
+        current = self._stack[-1]
+        # Les indices survivants restent triés (filtrage par masque d'un arange)
+        k = int(np.searchsorted(current, i))
+        return k < current.size and current[k] == i
+
+    # -- transitions ----------------------------------------------------------
+    def push(self, guess: str, feedback: str) -> list:
+        """
+        Applique UNE nouvelle contrainte (guess, feedback) aux survivants.
+
+        Retour : la liste des mots encore compatibles.
+        Lève ValueError si le couple est mal formé (mêmes règles que le solver).
+        """
+        cleaned = clean_attempts([(guess, feedback)], self.word_length)
+        if not cleaned:
+            raise ValueError(f"Invalid attempt: {guess!r} -> {feedback!r}")
+        guess, feedback = cleaned[0]
+        if self.hard_mode and not self.is_candidate(guess):
+            raise ValueError(f"Hard mode: {guess} is not consistent with previous feedback")
+
+        current = self._stack[-1]
+        if self.engine is not None:
+            narrowed = self.engine.filter(current, guess, feedback)
+        else:
+            narrowed = self.index.filter_bits(current, guess, feedback)
+
+        self._stack.append(narrowed)
+        self.attempts.append((guess, feedback))
+        return self.candidates
+
+    def undo(self):
+        """
+        Annule la dernière tentative. Retour : le couple retiré, ou None si rien à annuler.
+        """
+        if not self.attempts:
+            return None
+        self._stack.pop()
+        return self.attempts.pop()
+
+    def reset(self) -> None:
+        """
+        Revient à l'état initial (dictionnaire complet, aucun historique).
+        """
+        del self._stack[1:]
+        self.attempts.clear()
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import json
 import os
 import time
-from dataclasses import dataclass
-from typing import Dict, Hashable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 
 import networkx as nx
 
 from instances import load_instance
-from heuristics import greedy_coloring, dsatur_coloring
-from solve_coloring import solve_min_coloring
+from heuristics import dsatur_coloring_naive
+from solve_coloring import solve_min_coloring_strategy, symmetry_options
+from graph_csr import CSRGraph, as_csr, dsatur_csr, greedy_csr, is_valid_colors
+from graph_csr import is_valid_coloring as csr_is_valid_coloring
+from graph_io import list_graph_files, load_graph_file
+from lower_bounds import compute_lower_bound
+from local_search import LS_METHODS, local_search_min_csr
+from hea import hea_min_csr
+from decomposition import solve_decomposed
 
 Node = Hashable
 
@@ -30,16 +40,17 @@ class BenchRow:
     time_s: float
     status: str
     k_found: Optional[int]
+    # Effort CP-SAT cumulé sur tous les k (cp_min uniquement)
+    conflicts: Optional[int] = None
+    branches: Optional[int] = None
 
 # --------------------------------------------------------------------
 # Vérifie qu’une coloration est valide :
 # deux sommets adjacents ne doivent pas avoir la même couleur
 # --------------------------------------------------------------------
-def is_valid_coloring(G: nx.Graph, coloring: Dict[Node, int]) -> bool:
-    for u, v in G.edges():
-        if coloring.get(u) == coloring.get(v):
-            return False
-    return True
+def is_valid_coloring(G: nx.Graph, coloring: Dict[Node, int], csr: Optional[CSRGraph] = None) -> bool:
+    # Vectorisé sur le CSR du graphe (graph_csr.py), partagé avec les heuristiques
+    return csr_is_valid_coloring(G, coloring, csr)
 
 # --------------------------------------------------------------------
 # Compte le nombre de couleurs distinctes utilisées dans la coloration
@@ -55,14 +66,362 @@ def ensure_parent_dir(path: str) -> None:
     if folder:
         os.makedirs(folder, exist_ok=True)
 
+# --------------------------------------------------------------------
+# Nom de la méthode dans le CSV: cp_min (itératif) ou cp_min_single,
+# suffixe _dec pour cp_min_dec (composantes résolues séparément)
+# --------------------------------------------------------------------
+CP_MIN_METHODS = ("cp_min", "cp_min_dec")
+
+
+def method_label(method: str, cp_strategy: str, cp_symmetry: Optional[str] = None) -> str:
+    if method not in CP_MIN_METHODS:
+        return method
+    label = "cp_min" if cp_strategy == "iterative" else f"cp_min_{cp_strategy}"
+    if cp_symmetry and cp_symmetry != "clique":
+        label += f"_{cp_symmetry}"
+    if method == "cp_min_dec":
+        label += "_dec"
+    return label
+
+# --------------------------------------------------------------------
+# cp_min sur un graphe: (k*, coloration, conflits, branches)
+# La borne inférieure (lower_bounds.py) donne k_min, et sa clique fixe les premières couleurs
+# --------------------------------------------------------------------
+def run_cp_min(G: nx.Graph, cp_strategy: str, cp_symmetry: str, kmax: Optional[int], timeout: float,
+               lb_budget: float = 0.5, num_workers: int = 8, csr: Optional[CSRGraph] = None):
+    nodes = list(G.nodes())
+    lower = compute_lower_bound(G, time_budget_s=lb_budget, csr=csr)
+    best_k, coloring, log = solve_min_coloring_strategy(
+        cp_strategy,
+        nodes=nodes,
+        edges=list(G.edges()),
+        k_min=lower.value,
+        k_max=kmax,
+        timeout_s=timeout,
+        num_workers=num_workers,
+        **symmetry_options(cp_symmetry, nodes, lower.clique),
+    )
+    return best_k, coloring, sum(s.conflicts for _, s in log), sum(s.branches for _, s in log)
+
+# --------------------------------------------------------------------
+# Une tâche = (instance, méthode): la campagne est développée en liste
+# de tâches indépendantes, exécutables dans n'importe quel ordre
+# -graph: {"name": ..., paramètres de load_instance}, {"gnm": (n, m), "seed": s}
+#         ou {"file": chemin} (DIMACS / liste d'arêtes, voir graph_io.py)
+# -key: identifiant stable, utilisé pour reprendre une campagne interrompue
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class BenchTask:
+    family: str
+    params: str
+    seed: int
+    method: str
+    graph: Dict[str, Any] = field(default_factory=dict, hash=False, compare=False)
+    cp_symmetry: Optional[str] = None
+
+    def label(self, cp_strategy: str) -> str:
+        return method_label(self.method, cp_strategy, self.cp_symmetry)
+
+    def key(self, cp_strategy: str) -> str:
+        return f"{self.family}|{self.params}|{self.seed}|{self.label(cp_strategy)}"
+
+# --------------------------------------------------------------------
+# Paramètres communs à toutes les tâches (transmis aux processus)
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class BenchConfig:
+    timeout_cp_min: float = 2.0
+    kmax: Optional[int] = None
+    cp_strategy: str = "iterative"
+    lb_budget: float = 0.5
+    # Threads CP-SAT par tâche (num_workers): jobs x cp_workers <= nb de cœurs
+    cp_workers: int = 8
+    # Budget global (s) de tabucol / partialcol / hea
+    timeout_ls: float = 2.0
+
+    def fingerprint(self) -> Dict[str, Any]:
+        # Paramètres qui changent les résultats (cp_workers ne change que la répartition des threads)
+        return {k: v for k, v in asdict(self).items() if k != "cp_workers"}
+
+    def digest(self) -> str:
+        return hashlib.sha1(json.dumps(self.fingerprint(), sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def build_tasks(
+    seeds: List[int],
+    methods: List[str],
+    erdos_sizes: List[int],
+    erdos_ps: List[float],
+    grids: List[Tuple[int, int]],
+    include_map_like: bool,
+    cp_symmetry: List[str],
+    dsatur_large: List[Tuple[int, int]],
+    dsatur_naive_max_n: int,
+    file_dirs: List[str] = [],
+) -> List[BenchTask]:
+    # (méthode, mode de symétrie): cp_min est lancé une fois par mode
+    runs = [(m, sym) for m in methods for sym in (cp_symmetry if m in CP_MIN_METHODS else [None])]
+    tasks: List[BenchTask] = []
+
+    # 1) Instance map_like
+    if include_map_like:
+        for method, sym in runs:
+            tasks.append(BenchTask("map_like", "", 0, method, {"name": "map_like"}, sym))
+
+    # 2) Grilles (grid)
+    for (w, h) in grids:
+        for method, sym in runs:
+            tasks.append(BenchTask("grid", f"w={w};h={h}", 0, method, {"name": "grid", "w": w, "h": h}, sym))
+
+    # 3) Graphes d'Erdos
+    for n in erdos_sizes:
+        for p in erdos_ps:
+            for seed in seeds:
+                graph = {"name": "erdos", "n": n, "p": p, "seed": seed}
+                for method, sym in runs:
+                    tasks.append(BenchTask("erdos", f"n={n};p={p}", seed, method, graph, sym))
+
+    # 4) DSATUR à grande échelle: graphes G(n, m) générés directement
+    #    (sans positions: load_instance calculerait un spring_layout en O(n²))
+    for (n, m) in dsatur_large:
+        for seed in seeds:
+            variants = ["dsatur"] + (["dsatur_naive"] if n <= dsatur_naive_max_n else [])
+            for method in variants:
+                tasks.append(BenchTask("dsatur_large", f"n={n};m={m}", seed, method, {"gnm": (n, m), "seed": seed}))
+
+    # 5) Dossiers de fichiers (DIMACS .col / .col.b, listes d'arêtes, + .gz): une famille par dossier
+    for folder in file_dirs:
+        family = os.path.basename(os.path.normpath(folder))
+        for path in list_graph_files(folder):
+            for method, sym in runs:
+                tasks.append(BenchTask(family, f"file={os.path.basename(path)}", 0, method, {"file": path}, sym))
+    return tasks
+
+# --------------------------------------------------------------------
+# Exécution d'une tâche (dans un processus du pool, ou en direct si jobs=1)
+# --------------------------------------------------------------------
+def _build_graph(graph: Dict[str, Any]) -> Tuple[str, Callable[[], CSRGraph], Callable[[], nx.Graph]]:
+    # (nom, fabrique du CSR, fabrique du graphe NetworkX): chaque méthode ne
+    # convertit le graphe chargé que dans la représentation qu'elle utilise
+    # (une instance porte déjà les deux, voir Instance.csr)
+    if "file" in graph:
+        edges = load_graph_file(graph["file"])
+        return edges.name, edges.to_csr, edges.to_networkx
+    if "gnm" in graph:
+        n, m = graph["gnm"]
+        G = nx.gnm_random_graph(n, m, seed=graph["seed"])
+        return f"gnm_n{n}_m{m}_s{graph['seed']}", lambda: as_csr(G), lambda: G
+    args = dict(graph)
+    inst = load_instance(args.pop("name"), **args)
+    return inst.name, lambda: inst.csr, lambda: inst.graph
+
+
+def run_task(task: BenchTask, config: BenchConfig) -> BenchRow:
+    name, make_csr, make_graph = _build_graph(task.graph)
+    # Chronomètre lancé avant les conversions: dsatur paie la construction du CSR
+    # comme dsatur_naive celle du graphe NetworkX
+    t0 = time.perf_counter()
+    G = make_graph() if task.method in ("dsatur_naive",) + CP_MIN_METHODS else None
+    csr = make_csr() if task.method != "dsatur_naive" else None
+    status = "OK"
+    k_found = conflicts = branches = None
+
+    # Sélection de la méthode (greedy / dsatur: mêmes calculs que heuristics.py, sur le CSR)
+    if task.method == "greedy":
+        coloring = csr.to_dict(greedy_csr(csr))
+    elif task.method == "dsatur":
+        coloring = csr.to_dict(dsatur_csr(csr))
+    elif task.method == "dsatur_naive":
+        coloring = dsatur_coloring_naive(G)
+    elif task.method == "cp_min":
+        k_found, coloring, conflicts, branches = run_cp_min(
+            G, config.cp_strategy, task.cp_symmetry or "clique", config.kmax, config.timeout_cp_min,
+            config.lb_budget, config.cp_workers, csr,
+        )
+        status = "FOUND" if coloring is not None else "NOT_FOUND"
+    elif task.method == "cp_min_dec":
+        # Composantes connexes du cœur (sommets de degré < clique épluchés), résolues l'une après l'autre
+        k_found, coloring, _, _ = solve_decomposed(
+            G, "cp_min", mode="components", peel=True, timeout_s=config.timeout_cp_min,
+            cp_strategy=config.cp_strategy, cp_symmetry=task.cp_symmetry or "clique",
+            lb_budget=config.lb_budget, num_workers=config.cp_workers, csr=csr,
+        )
+        status = "FOUND" if coloring is not None else "NOT_FOUND"
+    elif task.method in LS_METHODS:
+        # Recherche locale directement sur le CSR (k non prouvé optimal)
+        k_found, colors, _ = local_search_min_csr(csr, task.method, time_limit_s=config.timeout_ls)
+        coloring = csr.to_dict(colors)
+        status = "FOUND"
+    elif task.method == "hea":
+        # Population évaluée dans le processus de la tâche: le parallélisme est celui du pool de tâches
+        k_found, colors, _ = hea_min_csr(csr, time_limit_s=config.timeout_ls, jobs=1)
+        coloring = csr.to_dict(colors)
+        status = "FOUND"
+    else:
+        raise ValueError(f"Méthode inconnue: {task.method}")
+
+    dt = time.perf_counter() - t0
+    if csr is None:
+        csr = make_csr()  # validation seulement, hors chronomètre
+    valid = coloring is not None and len(coloring) == csr.n and is_valid_colors(csr, csr.to_array(coloring))
+    return BenchRow(
+        instance=name,
+        family=task.family,
+        params=task.params,
+        seed=task.seed,
+        method=task.label(config.cp_strategy),
+        colors_used=colors_used(coloring) if coloring is not None else 0,
+        valid=valid,
+        time_s=dt,
+        status=status,
+        k_found=k_found,
+        conflicts=conflicts,
+        branches=branches,
+    )
+
+
+def _run_task_safe(task: BenchTask, config: BenchConfig) -> BenchRow:
+    # Une tâche qui échoue donne une ligne ERROR (non considérée comme terminée à la reprise)
+    try:
+        return run_task(task, config)
+    except Exception as e:
+        return BenchRow(
+            instance="", family=task.family, params=task.params, seed=task.seed,
+            method=task.label(config.cp_strategy), colors_used=0, valid=False, time_s=0.0,
+            status=f"ERROR: {type(e).__name__}: {e}", k_found=None,
+        )
+
+# --------------------------------------------------------------------
+# Résultats écrits au fil de l'eau dans le JSONL (une ligne par tâche, avec sa
+# clé; la première ligne porte la configuration): il sert à la reprise.
+# Le CSV est réécrit à la fin à partir des résultats dédoublonnés
+# (une tâche ERROR relancée remplace sa ligne au lieu d'en ajouter une).
+# --------------------------------------------------------------------
+CSV_HEADER = [
+    "instance", "family", "params", "seed", "method",
+    "colors_used", "valid", "time_s", "status", "k_found",
+    "conflicts", "branches",
+]
+
+
+def _csv_row(r: BenchRow) -> list:
+    return [
+        r.instance, r.family, r.params, r.seed, r.method,
+        r.colors_used, int(r.valid), f"{r.time_s:.6f}", r.status,
+        "" if r.k_found is None else r.k_found,
+        "" if r.conflicts is None else r.conflicts,
+        "" if r.branches is None else r.branches,
+    ]
+
+
+def load_completed(out_jsonl: str, config: BenchConfig) -> Dict[str, BenchRow]:
+    # {clé: ligne} des tâches déjà terminées (lignes illisibles et ERROR ignorées).
+    # Refuse de reprendre un JSONL produit avec une autre configuration.
+    done: Dict[str, BenchRow] = {}
+    if not os.path.exists(out_jsonl) or os.path.getsize(out_jsonl) == 0:
+        return done
+    with open(out_jsonl, "r", encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = {}
+        found = header.get("config_hash") if isinstance(header, dict) else None
+        if found != config.digest():
+            raise ValueError(
+                f"{out_jsonl}: configuration différente ({header.get('config') if found else 'en-tête absent'}"
+                f" au lieu de {config.fingerprint()}); relancer sans reprise ou changer de fichier de sortie."
+            )
+        for line in f:
+            try:
+                record = json.loads(line)
+                key = record.pop("key")
+                row = BenchRow(**record)
+            except (ValueError, KeyError, TypeError):
+                continue
+            if not row.status.startswith("ERROR"):
+                done[key] = row
+    return done
+
+
+def write_csv(out_csv: str, rows: List[BenchRow]) -> None:
+    ensure_parent_dir(out_csv)
+    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(_csv_row(r) for r in rows)
+
+
+class _ResultWriter:
+    def __init__(self, out_jsonl: str, config: BenchConfig):
+        ensure_parent_dir(out_jsonl)
+        new = not os.path.exists(out_jsonl) or os.path.getsize(out_jsonl) == 0
+        self._jsonl = open(out_jsonl, "a", encoding="utf-8")
+        if new:
+            self._jsonl.write(json.dumps({"config_hash": config.digest(), "config": config.fingerprint()}) + "\n")
+
+    def write(self, key: str, row: BenchRow) -> None:
+        self._jsonl.write(json.dumps({"key": key, **asdict(row)}, ensure_ascii=False) + "\n")
+        # Écrit sur disque tout de suite: un arrêt brutal ne perd que les tâches en cours
+        self._jsonl.flush()
+
+    def close(self) -> None:
+        self._jsonl.close()
+
+# --------------------------------------------------------------------
+# Exécute une liste de tâches (en parallèle si jobs > 1), en sautant
+# celles déjà présentes dans le JSONL; retourne les lignes dans l'ordre des
+# tâches, qui est aussi celui du CSV (écrit même si la campagne est interrompue)
+# --------------------------------------------------------------------
+def run_campaign(
+    tasks: List[BenchTask],
+    config: BenchConfig,
+    out_csv: str,
+    out_jsonl: str,
+    jobs: int = 1,
+    resume: bool = True,
+    progress: Optional[Callable[[int, int, str, BenchRow], None]] = None,
+) -> List[BenchRow]:
+    if not resume:
+        for path in (out_csv, out_jsonl):
+            if os.path.exists(path):
+                os.remove(path)
+
+    done = load_completed(out_jsonl, config)
+    keys = [t.key(config.cp_strategy) for t in tasks]
+    todo = [(k, t) for k, t in zip(keys, tasks) if k not in done]
+    results: Dict[str, BenchRow] = dict(done)
+
+    writer = _ResultWriter(out_jsonl, config)
+    try:
+        def record(i: int, key: str, row: BenchRow) -> None:
+            writer.write(key, row)
+            results[key] = row
+            if progress is not None:
+                progress(i, len(todo), key, row)
+
+        if jobs <= 1:
+            for i, (key, task) in enumerate(todo, start=1):
+                record(i, key, _run_task_safe(task, config))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = {pool.submit(_run_task_safe, task, config): key for key, task in todo}
+                for i, fut in enumerate(as_completed(futures), start=1):
+                    record(i, futures[fut], fut.result())
+    finally:
+        writer.close()
+        rows = [results[k] for k in keys if k in results]
+        write_csv(out_csv, rows)
+    return rows
+
 # --------------------------------------------------------------------
 # Lance une campagne complète de benchmarks sur différentes instances
-# et différentes méthodes, puis écrit les résultats dans un CSV
+# et différentes méthodes; chaque résultat est ajouté au JSONL dès qu'il
+# est disponible, le CSV est écrit à la fin
 # --------------------------------------------------------------------
 def run_benchmark(
     out_csv: str = "outputs/benchmark.csv",
     seeds: List[int] = [1, 2, 3],
-    methods: List[str] = ["greedy", "dsatur", "cp_min"],
+    methods: List[str] = ["greedy", "dsatur", "tabucol", "cp_min", "cp_min_dec"],
 
     # Paramètres des graphes testés
     erdos_sizes: List[int] = [30, 50, 80],
@@ -72,157 +431,48 @@ def run_benchmark(
     include_map_like: bool = True,
     timeout_cp_min: float = 2.0,
     kmax: Optional[int] = None,
-) -> List[BenchRow]:
-    # Liste qui contiendra toutes les lignes du benchmark
-    rows: List[BenchRow] = []
+    # "iterative": timeout_cp_min par k / "single": timeout_cp_min pour tout le modèle
+    cp_strategy: str = "iterative",
+    # Cassage de symétries de cp_min: une ligne par mode (first / clique / precedence)
+    cp_symmetry: List[str] = ["clique"],
+    # Budget (s) de la borne inférieure de cp_min (lower_bounds.compute_lower_bound)
+    lb_budget: float = 0.5,
+    # Budget global (s) des recherches locales et de l'évolutionnaire (tabucol / partialcol / hea):
+    # à comparer (couleurs, time_s) avec cp_min
+    timeout_ls: float = 2.0,
 
-    # 1) Instance map_like
-    if include_map_like:
-        inst = load_instance("map_like")
-        G = inst.graph
-        for method in methods:
-            t0 = time.perf_counter()
-            status = "OK"
-            k_found = None
-
-            # Sélection de la méthode
-            if method == "greedy":
-                coloring = greedy_coloring(G)
-            elif method == "dsatur":
-                coloring = dsatur_coloring(G)
-            elif method == "cp_min":
-                best_k, coloring, log = solve_min_coloring(
-                    nodes=list(G.nodes()),
-                    edges=list(G.edges()),
-                    k_max=kmax,
-                    timeout_per_k_s=timeout_cp_min,
-                )
-                k_found = best_k
-                status = "FOUND" if coloring is not None else "NOT_FOUND"
-            else:
-                continue
+    # Grands graphes aléatoires (n, m): DSATUR tas vs DSATUR d'origine
+    dsatur_large: List[Tuple[int, int]] = [(2000, 20000), (5000, 50000), (20000, 200000)],
+    dsatur_naive_max_n: int = 5000,
 
-            dt = time.perf_counter() - t0
-            valid = coloring is not None and is_valid_coloring(G, coloring)
-            used = colors_used(coloring) if coloring is not None else 0
-
-            # Ajout d’une ligne de benchmark
-            rows.append(BenchRow(
-                instance=inst.name,
-                family="map_like",
-                params="",
-                seed=0,
-                method=method,
-                colors_used=used,
-                valid=valid,
-                time_s=dt,
-                status=status,
-                k_found=k_found,
-            ))
-
-     # 2) Grilles (grid)
-    for (w, h) in grids:
-        inst = load_instance("grid", w=w, h=h)
-        G = inst.graph
-        for method in methods:
-            t0 = time.perf_counter()
-            status = "OK"
-            k_found = None
-
-            if method == "greedy":
-                coloring = greedy_coloring(G)
-            elif method == "dsatur":
-                coloring = dsatur_coloring(G)
-            elif method == "cp_min":
-                best_k, coloring, log = solve_min_coloring(
-                    nodes=list(G.nodes()),
-                    edges=list(G.edges()),
-                    k_max=kmax,
-                    timeout_per_k_s=timeout_cp_min,
-                )
-                k_found = best_k
-                status = "FOUND" if coloring is not None else "NOT_FOUND"
-            else:
-                continue
+    # Dossiers de fichiers de graphes (DIMACS .col / .col.b, listes d'arêtes, + .gz):
+    # chaque dossier est une famille
+    file_dirs: List[str] = [],
 
-            dt = time.perf_counter() - t0
-            valid = coloring is not None and is_valid_coloring(G, coloring)
-            used = colors_used(coloring) if coloring is not None else 0
-
-            rows.append(BenchRow(
-                instance=inst.name,
-                family="grid",
-                params=f"w={w};h={h}",
-                seed=0,
-                method=method,
-                colors_used=used,
-                valid=valid,
-                time_s=dt,
-                status=status,
-                k_found=k_found,
-            ))
-
-    # 3) Graphes d'Erdos
-    for n in erdos_sizes:
-        for p in erdos_ps:
-            for seed in seeds:
-                inst = load_instance("erdos", n=n, p=p, seed=seed)
-                G = inst.graph
-
-                for method in methods:
-                    t0 = time.perf_counter()
-                    status = "OK"
-                    k_found = None
-
-                    if method == "greedy":
-                        coloring = greedy_coloring(G)
-                    elif method == "dsatur":
-                        coloring = dsatur_coloring(G)
-                    elif method == "cp_min":
-                        best_k, coloring, log = solve_min_coloring(
-                            nodes=list(G.nodes()),
-                            edges=list(G.edges()),
-                            k_max=kmax,
-                            timeout_per_k_s=timeout_cp_min,
-                        )
-                        k_found = best_k
-                        status = "FOUND" if coloring is not None else "NOT_FOUND"
-                    else:
-                        continue
-
-                    dt = time.perf_counter() - t0
-                    valid = coloring is not None and is_valid_coloring(G, coloring)
-                    used = colors_used(coloring) if coloring is not None else 0
-
-                    rows.append(BenchRow(
-                        instance=inst.name,
-                        family="erdos",
-                        params=f"n={n};p={p}",
-                        seed=seed,
-                        method=method,
-                        colors_used=used,
-                        valid=valid,
-                        time_s=dt,
-                        status=status,
-                        k_found=k_found,
-                    ))
-
-    # 4) Écriture du CSV
-    ensure_parent_dir(out_csv)
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-
-        # En-tête
-        w.writerow([
-            "instance", "family", "params", "seed", "method",
-            "colors_used", "valid", "time_s", "status", "k_found"
-        ])
-        # Lignes de résultats
-        for r in rows:
-            w.writerow([
-                r.instance, r.family, r.params, r.seed, r.method,
-                r.colors_used, int(r.valid), f"{r.time_s:.6f}", r.status,
-                "" if r.k_found is None else r.k_found
-            ])
-
-    return rows
+    # Exécution: jobs processus en parallèle, cp_workers threads CP-SAT chacun
+    # (par défaut: nb de cœurs / jobs); resume=True saute les tâches déjà dans le JSONL
+    # (qui doit avoir été produit avec la même configuration)
+    jobs: int = 1,
+    cp_workers: Optional[int] = None,
+    resume: bool = True,
+    out_jsonl: Optional[str] = None,
+    progress: Optional[Callable[[int, int, str, BenchRow], None]] = None,
+) -> List[BenchRow]:
+    tasks = build_tasks(
+        seeds, methods, erdos_sizes, erdos_ps, grids, include_map_like,
+        cp_symmetry, dsatur_large, dsatur_naive_max_n, file_dirs,
+    )
+    jobs = max(1, int(jobs))
+    if cp_workers is None:
+        cp_workers = max(1, (os.cpu_count() or 1) // jobs)
+    config = BenchConfig(
+        timeout_cp_min=timeout_cp_min,
+        kmax=kmax,
+        cp_strategy=cp_strategy,
+        lb_budget=lb_budget,
+        cp_workers=cp_workers,
+        timeout_ls=timeout_ls,
+    )
+    if out_jsonl is None:
+        out_jsonl = os.path.splitext(out_csv)[0] + ".jsonl"
+    return run_campaign(tasks, config, out_csv, out_jsonl, jobs=jobs, resume=resume, progress=progress)
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from graph_csr import CSRGraph, as_csr, dsatur_csr, greedy_clique_csr, greedy_csr
+from heuristics import dsatur_coloring
+from local_search import LS_METHODS, local_search_min_coloring
+from lower_bounds import compute_lower_bound
+from solve_coloring import solve_k_coloring, solve_min_coloring_strategy, symmetry_options
+
+Node = Hashable
+Edge = Tuple[Node, Node]
+
+DECOMPOSE_MODES = ("off", "components", "blocks")
+DECOMPOSE_METHODS = ("greedy", "dsatur", "cp_k", "cp_min") + LS_METHODS
+
+# --------------------------------------------------------------------
+# Découpage d'un graphe en parties résolues indépendamment
+# -parts: (sommets, arêtes) de chaque partie: composantes connexes du cœur,
+#  ou blocs (composantes biconnexes), qui ne partagent que des sommets d'articulation
+# -peeled: sommets retirés (degré < threshold), dans l'ordre de retrait;
+#  coloriés en dernier, dans l'ordre inverse
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class Part:
+    nodes: List[Node]
+    edges: List[Edge]
+
+
+@dataclass(frozen=True)
+class Decomposition:
+    mode: str
+    threshold: int
+    parts: List[Part] = field(default_factory=list)
+    peeled: List[Node] = field(default_factory=list)
+
+    @property
+    def largest(self) -> int:
+        return max((len(p.nodes) for p in self.parts), default=0)
+
+# --------------------------------------------------------------------
+# Résultat de la résolution d'une partie (k = couleurs utilisées, None si échec)
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class PartResult:
+    n: int
+    m: int
+    k: Optional[int]
+    status: str
+    time_s: float
+
+# --------------------------------------------------------------------
+# Épluchage: retire tant qu'il en existe les sommets de degré (résiduel) < t.
+# Un sommet retiré a moins de t voisins parmi ceux qui restent: colorié
+# après eux (ordre inverse du retrait), il trouve toujours une couleur < t.
+# --------------------------------------------------------------------
+def peel_order(csr: CSRGraph, threshold: int) -> List[int]:
+    if threshold <= 0:
+        return []
+    flat, bounds = csr.flat_lists()
+    deg = csr.degrees().tolist()
+    removed = [False] * csr.n
+    stack = [v for v in range(csr.n) if deg[v] < threshold]
+    for v in stack:
+        removed[v] = True
+    order: List[int] = []
+    while stack:
+        v = stack.pop()
+        order.append(v)
+        for u in flat[bounds[v]:bounds[v + 1]]:
+            if not removed[u]:
+                deg[u] -= 1
+                if deg[u] < threshold:
+                    removed[u] = True
+                    stack.append(u)
+    return order
+
+
+def component_labels(csr: CSRGraph, alive: Optional[np.ndarray] = None) -> np.ndarray:
+    # Composantes connexes (parcours en largeur) des sommets vivants; -1 = sommet retiré
+    flat, bounds = csr.flat_lists()
+    labels = [-1] * csr.n
+    ok = [True] * csr.n if alive is None else alive.tolist()
+    count = 0
+    for s in range(csr.n):
+        if labels[s] >= 0 or not ok[s]:
+            continue
+        labels[s] = count
+        queue = [s]
+        for v in queue:
+            for u in flat[bounds[v]:bounds[v + 1]]:
+                if labels[u] < 0 and ok[u]:
+                    labels[u] = count
+                    queue.append(u)
+        count += 1
+    return np.asarray(labels, dtype=np.int64)
+
+
+def decompose(G: nx.Graph, mode: str = "components", threshold: int = 0,
+              csr: Optional[CSRGraph] = None) -> Decomposition:
+    if mode not in DECOMPOSE_MODES[1:]:
+        raise ValueError(f"Mode de décomposition inconnu: {mode} ({'/'.join(DECOMPOSE_MODES[1:])})")
+    csr = as_csr(G, csr)
+    peeled = peel_order(csr, threshold)
+    alive = np.ones(csr.n, dtype=bool)
+    alive[peeled] = False
+
+    # Arêtes du cœur regroupées par composante (tri par étiquette)
+    labels = component_labels(csr, alive)
+    keep = alive[csr.src] & alive[csr.dst]
+    src, dst = csr.src[keep], csr.dst[keep]
+    order = np.argsort(labels[src], kind="stable")
+    src, dst = src[order], dst[order]
+    n_comp = int(labels.max()) + 1 if labels.size else 0
+    edge_bounds = np.searchsorted(labels[src], np.arange(n_comp + 1))
+    node_order = np.argsort(labels, kind="stable")
+    node_bounds = np.searchsorted(labels[node_order], np.arange(n_comp + 1))
+
+    nodes = csr.nodes
+    parts: List[Part] = []
+    for c in range(n_comp):
+        part_nodes = [nodes[i] for i in node_order[node_bounds[c]:node_bounds[c + 1]].tolist()]
+        lo, hi = edge_bounds[c], edge_bounds[c + 1]
+        part_edges = [(nodes[i], nodes[j]) for i, j in zip(src[lo:hi].tolist(), dst[lo:hi].tolist())]
+        if mode == "blocks" and len(part_nodes) > 2:
+            H = nx.Graph(part_edges)
+            for block in nx.biconnected_component_edges(H):
+                block = list(block)
+                parts.append(Part(list({v for e in block for v in e}), block))
+        else:
+            parts.append(Part(part_nodes, part_edges))
+
+    parts.sort(key=lambda p: len(p.nodes), reverse=True)
+    return Decomposition(mode, threshold, parts, [nodes[i] for i in peeled])
+
+# --------------------------------------------------------------------
+# Résolution d'une partie (dans un processus du pool, ou en direct si jobs=1)
+# options: k, timeout_s, cp_strategy, cp_symmetry, lb_budget, num_workers
+# --------------------------------------------------------------------
+def _solve_part(method: str, part: Part, options: Dict[str, Any]) -> Tuple[Optional[Dict[Node, int]], PartResult]:
+    t0 = time.perf_counter()
+    nodes, edges = part.nodes, part.edges
+    k = options.get("k")
+    timeout = float(options.get("timeout_s", 3.0))
+    status = "OK"
+
+    if len(nodes) <= 2:
+        # Sommet isolé ou arête seule (bloc pont): coloration directe
+        coloring = {v: i for i, v in enumerate(nodes)} if edges else {v: 0 for v in nodes}
+        if k is not None and len(set(coloring.values())) > k:
+            coloring, status = None, "INFEASIBLE"
+        elif method in ("cp_k", "cp_min"):
+            status = "OPTIMAL"
+    elif method in ("greedy", "dsatur"):
+        csr = as_csr(nx.Graph(edges))
+        colors = greedy_csr(csr) if method == "greedy" else dsatur_csr(csr)
+        coloring = csr.to_dict(colors)
+    elif method in LS_METHODS:
+        _, coloring, _ = local_search_min_coloring(nx.Graph(edges), method=method, time_limit_s=timeout)
+        status = "FOUND"
+    elif method == "cp_k":
+        csr = as_csr(nx.Graph(edges))
+        clique = [csr.nodes[i] for i in greedy_clique_csr(csr)]
+        coloring, si = solve_k_coloring(
+            nodes, edges, k=k, timeout_s=timeout, num_workers=options.get("num_workers", 8),
+            **symmetry_options(options.get("cp_symmetry", "clique"), nodes, clique),
+        )
+        status = si.status
+    elif method == "cp_min":
+        Gp = nx.Graph(edges)
+        lower = compute_lower_bound(Gp, time_budget_s=options.get("lb_budget", 0.5))
+        coloring = dsatur_coloring(Gp)
+        ub = len(set(coloring.values()))
+        if ub <= lower.value:
+            status = "OPTIMAL"  # DSATUR atteint la borne inférieure: pas de modèle CP-SAT
+        else:
+            _, cp_coloring, log = solve_min_coloring_strategy(
+                options.get("cp_strategy", "iterative"), nodes, edges, k_min=lower.value, k_max=ub,
+                timeout_s=timeout, num_workers=options.get("num_workers", 8),
+                **symmetry_options(options.get("cp_symmetry", "clique"), nodes, lower.clique),
+            )
+            status = log[-1][1].status if log else "NO_RUN"
+            # Sans solution CP-SAT dans le temps imparti, on garde DSATUR (statut conservé)
+            if cp_coloring is not None:
+                coloring = cp_coloring
+    else:
+        raise ValueError(f"Méthode non décomposable: {method} ({'/'.join(DECOMPOSE_METHODS)})")
+
+    used = len(set(coloring.values())) if coloring else None
+    return coloring, PartResult(len(nodes), len(edges), used, status, time.perf_counter() - t0)
+
+# --------------------------------------------------------------------
+# Fusion: les parties sont parcourues en largeur à travers leurs sommets
+# communs; une partie (bloc) ne partage alors qu'un sommet d'articulation avec
+# celles déjà placées, et ses couleurs sont permutées pour s'y accorder.
+# Puis les sommets épluchés prennent la plus petite couleur libre.
+# --------------------------------------------------------------------
+def merge_colorings(G: nx.Graph, colorings: List[Dict[Node, int]], peeled: List[Node]) -> Dict[Node, int]:
+    parts_of: Dict[Node, List[int]] = {}
+    for p, col in enumerate(colorings):
+        for v in col:
+            parts_of.setdefault(v, []).append(p)
+
+    merged: Dict[Node, int] = {}
+    seen = [False] * len(colorings)
+    for root in range(len(colorings)):
+        if seen[root]:
+            continue
+        seen[root] = True
+        queue = deque([root])
+        while queue:
+            col = colorings[queue.popleft()]
+            shared = next((v for v in col if v in merged), None)
+            if shared is not None and merged[shared] != col[shared]:
+                a, b = merged[shared], col[shared]
+                col = {v: a if c == b else b if c == a else c for v, c in col.items()}
+            merged.update(col)
+            for v in col:
+                for q in parts_of[v]:
+                    if not seen[q]:
+                        seen[q] = True
+                        queue.append(q)
+
+    for v in reversed(peeled):
+        used = {merged[u] for u in G.neighbors(v) if u in merged}
+        c = 0
+        while c in used:
+            c += 1
+        merged[v] = c
+    return merged
+
+# --------------------------------------------------------------------
+# Point d'entrée: décompose, résout les parties (en parallèle si jobs > 1),
+# puis fusionne. χ = max sur les parties (les sommets épluchés n'ajoutent
+# pas de couleur: seuil = k pour cp_k, clique gloutonne sinon).
+# Retourne (k, coloration, décomposition, résultat par partie);
+# k et coloration valent None si une partie échoue.
+# --------------------------------------------------------------------
+def solve_decomposed(
+    G: nx.Graph,
+    method: str,
+    mode: str = "components",
+    peel: bool = True,
+    k: Optional[int] = None,
+    timeout_s: float = 3.0,
+    jobs: int = 1,
+    cp_strategy: str = "iterative",
+    cp_symmetry: str = "clique",
+    lb_budget: float = 0.5,
+    num_workers: Optional[int] = None,
+    csr: Optional[CSRGraph] = None,
+) -> Tuple[Optional[int], Optional[Dict[Node, int]], Decomposition, List[PartResult]]:
+    if method == "cp_k" and k is None:
+        raise ValueError("cp_k nécessite k.")
+    csr = as_csr(G, csr)
+    threshold = 0
+    if peel:
+        threshold = k if method == "cp_k" else len(greedy_clique_csr(csr))
+    dec = decompose(G, mode, threshold, csr)
+
+    jobs = max(1, int(jobs))
+    options = {
+        "k": k if method == "cp_k" else None,
+        "timeout_s": timeout_s,
+        "cp_strategy": cp_strategy,
+        "cp_symmetry": cp_symmetry,
+        "lb_budget": lb_budget,
+        "num_workers": num_workers or max(1, (os.cpu_count() or 1) // jobs),
+    }
+    # Les grandes parties d'abord (tri de decompose): elles occupent le pool le plus longtemps
+    if jobs <= 1 or len(dec.parts) <= 1:
+        solved = [_solve_part(method, part, options) for part in dec.parts]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            solved = list(pool.map(_solve_part, [method] * len(dec.parts), dec.parts, [options] * len(dec.parts)))
+
+    results = [r for _, r in solved]
+    if any(col is None for col, _ in solved):
+        return None, None, dec, results
+    coloring = merge_colorings(G, [col for col, _ in solved], dec.peeled)
+    used = len(set(coloring.values())) if coloring else 0
+    return used, coloring, dec, results
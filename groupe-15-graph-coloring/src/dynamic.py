@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+import networkx as nx
+import numpy as np
+from ortools.sat.python import cp_model
+
+from graph_csr import from_networkx, is_valid_coloring
+from heuristics import dsatur_coloring
+from lower_bounds import compute_lower_bound
+from solve_coloring import solve_min_coloring_strategy, symmetry_options
+
+Node = Hashable
+
+FULL_METHODS = ("dsatur", "cp_min")
+
+# --------------------------------------------------------------------
+# Compte rendu d'une opération sur le graphe dynamique
+# -repair: none / free (couleur libre) / kempe (échange de chaîne de Kempe)
+#          / cp_sat (re-résolution locale) / new_color / compact (après suppression)
+# -recolored: nb de sommets dont la couleur a changé
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class RepairReport:
+    op: str
+    repair: str
+    latency_s: float
+    recolored: int
+    colors_used: int
+
+# --------------------------------------------------------------------
+# Comparaison avec une re-résolution complète du graphe courant
+# -drift: couleurs (dynamique) - couleurs (re-résolution), >= 0 en pratique
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class DriftReport:
+    operations: int
+    colors_dynamic: int
+    colors_full: int
+    drift: int
+    full_method: str
+    full_time_s: float
+    mean_latency_s: float
+    max_latency_s: float
+    repairs: Dict[str, int]
+
+
+# --------------------------------------------------------------------
+# Coloration maintenue sous insertions / suppressions d'arêtes et de sommets.
+# Seul le voisinage touché est réparé, par ordre de coût croissant:
+# 1) couleur libre parmi les couleurs existantes
+# 2) échange d'une chaîne de Kempe (taille bornée par max_chain)
+# 3) CP-SAT sur la boule de rayon `radius` autour du conflit (au plus
+#    max_region sommets), couleurs du bord fixées, nb de changements minimisé
+# 4) en dernier recours, une nouvelle couleur
+# --------------------------------------------------------------------
+class DynamicColoring:
+    def __init__(
+        self,
+        G: nx.Graph,
+        coloring: Optional[Dict[Node, int]] = None,
+        max_chain: int = 200,
+        radius: int = 2,
+        max_region: int = 150,
+        cp_timeout_s: float = 0.5,
+        num_workers: Optional[int] = None,
+    ):
+        # Copie: le graphe de l'appelant n'est pas modifié
+        self.G = G.copy()
+        self.coloring: Dict[Node, int] = dict(coloring) if coloring is not None else dsatur_coloring(G)
+        self.max_chain = max_chain
+        self.radius = radius
+        self.max_region = max_region
+        self.cp_timeout_s = cp_timeout_s
+        # Workers CP-SAT: par défaut un par cœur (comme solve_decomposed)
+        self.num_workers = num_workers or max(1, os.cpu_count() or 1)
+        self.history: List[RepairReport] = []
+        self._counts: Counter = Counter(self.coloring.values())
+        self._changed: Set[Node] = set()
+
+    # ----------------------------------------------------------------
+    # État courant
+    # ----------------------------------------------------------------
+    @property
+    def colors_used(self) -> int:
+        return len(self._counts)
+
+    @property
+    def palette(self) -> int:
+        # Couleurs 0..palette-1 (des classes intermédiaires peuvent être vides)
+        return max(self._counts) + 1 if self._counts else 0
+
+    def is_valid(self) -> bool:
+        return is_valid_coloring(self.G, self.coloring)
+
+    def _set(self, v: Node, c: Optional[int]) -> None:
+        old = self.coloring.get(v)
+        if old == c:
+            return
+        if old is not None:
+            self._counts[old] -= 1
+            if self._counts[old] == 0:
+                del self._counts[old]
+        if c is None:
+            del self.coloring[v]
+        else:
+            self.coloring[v] = c
+            self._counts[c] += 1
+        self._changed.add(v)
+
+    def _free_color(self, v: Node, limit: int) -> Optional[int]:
+        used = {self.coloring.get(u) for u in self.G.neighbors(v)}
+        return next((c for c in range(limit) if c not in used), None)
+
+    # ----------------------------------------------------------------
+    # Réparations (le sommet x est non colorié au moment de l'appel)
+    # ----------------------------------------------------------------
+    def _kempe(self, x: Node, k: int) -> bool:
+        # Libère une couleur c pour x: les voisins de x coloriés c et leurs
+        # chaînes (c, d) passent en d, si ces chaînes ne touchent aucun voisin de x colorié d
+        col = self.coloring
+        nbrs = list(self.G.neighbors(x))
+        by_color: Dict[int, List[Node]] = {}
+        for u in nbrs:
+            if u in col:
+                by_color.setdefault(col[u], []).append(u)
+        for c in sorted(range(k), key=lambda c: len(by_color.get(c, ()))):
+            starts = by_color.get(c, [])
+            for d in range(k):
+                if d == c:
+                    continue
+                chain = set(starts)
+                queue = list(starts)
+                blocked = False
+                for w in queue:
+                    for z in self.G.neighbors(w):
+                        if z != x and z not in chain and col.get(z) in (c, d):
+                            chain.add(z)
+                            queue.append(z)
+                    if len(chain) > self.max_chain:
+                        blocked = True
+                        break
+                if blocked or any(u in chain for u in by_color.get(d, ())):
+                    continue
+                for w in chain:
+                    self._set(w, d if col[w] == c else c)
+                self._set(x, c)
+                return True
+        return False
+
+    def _region(self, centers: Iterable[Node], radius: int) -> List[Node]:
+        # Boule de rayon `radius` (parcours en largeur), tronquée à max_region sommets
+        region = list(dict.fromkeys(centers))
+        seen = set(region)
+        frontier = list(region)
+        for _ in range(radius):
+            nxt = []
+            for v in frontier:
+                for u in self.G.neighbors(v):
+                    if u not in seen and len(region) < self.max_region:
+                        seen.add(u)
+                        region.append(u)
+                        nxt.append(u)
+            frontier = nxt
+        return region
+
+    def _scoped_cp(self, centers: List[Node], k: int) -> bool:
+        for radius in range(1, self.radius + 1):
+            region = self._region(centers, radius)
+            pos = {v: i for i, v in enumerate(region)}
+            # Domaines: couleurs non prises par les voisins hors de la région (bord fixé)
+            domains = []
+            for v in region:
+                fixed = {self.coloring[u] for u in self.G.neighbors(v) if u not in pos and u in self.coloring}
+                domains.append([c for c in range(k) if c not in fixed])
+            if not all(domains):
+                continue
+
+            model = cp_model.CpModel()
+            x = [model.NewIntVarFromDomain(cp_model.Domain.FromValues(d), f"x_{i}") for i, d in enumerate(domains)]
+            changed = []
+            for i, v in enumerate(region):
+                for u in self.G.neighbors(v):
+                    j = pos.get(u)
+                    if j is not None and j > i:
+                        model.Add(x[i] != x[j])
+                # Minimise le nb de sommets recoloriés (hint = couleurs actuelles)
+                cur = self.coloring.get(v)
+                if cur is not None and cur in domains[i]:
+                    b = model.NewBoolVar(f"chg_{i}")
+                    model.Add(x[i] == cur).OnlyEnforceIf(b.Not())
+                    model.AddHint(x[i], cur)
+                    changed.append(b)
+            model.Minimize(sum(changed))
+
+            solver = cp_model.CpSolver()
+            solver.parameters.max_time_in_seconds = float(self.cp_timeout_s)
+            solver.parameters.num_workers = int(self.num_workers)
+            st = solver.Solve(model)
+            if st in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                for i, v in enumerate(region):
+                    self._set(v, int(solver.Value(x[i])))
+                return True
+        return False
+
+    def _repair(self, candidates: List[Node]) -> str:
+        # Les candidats (extrémités du conflit, ou nouveau sommet) sont essayés un à un
+        k = self.palette
+        for step in ("free", "kempe"):
+            for v in candidates:
+                old = self.coloring.get(v)
+                self._set(v, None)
+                if step == "free":
+                    c = self._free_color(v, k)
+                    if c is not None:
+                        self._set(v, c)
+                        return step
+                elif self._kempe(v, k):
+                    return step
+                self._set(v, old)
+        if k > 0 and self._scoped_cp(candidates, k):
+            return "cp_sat"
+        v = candidates[0]
+        self._set(v, self._free_color(v, k + 1))
+        return "new_color"
+
+    def _report(self, op: str, repair: str, t0: float) -> RepairReport:
+        report = RepairReport(op, repair, time.perf_counter() - t0, len(self._changed), self.colors_used)
+        self._changed = set()
+        self.history.append(report)
+        return report
+
+    # ----------------------------------------------------------------
+    # Opérations
+    # ----------------------------------------------------------------
+    def add_node(self, v: Node, neighbors: Iterable[Node] = ()) -> RepairReport:
+        t0 = time.perf_counter()
+        self._changed = set()
+        if v in self.G:
+            raise ValueError(f"Sommet déjà présent: {v}")
+        self.G.add_node(v)
+        for u in neighbors:
+            if u not in self.G:
+                raise ValueError(f"Voisin inconnu: {u}")
+            self.G.add_edge(v, u)
+        return self._report("add_node", self._repair([v]), t0)
+
+    def remove_node(self, v: Node) -> RepairReport:
+        t0 = time.perf_counter()
+        self._changed = set()
+        nbrs = list(self.G.neighbors(v))
+        self.G.remove_node(v)
+        self._set(v, None)
+        self._changed.discard(v)
+        return self._report("remove_node", self._compact(nbrs), t0)
+
+    def add_edge(self, u: Node, v: Node) -> RepairReport:
+        t0 = time.perf_counter()
+        self._changed = set()
+        for w in (u, v):
+            if w not in self.G:
+                raise ValueError(f"Sommet inconnu: {w} (utiliser add_node)")
+        self.G.add_edge(u, v)
+        if u == v or self.coloring[u] != self.coloring[v]:
+            return self._report("add_edge", "none", t0)
+        # Le sommet de plus petit degré est le plus facile à déplacer
+        candidates = sorted((u, v), key=self.G.degree)
+        return self._report("add_edge", self._repair(candidates), t0)
+
+    def remove_edge(self, u: Node, v: Node) -> RepairReport:
+        t0 = time.perf_counter()
+        self._changed = set()
+        self.G.remove_edge(u, v)
+        return self._report("remove_edge", self._compact([u, v]), t0)
+
+    def _compact(self, nodes: List[Node]) -> str:
+        # Après une suppression: un sommet de la plus haute couleur descend
+        # vers une couleur libre plus petite (la classe du haut peut se vider)
+        top = self.palette - 1
+        moved = False
+        for w in nodes:
+            if self.coloring.get(w) == top:
+                c = self._free_color(w, top)
+                if c is not None:
+                    self._set(w, c)
+                    moved = True
+        return "compact" if moved else "none"
+
+    # ----------------------------------------------------------------
+    # Dérive par rapport à une re-résolution complète du graphe courant
+    # ----------------------------------------------------------------
+    def drift(self, full_method: str = "dsatur", timeout_s: float = 3.0, lb_budget: float = 0.5) -> DriftReport:
+        t0 = time.perf_counter()
+        csr = from_networkx(self.G)
+        if full_method == "dsatur":
+            full = dsatur_coloring(self.G, csr=csr)
+        elif full_method == "cp_min":
+            nodes = list(self.G.nodes())
+            lower = compute_lower_bound(self.G, time_budget_s=lb_budget, csr=csr)
+            ub = len(set(dsatur_coloring(self.G, csr=csr).values())) if nodes else 0
+            _, full, _ = solve_min_coloring_strategy(
+                "iterative", nodes, list(self.G.edges()), k_min=lower.value, k_max=max(lower.value, ub),
+                timeout_s=timeout_s, num_workers=self.num_workers, **symmetry_options("clique", nodes, lower.clique),
+            )
+            full = full if full is not None else dsatur_coloring(self.G, csr=csr)
+        else:
+            raise ValueError(f"Re-résolution inconnue: {full_method} ({'/'.join(FULL_METHODS)})")
+        full_time = time.perf_counter() - t0
+
+        full_k = len(set(full.values())) if full else 0
+        latencies = np.array([r.latency_s for r in self.history]) if self.history else np.zeros(1)
+        return DriftReport(
+            operations=len(self.history),
+            colors_dynamic=self.colors_used,
+            colors_full=full_k,
+            drift=self.colors_used - full_k,
+            full_method=full_method,
+            full_time_s=full_time,
+            mean_latency_s=float(latencies.mean()),
+            max_latency_s=float(latencies.max()),
+            repairs=dict(Counter(r.repair for r in self.history)),
+        )
+
+# --------------------------------------------------------------------
+# Scénario aléatoire: `steps` opérations (insertion d'arête avec probabilité
+# p_add, suppression sinon), pour mesurer latences et dérive
+# --------------------------------------------------------------------
+def simulate(
+    G: nx.Graph,
+    steps: int = 200,
+    p_add: float = 0.6,
+    seed: int = 0,
+    **options,
+) -> DynamicColoring:
+    rng = np.random.default_rng(seed)
+    dyn = DynamicColoring(G, **options)
+    nodes = list(dyn.G.nodes())
+    if len(nodes) < 2:
+        return dyn
+    full = len(nodes) * (len(nodes) - 1) // 2
+    for _ in range(steps):
+        m = dyn.G.number_of_edges()
+        # Graphe complet: aucune arête à insérer, on en retire une
+        if (rng.random() < p_add or m == 0) and m < full:
+            while True:
+                i, j = rng.choice(len(nodes), size=2, replace=False)
+                if not dyn.G.has_edge(nodes[i], nodes[j]):
+                    break
+            dyn.add_edge(nodes[i], nodes[j])
+        else:
+            edges = list(dyn.G.edges())
+            u, v = edges[int(rng.integers(0, len(edges)))]
+            dyn.remove_edge(u, v)
+    return dyn
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+Node = Hashable
+Edge = Tuple[Node, Node]
+
+# --------------------------------------------------------------------
+# Représentation CSR (compressed sparse row) d'un graphe non orienté
+# -nodes: nœuds d'origine, dans l'ordre de G.nodes() (id interne = position)
+# -offsets (n+1, int32) / indices (2m, int32): voisins de i = indices[offsets[i]:offsets[i+1]]
+# -src / dst (m, int32): chaque arête une seule fois (src < dst), pour les calculs vectorisés
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class CSRGraph:
+    nodes: List[Node]
+    index: Dict[Node, int]
+    offsets: np.ndarray
+    indices: np.ndarray
+    src: np.ndarray
+    dst: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def m(self) -> int:
+        return int(self.src.size)
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        return self.indices[self.offsets[i]:self.offsets[i + 1]]
+
+    def flat_lists(self) -> Tuple[List[int], List[int]]:
+        # (indices, offsets) en listes Python: en boucle Python, l'accès élément par
+        # élément est bien plus rapide que sur un ndarray
+        return self.indices.tolist(), self.offsets.tolist()
+
+    # ----------------------------------------------------------------
+    # Conversions coloration dict <-> tableau (-1 = non colorié)
+    # ----------------------------------------------------------------
+    def to_array(self, coloring: Dict[Node, int]) -> np.ndarray:
+        colors = np.full(self.n, -1, dtype=np.int64)
+        for v, c in coloring.items():
+            i = self.index.get(v)
+            if i is not None:
+                colors[i] = c
+        return colors
+
+    def to_dict(self, colors: np.ndarray) -> Dict[Node, int]:
+        return {v: int(c) for v, c in zip(self.nodes, colors.tolist()) if c >= 0}
+
+
+# --------------------------------------------------------------------
+# Construction
+# --------------------------------------------------------------------
+def from_edge_arrays(nodes: List[Node], src: np.ndarray, dst: np.ndarray) -> CSRGraph:
+    """
+    Construit le CSR à partir d'arêtes déjà indexées (boucles et doublons retirés).
+    """
+    n = len(nodes)
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+
+    keep = src != dst
+    lo = np.minimum(src[keep], dst[keep])
+    hi = np.maximum(src[keep], dst[keep])
+    if lo.size:
+        # Arêtes uniques, triées (tri + comparaison aux voisins: plus rapide que np.unique)
+        key = np.sort(lo * n + hi)
+        key = key[np.concatenate(([True], key[1:] != key[:-1]))]
+        lo, hi = key // n, key % n
+
+    # Chaque arête dans les deux sens, puis tri stable par sommet d'origine
+    both_src = np.concatenate([lo, hi])
+    both_dst = np.concatenate([hi, lo])
+    order = np.argsort(both_src, kind="stable")
+    counts = np.bincount(both_src, minlength=n)
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+
+    return CSRGraph(
+        nodes=list(nodes),
+        index={v: i for i, v in enumerate(nodes)},
+        offsets=offsets,
+        indices=both_dst[order].astype(np.int32),
+        src=lo.astype(np.int32),
+        dst=hi.astype(np.int32),
+    )
+
+
+def from_edges(nodes: Iterable[Node], edges: Iterable[Edge]) -> CSRGraph:
+    # Arêtes dont une extrémité est inconnue: ignorées (comme dans le modèle CP-SAT)
+    nodes = list(nodes)
+    index = {v: i for i, v in enumerate(nodes)}
+    pairs = [(index[u], index[v]) for u, v in edges if u in index and v in index]
+    arr = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    return from_edge_arrays(nodes, arr[:, 0], arr[:, 1])
+
+
+def from_networkx(G: nx.Graph) -> CSRGraph:
+    """
+    Lit directement G.adj (déjà une liste d'adjacence): pas de tri, une seule passe
+    en C (map/chain) sur les voisins. Les boucles sont retirées.
+    """
+    nodes = list(G.nodes())
+    index = {v: i for i, v in enumerate(nodes)}
+    n = len(nodes)
+    adj = G.adj
+
+    deg = np.fromiter(map(len, adj.values()), dtype=np.int64, count=n)
+    total = int(deg.sum())
+    indices = np.fromiter(map(index.__getitem__, chain.from_iterable(adj.values())), dtype=np.int32, count=total)
+    owner = np.repeat(np.arange(n, dtype=np.int32), deg)
+
+    loops = owner == indices
+    if loops.any():
+        owner, indices = owner[~loops], indices[~loops]
+        deg = np.bincount(owner, minlength=n)
+
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(deg, out=offsets[1:])
+    half = owner < indices
+    return CSRGraph(
+        nodes=nodes,
+        index=index,
+        offsets=offsets,
+        indices=indices,
+        src=owner[half],
+        dst=indices[half],
+    )
+
+
+# CSR du graphe: celui fourni par l'appelant (construit une fois, ex. Instance.csr),
+# sinon reconstruit. Pas de cache implicite: un graphe NetworkX peut être modifié
+# (arête retirée puis une autre ajoutée) sans que rien ne permette de le détecter.
+def as_csr(G: nx.Graph, csr: Optional[CSRGraph] = None) -> CSRGraph:
+    return csr if csr is not None else from_networkx(G)
+
+
+# --------------------------------------------------------------------
+# Validation et comptage (vectorisés sur les tableaux d'arêtes)
+# --------------------------------------------------------------------
+def is_valid_colors(csr: CSRGraph, colors: np.ndarray) -> bool:
+    # Complète (aucun -1) et aucune arête monochrome
+    colors = np.asarray(colors)
+    if colors.size != csr.n or (colors < 0).any():
+        return False
+    return not bool((colors[csr.src] == colors[csr.dst]).any())
+
+
+def count_conflicts(csr: CSRGraph, colors: np.ndarray) -> int:
+    colors = np.asarray(colors)
+    return int(np.count_nonzero(colors[csr.src] == colors[csr.dst]))
+
+
+def colors_used_array(colors: np.ndarray) -> int:
+    colors = np.asarray(colors)
+    colors = colors[colors >= 0]
+    return int(np.unique(colors).size) if colors.size else 0
+
+
+def is_valid_coloring(G: nx.Graph, coloring: Optional[Dict[Node, int]], csr: Optional[CSRGraph] = None) -> bool:
+    # Même contrat que main.is_valid_coloring (csr: CSR déjà construit pour G, optionnel)
+    if coloring is None or len(coloring) != G.number_of_nodes():
+        return False
+    csr = as_csr(G, csr)
+    return is_valid_colors(csr, csr.to_array(coloring))
+
+
+# --------------------------------------------------------------------
+# Heuristiques sur le CSR (sommets = 0..n-1, couleurs dans un tableau)
+# --------------------------------------------------------------------
+def greedy_csr(csr: CSRGraph, order: Optional[Iterable[int]] = None) -> np.ndarray:
+    """
+    Glouton: plus petite couleur absente chez les voisins déjà coloriés.
+    """
+    flat, bounds = csr.flat_lists()
+    colors = [-1] * csr.n
+    get = colors.__getitem__
+    for v in (range(csr.n) if order is None else order):
+        used = set(map(get, flat[bounds[v]:bounds[v + 1]]))
+        c = 0
+        while c in used:
+            c += 1
+        colors[v] = c
+    return np.asarray(colors, dtype=np.int64)
+
+
+def dsatur_csr(csr: CSRGraph) -> np.ndarray:
+    """
+    DSATUR (tas à invalidation paresseuse + bitmasks).
+    Départage: saturation, puis degré, puis ordre des nœuds.
+    """
+    n = csr.n
+    flat, bounds = csr.flat_lists()
+    degree = csr.degrees().tolist()
+    colors = [-1] * n
+    forbidden = [0] * n
+    saturation = [0] * n
+
+    heap = [(0, -degree[i], i) for i in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        neg_sat, _, v = heapq.heappop(heap)
+        if colors[v] >= 0 or -neg_sat != saturation[v]:
+            continue
+        mask = forbidden[v]
+        c = ((~mask) & (mask + 1)).bit_length() - 1
+        colors[v] = c
+        bit = 1 << c
+        for u in flat[bounds[v]:bounds[v + 1]]:
+            if colors[u] >= 0 or forbidden[u] & bit:
+                continue
+            forbidden[u] |= bit
+            saturation[u] += 1
+            heapq.heappush(heap, (-saturation[u], -degree[u], u))
+    return np.asarray(colors, dtype=np.int64)
+
+
+def degree_order(csr: CSRGraph) -> np.ndarray:
+    # Degré décroissant, ordre des nœuds en cas d'égalité (tri stable)
+    return np.argsort(-csr.degrees(), kind="stable")
+
+
+def greedy_clique_csr(csr: CSRGraph, starts: int = 32) -> List[int]:
+    """
+    Clique gloutonne (indices): depuis chacun des `starts` sommets de plus fort degré,
+    ajoute le candidat de plus fort degré puis restreint les candidats à ses voisins.
+    Retourne la plus grande clique trouvée (une borne inférieure sur χ).
+    """
+    if csr.n == 0:
+        return []
+    flat, bounds = csr.flat_lists()
+    degree = csr.degrees().tolist()
+    by_degree = degree_order(csr).tolist()
+
+    best: List[int] = [by_degree[0]]
+    for v in by_degree[:starts]:
+        if degree[v] < len(best):
+            break  # une clique contenant v a au plus deg(v)+1 sommets
+        clique = [v]
+        cand = set(flat[bounds[v]:bounds[v + 1]])
+        while cand and len(clique) + len(cand) > len(best):
+            u = max(cand, key=degree.__getitem__)
+            clique.append(u)
+            cand.intersection_update(flat[bounds[u]:bounds[u + 1]])
+        if len(clique) > len(best):
+            best = clique
+    return best
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import tempfile
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Hashable, IO, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from graph_csr import CSRGraph, from_edge_arrays
+
+Node = Hashable
+
+# Extensions reconnues (chacune aussi en .gz)
+DIMACS_SUFFIXES = (".col",)
+DIMACS_BINARY_SUFFIXES = (".col.b",)
+EDGE_LIST_SUFFIXES = (".edges", ".edgelist", ".el", ".txt")
+DEFAULT_CACHE_DIR = os.path.join("outputs", "cache")
+
+# --------------------------------------------------------------------
+# Graphe lu depuis un fichier, sous forme compacte:
+# -labels: étiquette de chaque sommet (numéros DIMACS 1..n, ou étiquettes de la liste d'arêtes)
+# -src / dst (int32): indices des extrémités de chaque arête (telles que lues)
+# Le graphe NetworkX n'est construit qu'à la demande (to_networkx).
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class EdgeList:
+    name: str
+    labels: np.ndarray
+    src: np.ndarray
+    dst: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return int(self.labels.size)
+
+    @property
+    def m(self) -> int:
+        return int(self.src.size)
+
+    def nodes(self) -> List[Node]:
+        return self.labels.tolist()
+
+    def to_csr(self) -> CSRGraph:
+        # Boucles et arêtes en double retirées
+        return from_edge_arrays(self.nodes(), self.src, self.dst)
+
+    def to_networkx(self) -> nx.Graph:
+        labels = self.nodes()
+        G = nx.Graph()
+        G.add_nodes_from(labels)
+        G.add_edges_from((labels[i], labels[j]) for i, j in zip(self.src.tolist(), self.dst.tolist()) if i != j)
+        return G
+
+
+def _open_text(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _open_binary(path: str) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _base_name(path: str) -> str:
+    name = os.path.basename(path)
+    for suffix in (".gz",) + DIMACS_BINARY_SUFFIXES + DIMACS_SUFFIXES + EDGE_LIST_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    return name
+
+# --------------------------------------------------------------------
+# DIMACS texte (.col): lecture ligne à ligne, arêtes accumulées dans
+# des tableaux compacts (array d'entiers), sans liste de tuples
+#   c commentaire
+#   p edge <n> <m>
+#   e <u> <v>        (sommets numérotés de 1 à n)
+# --------------------------------------------------------------------
+def read_dimacs(path: str) -> EdgeList:
+    n = None
+    src, dst = array("i"), array("i")
+    with _open_text(path) as f:
+        for line in f:
+            if not line or line[0] == "c":
+                continue
+            if line[0] == "e":
+                parts = line.split()
+                src.append(int(parts[1]) - 1)
+                dst.append(int(parts[2]) - 1)
+            elif line[0] == "p":
+                parts = line.split()
+                if len(parts) < 3:
+                    raise ValueError(f"{path}: ligne 'p' invalide: {line.strip()}")
+                n = int(parts[2])
+    if n is None:
+        raise ValueError(f"{path}: ligne 'p edge n m' manquante")
+    return _edge_list(_base_name(path), np.arange(1, n + 1), src, dst, path)
+
+# --------------------------------------------------------------------
+# DIMACS binaire (.col.b): entête texte de longueur donnée par la 1re ligne,
+# puis la moitié inférieure de la matrice d'adjacence, ligne i sur (i+8)//8 octets
+# (bit de poids fort = colonne 0)
+# --------------------------------------------------------------------
+def read_dimacs_binary(path: str) -> EdgeList:
+    with _open_binary(path) as f:
+        preamble_len = int(f.readline().strip())
+        preamble = f.read(preamble_len).decode("ascii", errors="replace")
+        n = None
+        for line in preamble.splitlines():
+            if line.startswith("p"):
+                n = int(line.split()[2])
+        if n is None:
+            raise ValueError(f"{path}: ligne 'p edge n m' manquante dans l'entête")
+
+        src_parts, dst_parts = [], []
+        for i in range(n):
+            row_bytes = (i + 8) // 8
+            row = np.frombuffer(f.read(row_bytes), dtype=np.uint8)
+            if row.size < row_bytes:
+                raise ValueError(f"{path}: matrice tronquée (ligne {i + 1}/{n})")
+            cols = np.flatnonzero(np.unpackbits(row)[:i])  # j < i: on ignore la diagonale
+            if cols.size:
+                src_parts.append(np.full(cols.size, i, dtype=np.int32))
+                dst_parts.append(cols.astype(np.int32))
+
+    src = np.concatenate(src_parts) if src_parts else np.zeros(0, dtype=np.int32)
+    dst = np.concatenate(dst_parts) if dst_parts else np.zeros(0, dtype=np.int32)
+    return EdgeList(_base_name(path), np.arange(1, n + 1), src, dst)
+
+# --------------------------------------------------------------------
+# Liste d'arêtes: une arête "u v" par ligne (espaces, tabulations ou virgules;
+# colonnes suivantes ignorées, ex. poids), commentaires # ou %
+# Étiquettes entières conservées comme entiers, sinon comme chaînes.
+# --------------------------------------------------------------------
+def read_edge_list(path: str) -> EdgeList:
+    index: Dict[str, int] = {}
+    src, dst = array("i"), array("i")
+    with _open_text(path) as f:
+        for line in f:
+            if not line.strip() or line[0] in "#%":
+                continue
+            parts = line.replace(",", " ").split()
+            if len(parts) < 2:
+                continue
+            src.append(index.setdefault(parts[0], len(index)))
+            dst.append(index.setdefault(parts[1], len(index)))
+
+    raw = list(index)
+    try:
+        labels = np.array([int(x) for x in raw], dtype=np.int64)
+    except ValueError:
+        labels = np.array(raw, dtype=str)
+    return _edge_list(_base_name(path), labels, src, dst, path)
+
+
+def _edge_list(name: str, labels: np.ndarray, src: array, dst: array, path: str) -> EdgeList:
+    s = np.frombuffer(src, dtype=np.int32) if len(src) else np.zeros(0, dtype=np.int32)
+    d = np.frombuffer(dst, dtype=np.int32) if len(dst) else np.zeros(0, dtype=np.int32)
+    n = labels.size
+    if s.size and (min(int(s.min()), int(d.min())) < 0 or max(int(s.max()), int(d.max())) >= n):
+        raise ValueError(f"{path}: sommet hors de 1..{n}")
+    return EdgeList(name, labels, s.copy(), d.copy())
+
+# --------------------------------------------------------------------
+# Cache binaire (.npz): relire une grande instance ne demande qu'un np.load
+# Le cache est invalidé si le fichier source a changé (taille ou date).
+# --------------------------------------------------------------------
+def _cache_path(path: str, cache_dir: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:10]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{digest}.npz")
+
+
+def _source_stamp(path: str) -> np.ndarray:
+    st = os.stat(path)
+    return np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+
+def _load_cached(cache: str, stamp: np.ndarray) -> Optional[EdgeList]:
+    try:
+        with np.load(cache, allow_pickle=False) as data:
+            if not np.array_equal(data["stamp"], stamp):
+                return None
+            return EdgeList(str(data["name"]), data["labels"], data["src"], data["dst"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_cached(cache: str, edges: EdgeList, stamp: np.ndarray) -> None:
+    # Fichier temporaire propre à chaque écrivain (processus du benchmark lisant le même
+    # fichier en même temps), puis renommage atomique. Cache non écrit: pas une erreur.
+    tmp = None
+    try:
+        folder = os.path.dirname(cache) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=os.path.basename(cache) + ".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, name=np.array(edges.name), labels=edges.labels, src=edges.src, dst=edges.dst, stamp=stamp)
+        os.replace(tmp, cache)
+    except OSError:
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+
+# --------------------------------------------------------------------
+# Point d'entrée: format choisi d'après l'extension (.col, .col.b, liste d'arêtes, + .gz)
+# --------------------------------------------------------------------
+def is_graph_file(path: str) -> bool:
+    name = path[:-3] if path.endswith(".gz") else path
+    return name.endswith(DIMACS_BINARY_SUFFIXES + DIMACS_SUFFIXES + EDGE_LIST_SUFFIXES)
+
+
+def read_graph_file(path: str) -> EdgeList:
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(DIMACS_BINARY_SUFFIXES):
+        return read_dimacs_binary(path)
+    if name.endswith(DIMACS_SUFFIXES):
+        return read_dimacs(path)
+    if name.endswith(EDGE_LIST_SUFFIXES):
+        return read_edge_list(path)
+    raise ValueError(f"Format de graphe inconnu: {path} (.col, .col.b, .edges, .edgelist, .el, .txt, + .gz)")
+
+
+def load_graph_file(path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> EdgeList:
+    # cache_dir=None: pas de cache
+    if cache_dir is None:
+        return read_graph_file(path)
+    stamp = _source_stamp(path)
+    cache = _cache_path(path, cache_dir)
+    edges = _load_cached(cache, stamp)
+    if edges is None:
+        edges = read_graph_file(path)
+        _save_cached(cache, edges, stamp)
+    return edges
+
+
+def list_graph_files(folder: str) -> List[str]:
+    # Fichiers de graphes d'un dossier (une "famille" du benchmark), triés par nom
+    return sorted(
+        os.path.join(folder, f) for f in os.listdir(folder)
+        if os.path.isfile(os.path.join(folder, f)) and is_graph_file(f)
+    )
+
+
+def load_graph_networkx(path: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Tuple[str, nx.Graph]:
+    edges = load_graph_file(path, cache_dir)
+    return edges.name, edges.to_networkx()
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+from graph_csr import CSRGraph, as_csr, colors_used_array, dsatur_csr, greedy_clique_csr, greedy_csr
+from local_search import LocalSearchResult, tabucol
+
+Node = Hashable
+
+# --------------------------------------------------------------------
+# Résultat de l'algorithme évolutionnaire hybride pour un k donné
+# -colors: meilleure coloration (indices CSR), -cost: arêtes en conflit
+# -generations: nb de générations, -iterations: itérations tabou cumulées
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class HEAResult:
+    k: int
+    colors: np.ndarray
+    cost: int
+    generations: int
+    iterations: int
+    time_s: float
+
+    @property
+    def solved(self) -> bool:
+        return self.cost == 0
+
+# --------------------------------------------------------------------
+# Croisement GPX (Greedy Partition Crossover, Galinier & Hao):
+# l'enfant reçoit tour à tour, de chaque parent, sa plus grande classe de
+# couleur (restreinte aux sommets pas encore placés); les sommets restants
+# reçoivent une couleur aléatoire, réparée ensuite par la recherche tabou.
+# --------------------------------------------------------------------
+def gpx(p1: np.ndarray, p2: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    child = np.full(p1.size, -1, dtype=np.int64)
+    free = np.ones(p1.size, dtype=bool)
+    parents = (p1, p2) if rng.integers(0, 2) == 0 else (p2, p1)
+    for c in range(k):
+        rem = np.flatnonzero(free)
+        if rem.size == 0:
+            break
+        par = parents[c % 2][rem]
+        counts = np.bincount(par[par >= 0], minlength=k)
+        ties = np.flatnonzero(counts == counts.max())
+        take = rem[par == int(ties[rng.integers(0, ties.size)])]
+        child[take] = c
+        free[take] = False
+    rest = np.flatnonzero(free)
+    child[rest] = rng.integers(0, k, rest.size)
+    return child
+
+# --------------------------------------------------------------------
+# Évaluation de la population: chaque individu est amélioré par TabuCol.
+# jobs > 1: dans un pool de processus, le CSR étant transmis une seule
+# fois à chaque processus (initializer).
+# --------------------------------------------------------------------
+_WORKER_CSR: Optional[CSRGraph] = None
+
+# (coloration de départ, k, itérations max, temps max, graine)
+_Job = Tuple[np.ndarray, int, int, float, int]
+
+
+def _init_worker(csr: CSRGraph) -> None:
+    global _WORKER_CSR
+    _WORKER_CSR = csr
+
+
+def _improve_worker(job: _Job) -> LocalSearchResult:
+    init, k, max_iters, time_limit_s, seed = job
+    return tabucol(_WORKER_CSR, k, init=init, max_iters=max_iters, time_limit_s=time_limit_s, seed=seed)
+
+
+@contextmanager
+def _evaluator(csr: CSRGraph, jobs: int) -> Iterator[Callable[[Sequence[_Job]], List[LocalSearchResult]]]:
+    if jobs <= 1:
+        yield lambda batch: [
+            tabucol(csr, k, init=init, max_iters=it, time_limit_s=tl, seed=s) for init, k, it, tl, s in batch
+        ]
+        return
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(csr,))
+    try:
+        yield lambda batch: list(pool.map(_improve_worker, batch))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _hea_k(
+    csr: CSRGraph,
+    k: int,
+    evaluate: Callable[[Sequence[_Job]], List[LocalSearchResult]],
+    time_limit_s: float,
+    pop_size: int,
+    ls_iters: int,
+    batch: int,
+    rng: np.random.Generator,
+    init: Sequence[np.ndarray] = (),
+) -> HEAResult:
+    t0 = time.perf_counter()
+    deadline = t0 + float(time_limit_s)
+
+    def jobs_for(starts: Sequence[np.ndarray]) -> List[_Job]:
+        # `batch` recherches en parallèle: le temps restant est partagé entre les vagues successives
+        waves = -(-len(starts) // batch)
+        remaining = max(0.0, deadline - time.perf_counter()) / waves
+        return [(s, k, ls_iters, remaining, int(rng.integers(0, 2**31))) for s in starts]
+
+    # Population initiale: colorations de départ (ex. solution à k+1) + gloutons en ordre aléatoire
+    starts = list(init)[:pop_size]
+    while len(starts) < pop_size:
+        starts.append(greedy_csr(csr, rng.permutation(csr.n).tolist()))
+    pop = evaluate(jobs_for(starts))
+    iterations = sum(r.iterations for r in pop)
+    best = min(pop, key=lambda r: r.cost)
+
+    generations = 0
+    while not best.solved and time.perf_counter() < deadline:
+        generations += 1
+        children = []
+        for _ in range(batch):
+            i, j = rng.choice(len(pop), size=2, replace=False)
+            children.append(gpx(pop[i].colors, pop[j].colors, k, rng))
+        for child in evaluate(jobs_for(children)):
+            iterations += child.iterations
+            if child.cost < best.cost:
+                best = child
+            # Remplacement du plus mauvais individu, sans doublon (diversité)
+            worst = max(range(len(pop)), key=lambda i: pop[i].cost)
+            if child.cost <= pop[worst].cost and not any(np.array_equal(child.colors, p.colors) for p in pop):
+                pop[worst] = child
+
+    return HEAResult(k, best.colors, best.cost, generations, iterations, time.perf_counter() - t0)
+
+# --------------------------------------------------------------------
+# Minimisation du nombre de couleurs par HEA (même schéma que
+# local_search_min_csr): k = DSATUR-1, k-1..., chaque population contenant
+# la solution précédente. on_improvement(k, colors, temps_s) est appelé à
+# chaque nouvelle meilleure coloration (DSATUR compris).
+# --------------------------------------------------------------------
+def hea_min_csr(
+    csr: CSRGraph,
+    time_limit_s: float = 10.0,
+    pop_size: int = 10,
+    ls_iters: int = 2000,
+    jobs: int = 1,
+    seed: int = 0,
+    on_improvement: Optional[Callable[[int, np.ndarray, float], None]] = None,
+) -> Tuple[int, np.ndarray, List[Tuple[int, HEAResult]]]:
+    if csr.n == 0:
+        return 0, np.zeros(0, dtype=np.int64), []
+    t0 = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    best_colors = dsatur_csr(csr)
+    best_k = colors_used_array(best_colors)
+    k_min = max(1, len(greedy_clique_csr(csr)))
+    if on_improvement is not None:
+        on_improvement(best_k, best_colors, time.perf_counter() - t0)
+
+    log: List[Tuple[int, HEAResult]] = []
+    with _evaluator(csr, jobs) as evaluate:
+        k = best_k - 1
+        while k >= k_min:
+            remaining = time_limit_s - (time.perf_counter() - t0)
+            if remaining <= 0:
+                break
+            res = _hea_k(csr, k, evaluate, remaining, pop_size, ls_iters, max(1, jobs), rng, init=[best_colors])
+            log.append((k, res))
+            if not res.solved:
+                break
+            best_k, best_colors = k, res.colors
+            if on_improvement is not None:
+                on_improvement(best_k, best_colors, time.perf_counter() - t0)
+            k -= 1
+    return best_k, best_colors, log
+
+
+def hea_min_coloring(
+    G: nx.Graph,
+    time_limit_s: float = 10.0,
+    pop_size: int = 10,
+    ls_iters: int = 2000,
+    jobs: int = 1,
+    seed: int = 0,
+    on_improvement: Optional[Callable[[int, Dict[Node, int], float], None]] = None,
+    csr: Optional[CSRGraph] = None,
+) -> Tuple[int, Dict[Node, int], List[Tuple[int, HEAResult]]]:
+    csr = as_csr(G, csr)
+    callback = None
+    if on_improvement is not None:
+        callback = lambda k, colors, t: on_improvement(k, csr.to_dict(colors), t)
+    best_k, colors, log = hea_min_csr(csr, time_limit_s, pop_size, ls_iters, jobs, seed, callback)
+    return best_k, csr.to_dict(colors), log
+
+# --------------------------------------------------------------------
+# k-coloration par HEA (None si aucune k-coloration valide dans le budget)
+# --------------------------------------------------------------------
+def hea_k_coloring(
+    G: nx.Graph,
+    k: int,
+    time_limit_s: float = 10.0,
+    pop_size: int = 10,
+    ls_iters: int = 2000,
+    jobs: int = 1,
+    seed: int = 0,
+    csr: Optional[CSRGraph] = None,
+) -> Tuple[Optional[Dict[Node, int]], HEAResult]:
+    csr = as_csr(G, csr)
+    rng = np.random.default_rng(seed)
+    with _evaluator(csr, jobs) as evaluate:
+        res = _hea_k(csr, k, evaluate, time_limit_s, pop_size, ls_iters, max(1, jobs), rng, init=[dsatur_csr(csr)])
+    return (csr.to_dict(res.colors) if res.solved else None), res
@@ -3,30 +3,42 @@ from __future__ import annotations
 from typing import Dict, Hashable, Optional, List
 import networkx as nx
 
+from graph_csr import CSRGraph, as_csr, dsatur_csr, greedy_csr
+
 Node = Hashable
 
 
-def greedy_coloring(G: nx.Graph, order: Optional[List[Node]] = None) -> Dict[Node, int]:
+def greedy_coloring(G: nx.Graph, order: Optional[List[Node]] = None, csr: Optional[CSRGraph] = None) -> Dict[Node, int]:
     """
     Coloriage glouton: assigne au sommet la plus petite couleur disponible.
+    Calculé sur la représentation CSR du graphe (graph_csr.py): `csr` si elle est
+    déjà construite (ex. Instance.csr), sinon construite ici.
     """
-    if order is None:
-        order = list(G.nodes())
-
-    coloring: Dict[Node, int] = {}
-    for v in order:
-        used = {coloring[u] for u in G.neighbors(v) if u in coloring}
-        c = 0
-        while c in used:
-            c += 1
-        coloring[v] = c
-    return coloring
+    csr = as_csr(G, csr)
+    idx = None if order is None else [csr.index[v] for v in order]
+    return csr.to_dict(greedy_csr(csr, idx))
 
 
-def dsatur_coloring(G: nx.Graph) -> Dict[Node, int]:
+def dsatur_coloring(G: nx.Graph, csr: Optional[CSRGraph] = None) -> Dict[Node, int]:
     """
     DSATUR: à chaque étape choisit le sommet au plus grand degré de saturation,
     puis tie-break avec le degré.
+
+    Version en O((n + m) log n), sur la représentation CSR (graph_csr.dsatur_csr):
+    - file de priorité (tas) sur (-saturation, -degré), avec invalidation paresseuse:
+      quand la saturation d'un sommet augmente, on empile une nouvelle entrée et
+      l'ancienne est ignorée au moment où elle sort du tas;
+    - couleurs interdites de chaque sommet dans un bitmask (entier Python):
+      saturation = nombre de bits à 1, plus petite couleur libre = plus bas bit à 0.
+    """
+    csr = as_csr(G, csr)
+    return csr.to_dict(dsatur_csr(csr))
+
+
+def dsatur_coloring_naive(G: nx.Graph) -> Dict[Node, int]:
+    """
+    DSATUR, version d'origine en O(n²): le sommet suivant est cherché par un max()
+    sur tous les sommets non coloriés. Conservée comme référence pour le benchmark.
     """
     nodes = list(G.nodes())
     if not nodes:
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from typing import Dict, Hashable, Optional, Tuple
 
 import networkx as nx
 
+from graph_csr import CSRGraph, from_networkx
+from graph_io import is_graph_file, load_graph_networkx
+
 Node = Hashable
 
 # --------------------------------------------------------------------
@@ -12,12 +16,19 @@ Node = Hashable
 # -name: nom de l’instance (utilisé pour l’affichage et les exports)
 # -graph: graphe NetworkX
 # -pos: positions des nœuds (optionnelles, pour la visualisation)
+# -csr: représentation CSR (graph_csr.py), construite une seule fois au
+#  chargement et transmise explicitement aux heuristiques / validations
+#  (le graphe d'une instance ne doit donc plus être modifié)
 # --------------------------------------------------------------------
 @dataclass(frozen=True)
 class Instance:
     name: str
     graph: nx.Graph
     pos: Optional[Dict[Node, Tuple[float, float]]] = None
+    csr: CSRGraph = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "csr", from_networkx(self.graph))
 
 # --------------------------------------------------------------------
 # Normalise le nom d’une instance pour le rendre robuste aux erreurs
@@ -116,6 +127,15 @@ def map_like() -> Instance:
     }
     return Instance("map_like", G, pos)
 
+# --------------------------------------------------------------------
+# Instance lue depuis un fichier (DIMACS .col / .col.b, liste d'arêtes, + .gz)
+# -pas de positions: la visualisation calcule un spring_layout si besoin
+# -lecture via le cache .npz de graph_io (instantanée au 2e chargement)
+# --------------------------------------------------------------------
+def from_file(path: str) -> Instance:
+    name, G = load_graph_networkx(path)
+    return Instance(name, G, None)
+
 # --------------------------------------------------------------------
 # Fonction centrale de chargement des instances
 # Sélectionne la bonne instance en fonction du nom fourni
@@ -128,6 +148,10 @@ def load_instance(
     w: int = 4,
     h: int = 4,
 ) -> Instance:
+    # Chemin vers un fichier de graphe (avant normalisation: les "." comptent)
+    if os.path.isfile(name) or is_graph_file(name):
+        return from_file(name)
+
     key = _norm_name(name)  # Normalisation du nom pour éviter les erreurs utilisateur
 
     if key == "triangle":
@@ -141,4 +165,4 @@ def load_instance(
     if key in ("map", "map_like"):
         return map_like()
     # Erreur claire si l’instance n’est pas reconnue
-    raise ValueError(f"Instance inconnue: {name} (triangle/cycle/grid/erdos/map_like)")
+    raise ValueError(f"Instance inconnue: {name} (triangle/cycle/grid/erdos/map_like ou fichier .col/.col.b/.edges)")
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from graph_csr import CSRGraph, as_csr, colors_used_array, dsatur_csr, greedy_clique_csr
+
+Node = Hashable
+
+LS_METHODS = ("tabucol", "partialcol")
+
+# --------------------------------------------------------------------
+# Résultat d'une recherche locale pour un k donné
+# -colors: couleur de chaque sommet (indices CSR); -1 = non colorié (PartialCol)
+# -cost: arêtes en conflit (TabuCol) ou sommets non coloriés (PartialCol)
+# -solved: cost == 0, i.e. k-coloration valide trouvée
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class LocalSearchResult:
+    method: str
+    k: int
+    colors: np.ndarray
+    cost: int
+    iterations: int
+    time_s: float
+
+    @property
+    def solved(self) -> bool:
+        return self.cost == 0
+
+# --------------------------------------------------------------------
+# Matrice des conflits gamma (n x k): gamma[v, c] = nb de voisins de v
+# coloriés en c. Mise à jour en O(deg(v)) quand v change de couleur.
+# --------------------------------------------------------------------
+def conflict_matrix(csr: CSRGraph, colors: np.ndarray, k: int) -> np.ndarray:
+    gamma = np.zeros((csr.n, k), dtype=np.int64)
+    src, dst = csr.src, csr.dst
+    cs, cd = colors[src], colors[dst]
+    ok = cd >= 0
+    np.add.at(gamma, (src[ok], cd[ok]), 1)
+    ok = cs >= 0
+    np.add.at(gamma, (dst[ok], cs[ok]), 1)
+    return gamma
+
+
+def initial_colors(csr: CSRGraph, k: int, init: Optional[np.ndarray] = None, complete: bool = True) -> np.ndarray:
+    """
+    Point de départ: DSATUR (ou `init`), les sommets de couleur >= k étant décoloriés.
+    complete=True (TabuCol): chacun reçoit ensuite la couleur la moins conflictuelle.
+    """
+    colors = (dsatur_csr(csr) if init is None else np.asarray(init, dtype=np.int64)).copy()
+    over = np.flatnonzero((colors >= k) | (colors < 0))
+    colors[over] = -1
+    if complete and over.size:
+        gamma = conflict_matrix(csr, colors, k)
+        for v in over.tolist():
+            c = int(gamma[v].argmin())
+            colors[v] = c
+            gamma[csr.neighbors(v), c] += 1
+    return colors
+
+
+def _tenure(rng: np.random.Generator, size: int, alpha: float, a: int) -> int:
+    # Durée tabou classique: a aléatoire + alpha x taille du problème courant
+    return int(rng.integers(0, a)) + int(alpha * size)
+
+# --------------------------------------------------------------------
+# TabuCol (Hertz & de Werra): coloration complète à k couleurs, on minimise
+# le nombre d'arêtes en conflit. Mouvement = changer la couleur d'un sommet
+# en conflit; le retour à l'ancienne couleur est tabou pendant quelques itérations
+# (sauf s'il améliore la meilleure solution: critère d'aspiration).
+# --------------------------------------------------------------------
+def tabucol(
+    csr: CSRGraph,
+    k: int,
+    init: Optional[np.ndarray] = None,
+    max_iters: int = 100_000,
+    time_limit_s: float = 5.0,
+    seed: int = 0,
+    alpha: float = 0.6,
+    a: int = 10,
+) -> LocalSearchResult:
+    t0 = time.perf_counter()
+    deadline = t0 + float(time_limit_s)
+    n = csr.n
+    rng = np.random.default_rng(seed)
+    colors = initial_colors(csr, k, init, complete=True)
+    if n == 0:
+        return LocalSearchResult("tabucol", k, colors, 0, 0, 0.0)
+
+    gamma = conflict_matrix(csr, colors, k)
+    tabu = np.zeros((n, k), dtype=np.int64)
+    idx = np.arange(n)
+    cost = int(gamma[idx, colors].sum()) // 2
+    best_cost, best = cost, colors.copy()
+    big = np.iinfo(np.int64).max // 4
+
+    it = 0
+    while it < max_iters and best_cost > 0:
+        if it & 255 == 0 and time.perf_counter() > deadline:
+            break
+        it += 1
+        conf = np.flatnonzero(gamma[idx, colors] > 0)
+        rows = np.arange(conf.size)
+        g = gamma[conf]
+        delta = g - g[rows, colors[conf]][:, None]
+        delta[rows, colors[conf]] = big  # rester sur place n'est pas un mouvement
+        allowed = (tabu[conf] <= it) | (cost + delta < best_cost)
+        delta = np.where(allowed, delta, big)
+        best_delta = int(delta.min())
+        if best_delta >= big:
+            # tout est tabou: mouvement aléatoire
+            i = int(rng.integers(0, conf.size))
+            v = int(conf[i])
+            c = int((colors[v] + 1 + rng.integers(0, k - 1)) % k) if k > 1 else 0
+            best_delta = int(gamma[v, c] - gamma[v, colors[v]])
+        else:
+            ties = np.flatnonzero(delta.ravel() == best_delta)
+            pick = int(ties[rng.integers(0, ties.size)])
+            v, c = int(conf[pick // k]), pick % k
+
+        old = int(colors[v])
+        if c == old:
+            continue
+        nb = csr.neighbors(v)
+        gamma[nb, old] -= 1
+        gamma[nb, c] += 1
+        colors[v] = c
+        cost += best_delta
+        tabu[v, old] = it + _tenure(rng, conf.size, alpha, a)
+        if cost < best_cost:
+            best_cost = cost
+            best = colors.copy()
+
+    return LocalSearchResult("tabucol", k, best, best_cost, it, time.perf_counter() - t0)
+
+# --------------------------------------------------------------------
+# PartialCol (Blöchliger & Zufferey): coloration PARTIELLE toujours valide,
+# on minimise le nombre de sommets non coloriés. Mouvement = colorier un sommet
+# u non colorié en c, en décoloriant ses voisins de couleur c (coût gamma[u, c] - 1);
+# leur retour en c est tabou.
+# --------------------------------------------------------------------
+def partialcol(
+    csr: CSRGraph,
+    k: int,
+    init: Optional[np.ndarray] = None,
+    max_iters: int = 100_000,
+    time_limit_s: float = 5.0,
+    seed: int = 0,
+    alpha: float = 0.6,
+    a: int = 10,
+) -> LocalSearchResult:
+    t0 = time.perf_counter()
+    deadline = t0 + float(time_limit_s)
+    n = csr.n
+    rng = np.random.default_rng(seed)
+    colors = initial_colors(csr, k, init, complete=False)
+    if n == 0:
+        return LocalSearchResult("partialcol", k, colors, 0, 0, 0.0)
+
+    gamma = conflict_matrix(csr, colors, k)
+    tabu = np.zeros((n, k), dtype=np.int64)
+    cost = int(np.count_nonzero(colors < 0))
+    best_cost, best = cost, colors.copy()
+    big = np.iinfo(np.int64).max // 4
+
+    it = 0
+    while it < max_iters and best_cost > 0:
+        if it & 255 == 0 and time.perf_counter() > deadline:
+            break
+        it += 1
+        uncolored = np.flatnonzero(colors < 0)
+        delta = gamma[uncolored] - 1
+        allowed = (tabu[uncolored] <= it) | (cost + delta < best_cost)
+        delta = np.where(allowed, delta, big)
+        best_delta = int(delta.min())
+        if best_delta >= big:
+            u = int(uncolored[rng.integers(0, uncolored.size)])
+            c = int(rng.integers(0, k))
+        else:
+            ties = np.flatnonzero(delta.ravel() == best_delta)
+            pick = int(ties[rng.integers(0, ties.size)])
+            u, c = int(uncolored[pick // k]), pick % k
+
+        nb = csr.neighbors(u)
+        clash = nb[colors[nb] == c]
+        tenure = _tenure(rng, uncolored.size, alpha, a)
+        for w in clash.tolist():
+            colors[w] = -1
+            gamma[csr.neighbors(w), c] -= 1
+            tabu[w, c] = it + tenure
+        colors[u] = c
+        gamma[nb, c] += 1
+        cost += int(clash.size) - 1
+        if cost < best_cost:
+            best_cost = cost
+            best = colors.copy()
+
+    return LocalSearchResult("partialcol", k, best, best_cost, it, time.perf_counter() - t0)
+
+
+def run_local_search(method: str, csr: CSRGraph, k: int, **kwargs) -> LocalSearchResult:
+    if method == "tabucol":
+        return tabucol(csr, k, **kwargs)
+    if method == "partialcol":
+        return partialcol(csr, k, **kwargs)
+    raise ValueError(f"Recherche locale inconnue: {method} ({'/'.join(LS_METHODS)})")
+
+# --------------------------------------------------------------------
+# Minimisation du nombre de couleurs par recherche locale:
+# k = (couleurs DSATUR) - 1, puis k-1... tant qu'une k-coloration est trouvée.
+# Chaque k repart de la meilleure solution précédente (couleur k retirée).
+# Même forme de retour que solve_min_coloring: (k, coloration, log) — mais
+# k n'est PAS prouvé optimal (arrêt à la clique gloutonne ou au premier échec).
+# --------------------------------------------------------------------
+def local_search_min_csr(
+    csr: CSRGraph,
+    method: str = "tabucol",
+    time_limit_s: float = 10.0,
+    max_iters_per_k: int = 200_000,
+    seed: int = 0,
+) -> Tuple[int, np.ndarray, List[Tuple[int, LocalSearchResult]]]:
+    if csr.n == 0:
+        return 0, np.zeros(0, dtype=np.int64), []
+    t0 = time.perf_counter()
+    best_colors = dsatur_csr(csr)
+    best_k = colors_used_array(best_colors)
+    k_min = max(1, len(greedy_clique_csr(csr)))
+
+    log: List[Tuple[int, LocalSearchResult]] = []
+    k = best_k - 1
+    while k >= k_min:
+        remaining = time_limit_s - (time.perf_counter() - t0)
+        if remaining <= 0:
+            break
+        res = run_local_search(method, csr, k, init=best_colors, max_iters=max_iters_per_k,
+                               time_limit_s=remaining, seed=seed + k)
+        log.append((k, res))
+        if not res.solved:
+            break
+        best_k, best_colors = k, res.colors
+        k -= 1
+    return best_k, best_colors, log
+
+
+def local_search_min_coloring(
+    G: nx.Graph,
+    method: str = "tabucol",
+    time_limit_s: float = 10.0,
+    max_iters_per_k: int = 200_000,
+    seed: int = 0,
+    csr: Optional[CSRGraph] = None,
+) -> Tuple[Optional[int], Optional[Dict[Node, int]], List[Tuple[int, LocalSearchResult]]]:
+    csr = as_csr(G, csr)
+    best_k, colors, log = local_search_min_csr(csr, method, time_limit_s, max_iters_per_k, seed)
+    return best_k, csr.to_dict(colors), log
+
+# --------------------------------------------------------------------
+# k-coloration par recherche locale sur un graphe NetworkX
+# (None si aucune k-coloration valide trouvée dans les limites)
+# --------------------------------------------------------------------
+def local_search_k_coloring(
+    G: nx.Graph,
+    k: int,
+    method: str = "tabucol",
+    time_limit_s: float = 5.0,
+    max_iters: int = 200_000,
+    seed: int = 0,
+    csr: Optional[CSRGraph] = None,
+) -> Tuple[Optional[Dict[Node, int]], LocalSearchResult]:
+    csr = as_csr(G, csr)
+    res = run_local_search(method, csr, k, max_iters=max_iters, time_limit_s=time_limit_s, seed=seed)
+    return (csr.to_dict(res.colors) if res.solved else None), res
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+from graph_csr import CSRGraph, as_csr, greedy_clique_csr
+
+Node = Hashable
+
+LB_METHODS = ("greedy", "bnb", "spectral")
+
+# --------------------------------------------------------------------
+# Borne inférieure sur le nombre chromatique, calculée en temps borné
+# -value: meilleure borne trouvée
+# -method: technique qui l'a donnée (greedy / bnb / spectral)
+# -clique: plus grande clique trouvée (réutilisable pour fixer les couleurs)
+# -exact: True si le branch-and-bound a terminé (clique maximum prouvée)
+# -details: {technique: {"value", "time_s", ...}}
+# --------------------------------------------------------------------
+@dataclass(frozen=True)
+class LowerBound:
+    value: int
+    method: str
+    time_s: float
+    clique: List[Node] = field(default_factory=list)
+    exact: bool = False
+    details: Dict[str, dict] = field(default_factory=dict)
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+# --------------------------------------------------------------------
+# Ordre de dégénérescence (algorithme de Batagelj-Zaversnik, O(n + m)):
+# les sommets sont rangés par degré résiduel dans des "paniers", et on retire
+# à chaque étape un sommet de degré résiduel minimal.
+# Retourne (ordre de retrait, core) où core[v] = nombre de cœur de v.
+# deadline (perf_counter): _BudgetExceeded si elle est dépassée en cours de calcul;
+# lists: csr.flat_lists() si l'appelant les a déjà.
+# --------------------------------------------------------------------
+def degeneracy_order(
+    csr: CSRGraph,
+    deadline: Optional[float] = None,
+    lists: Optional[Tuple[List[int], List[int]]] = None,
+) -> Tuple[List[int], List[int]]:
+    n = csr.n
+    flat, bounds = lists if lists is not None else csr.flat_lists()
+    deg = csr.degrees().tolist()
+    max_deg = max(deg, default=0)
+
+    # bin[d] = début du panier des sommets de degré d dans `vert`
+    bin_start = [0] * (max_deg + 1)
+    for d in deg:
+        bin_start[d] += 1
+    start = 0
+    for d in range(max_deg + 1):
+        bin_start[d], start = start, start + bin_start[d]
+    pos = [0] * n
+    vert = [0] * n
+    fill = list(bin_start)
+    for v, d in enumerate(deg):
+        pos[v] = fill[d]
+        vert[pos[v]] = v
+        fill[d] += 1
+
+    for i in range(n):
+        if deadline is not None and i & 255 == 0 and time.perf_counter() > deadline:
+            raise _BudgetExceeded
+        v = vert[i]
+        dv = deg[v]
+        for u in flat[bounds[v]:bounds[v + 1]]:
+            du = deg[u]
+            if du > dv:
+                # u passe dans le panier inférieur (échange avec le premier sommet de son panier)
+                pu, pw = pos[u], bin_start[du]
+                w = vert[pw]
+                if u != w:
+                    pos[u], pos[w] = pw, pu
+                    vert[pu], vert[pw] = w, u
+                bin_start[du] += 1
+                deg[u] = du - 1
+    return vert, deg
+
+
+# --------------------------------------------------------------------
+# Clique maximum par branch-and-bound (borne par coloration gloutonne,
+# ensembles de candidats en bitsets = entiers Python)
+# Pour chaque sommet v, dans l'ordre de dégénérescence, on cherche les
+# cliques contenant v parmi ses voisins SUIVANTS (au plus d sommets, d =
+# dégénérescence): chaque sous-problème est petit et indexé localement.
+# --------------------------------------------------------------------
+def _color_sort(P: int, adj: List[int]) -> Tuple[List[int], List[int]]:
+    # Coloration gloutonne des candidats: (sommets, couleur de chaque sommet) par couleur croissante
+    order: List[int] = []
+    colors: List[int] = []
+    color = 0
+    while P:
+        color += 1
+        Q = P
+        while Q:
+            low = Q & -Q
+            v = low.bit_length() - 1
+            Q &= ~adj[v] & ~low
+            P &= ~low
+            order.append(v)
+            colors.append(color)
+    return order, colors
+
+
+def max_clique_bnb(
+    csr: CSRGraph,
+    time_budget_s: float = 1.0,
+    initial: Optional[Sequence[int]] = None,
+) -> Tuple[List[int], bool]:
+    """
+    Plus grande clique trouvée dans le budget (indices), et True si elle est prouvée maximum.
+    `initial`: clique de départ (ex. gloutonne), qui élague dès le début.
+    """
+    deadline = time.perf_counter() + float(time_budget_s)
+    best: List[int] = list(initial) if initial else []
+    if csr.n == 0:
+        return best, True
+    if time_budget_s <= 0:
+        return best, False
+
+    flat, bounds = csr.flat_lists()
+    try:
+        order, core = degeneracy_order(csr, deadline, (flat, bounds))
+    except _BudgetExceeded:
+        return best, False
+    position = [0] * csr.n
+    for p, v in enumerate(order):
+        position[v] = p
+
+    nodes_seen = 0
+
+    def expand(R: List[int], P: int, adj: List[int], local: List[int]) -> None:
+        nonlocal best, nodes_seen
+        nodes_seen += 1
+        if nodes_seen & 1023 == 0 and time.perf_counter() > deadline:
+            raise _BudgetExceeded
+        vs, colors = _color_sort(P, adj)
+        for i in range(len(vs) - 1, -1, -1):
+            if len(R) + colors[i] <= len(best):
+                return
+            v = vs[i]
+            R.append(local[v])
+            newP = P & adj[v]
+            if newP:
+                expand(R, newP, adj, local)
+            elif len(R) > len(best):
+                best = list(R)
+            R.pop()
+            P &= ~(1 << v)
+
+    try:
+        # Du dernier retiré (cœur le plus dense) au premier: les grandes cliques sont trouvées tôt
+        for v in reversed(order):
+            if time.perf_counter() > deadline:
+                raise _BudgetExceeded
+            if core[v] + 1 <= len(best):
+                continue
+            later = [u for u in flat[bounds[v]:bounds[v + 1]] if position[u] > position[v]]
+            if len(later) + 1 <= len(best):
+                continue
+            loc = {u: i for i, u in enumerate(later)}
+            adj = [0] * len(later)
+            for i, u in enumerate(later):
+                if i & 63 == 0 and time.perf_counter() > deadline:
+                    raise _BudgetExceeded
+                bits = 0
+                for w in flat[bounds[u]:bounds[u + 1]]:
+                    j = loc.get(w)
+                    if j is not None:
+                        bits |= 1 << j
+                adj[i] = bits
+            if not later:
+                if not best:
+                    best = [v]
+                continue
+            expand([v], (1 << len(later)) - 1, adj, later)
+    except _BudgetExceeded:
+        return best, False
+    return best, True
+
+
+# --------------------------------------------------------------------
+# Borne spectrale de Hoffman: χ >= 1 + λmax / |λmin| (valeurs propres de
+# la matrice d'adjacence). Minorée par la borne de Lovász (θ du complémentaire),
+# mais calculable avec NumPy seul; O(n³) => réservée aux graphes moyens.
+# --------------------------------------------------------------------
+def hoffman_bound(csr: CSRGraph) -> int:
+    if csr.m == 0:
+        return 1 if csr.n else 0
+    A = np.zeros((csr.n, csr.n), dtype=np.float64)
+    A[csr.src, csr.dst] = 1.0
+    A[csr.dst, csr.src] = 1.0
+    eig = np.linalg.eigvalsh(A)
+    lmin, lmax = float(eig[0]), float(eig[-1])
+    if lmin >= -1e-9:
+        return 1
+    return int(np.ceil(1.0 + lmax / -lmin - 1e-9))
+
+
+# Durée estimée de la borne de Hoffman (eigvalsh en O(n³)), extrapolée depuis une
+# petite matrice mesurée une fois sur la machine
+_EIG_PROBE_N = 200
+_eig_probe_s: Optional[float] = None
+
+
+def hoffman_time_estimate(n: int) -> float:
+    global _eig_probe_s
+    if _eig_probe_s is None:
+        A = np.random.default_rng(0).random((_EIG_PROBE_N, _EIG_PROBE_N))
+        t0 = time.perf_counter()
+        np.linalg.eigvalsh(A + A.T)
+        _eig_probe_s = time.perf_counter() - t0
+    return _eig_probe_s * (n / _EIG_PROBE_N) ** 3
+
+
+# --------------------------------------------------------------------
+# Meilleure borne inférieure dans le budget:
+# greedy (toujours, c'est la borne plancher) -> Hoffman (si n <= spectral_max_n et si
+# sa durée estimée tient dans la moitié du reste) -> branch-and-bound (reste du budget)
+# --------------------------------------------------------------------
+def compute_lower_bound(
+    G: nx.Graph,
+    time_budget_s: float = 1.0,
+    methods: Sequence[str] = LB_METHODS,
+    spectral_max_n: int = 1500,
+    csr: Optional[CSRGraph] = None,
+) -> LowerBound:
+    t_start = time.perf_counter()
+    csr = as_csr(G, csr)
+    if csr.n == 0:
+        return LowerBound(0, "empty", 0.0, [], True, {})
+
+    details: Dict[str, dict] = {}
+    clique = greedy_clique_csr(csr)
+    details["greedy"] = {"value": len(clique), "time_s": time.perf_counter() - t_start}
+    best_value, best_method, exact = len(clique), "greedy", False
+    deadline = t_start + float(time_budget_s)
+
+    # Hoffman avant le branch-and-bound, qui sinon consomme tout le budget
+    if "spectral" in methods and csr.n <= spectral_max_n:
+        t0 = time.perf_counter()
+        if hoffman_time_estimate(csr.n) > (deadline - t0) / 2:
+            details["spectral"] = {"skipped": "budget"}
+        else:
+            hb = hoffman_bound(csr)
+            details["spectral"] = {"value": hb, "time_s": time.perf_counter() - t0}
+            if hb > best_value:
+                best_value, best_method = hb, "spectral"
+
+    if "bnb" in methods:
+        t0 = time.perf_counter()
+        remaining = deadline - t0
+        if remaining <= 0:
+            details["bnb"] = {"skipped": "budget"}
+        else:
+            bnb, exact = max_clique_bnb(csr, time_budget_s=remaining, initial=clique)
+            details["bnb"] = {"value": len(bnb), "time_s": time.perf_counter() - t0, "complete": exact}
+            if len(bnb) > best_value:
+                best_value, best_method = len(bnb), "bnb"
+            clique = bnb
+
+    return LowerBound(
+        value=max(1, best_value),
+        method=best_method,
+        time_s=time.perf_counter() - t_start,
+        clique=[csr.nodes[i] for i in clique],
+        exact=exact,
+        details=details,
+    )
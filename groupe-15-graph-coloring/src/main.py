@@ -7,8 +7,16 @@ from pathlib import Path
 from typing import Dict, Hashable, Optional, Callable, Tuple, Any
 import networkx as nx
 from instances import load_instance
-from heuristics import greedy_coloring, dsatur_coloring
-from solve_coloring import solve_k_coloring, solve_min_coloring
+from heuristics import greedy_coloring, dsatur_coloring, dsatur_coloring_naive
+from solve_coloring import (
+    CP_MIN_STRATEGIES, CP_SYMMETRY_MODES, solve_k_coloring, solve_min_coloring_strategy, symmetry_options,
+)
+from graph_csr import CSRGraph, as_csr, is_valid_coloring as csr_is_valid_coloring
+from lower_bounds import compute_lower_bound
+from local_search import LS_METHODS, local_search_k_coloring, local_search_min_coloring
+from hea import hea_k_coloring, hea_min_coloring
+from decomposition import DECOMPOSE_METHODS, DECOMPOSE_MODES, solve_decomposed
+from dynamic import simulate
 from viz import draw_plain, draw_coloring
 
 
@@ -50,13 +58,10 @@ def make_before_path(save_fig: Optional[str]) -> Optional[str]:
 # ==========================================================
 # Fonctions de mesure et de validation
 # ==========================================================
-def is_valid_coloring(G: nx.Graph, coloring: Optional[Dict[Node, int]]) -> bool:
+def is_valid_coloring(G: nx.Graph, coloring: Optional[Dict[Node, int]], csr: Optional[CSRGraph] = None) -> bool:
     # Vérifie que la coloration est complète et valide
-    if coloring is None:
-        return False
-    if len(coloring) != G.number_of_nodes():
-        return False
-    return all(coloring[u] != coloring[v] for u, v in G.edges())
+    # (comparaison vectorisée colors[src] != colors[dst] sur le CSR du graphe)
+    return csr_is_valid_coloring(G, coloring, csr)
 
 def colors_used(coloring: Dict[Node, int]) -> int:
     # Compte le nombre de couleurs distinctes utilisées
@@ -65,16 +70,11 @@ def colors_used(coloring: Dict[Node, int]) -> int:
 # ==========================================================
 # Bornes pour l’optimisation (cp_min)
 # ==========================================================
-def lower_bound_clique(G: nx.Graph) -> int:
-    # Borne inférieure basée sur la taille de la plus grande clique
-    try:
-        return max(1, int(nx.graph_clique_number(G)))
-    except Exception:
-        return 1
-
-def upper_bound_dsatur(G: nx.Graph) -> int:
+# Borne inférieure: lower_bounds.compute_lower_bound (clique gloutonne, branch-and-bound
+# en temps borné, borne spectrale), à la place de nx.graph_clique_number (exponentiel)
+def upper_bound_dsatur(G: nx.Graph, csr: Optional[CSRGraph] = None) -> int:
     # Borne supérieure obtenue via une heuristique DSATUR
-    return max(1, colors_used(dsatur_coloring(G)))
+    return max(1, colors_used(dsatur_coloring(G, csr=csr)))
 
 # ==========================================================
 # Fonctions d’interaction utilisateur
@@ -121,12 +121,17 @@ def interactive_config() -> dict:
     print("  - cp_k      : OR-Tools CP-SAT avec k fixé")
     print("  - cp_min    : OR-Tools CP-SAT (cherche le minimum k) + bornes (LB/UB)")
     print("  - greedy    : heuristique gloutonne")
-    print("  - dsatur    : heuristique DSATUR")
+    print("  - dsatur    : heuristique DSATUR (tas + bitmasks)")
+    print("  - dsatur_naive : DSATUR d'origine en O(n²) (référence)")
+    print("  - tabucol   : recherche locale TabuCol (minimise k depuis DSATUR, ou k fixé)")
+    print("  - partialcol: recherche locale PartialCol (colorations partielles valides)")
+    print("  - hea       : algorithme évolutionnaire hybride (croisement GPX + TabuCol)")
+    print("  - dynamic   : arêtes ajoutées / retirées, coloration réparée localement")
     print("  - compare   : compare greedy/dsatur/cp_min")
     print("  - benchmark : benchmark auto -> CSV")
     method = ask_str("Choisis une méthode", "cp_min").lower()
 
-    timeout = ask_float("timeout (secondes) [cp_* ou benchmark]", 3.0)
+    timeout = ask_float("timeout (secondes) [cp_*, tabucol/partialcol/hea ou benchmark]", 3.0)
 
     k = ask_int("k (nb max de couleurs)", 4) if method == "cp_k" else None
 
@@ -147,7 +152,8 @@ def interactive_config() -> dict:
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Graph/Map Coloring (interactive by default).")
     p.add_argument("--no-interactive", action="store_true")
-    p.add_argument("--instance", type=str, default=None)
+    p.add_argument("--instance", type=str, default=None,
+                   help="triangle/cycle/grid/erdos/map_like, ou chemin d'un fichier .col/.col.b/.edges (+ .gz)")
     p.add_argument("--n", type=int, default=25)
     p.add_argument("--p", type=float, default=0.2)
     p.add_argument("--seed", type=int, default=1)
@@ -155,9 +161,29 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--h", type=int, default=6)
 
     p.add_argument("--method", type=str, default=None,
-                   help="cp_k/cp_min/greedy/dsatur/compare/benchmark")
+                   help="cp_k/cp_min/greedy/dsatur/dsatur_naive/tabucol/partialcol/hea/dynamic/compare/benchmark")
     p.add_argument("--k", type=int, default=None)
     p.add_argument("--timeout", type=float, default=3.0)
+    p.add_argument("--cp-strategy", type=str, choices=CP_MIN_STRATEGIES, default="iterative",
+                   help="cp_min: un modèle par k (timeout par k) ou un seul modèle d'optimisation (timeout global)")
+    p.add_argument("--warm-start", type=str, choices=("greedy",) + LS_METHODS, default="greedy",
+                   help="cp_k: solution de départ (hint) gloutonne, ou recherche locale sur la moitié du timeout")
+    p.add_argument("--steps", type=int, default=200,
+                   help="dynamic: nb d'insertions / suppressions d'arêtes aléatoires")
+    p.add_argument("--decompose", type=str, choices=DECOMPOSE_MODES, default="off",
+                   help="résout séparément les composantes connexes (components) ou les blocs biconnexes (blocks)")
+    p.add_argument("--peel", action="store_true",
+                   help="avec --decompose: retire d'abord les sommets de degré < k (cp_k) ou < clique, coloriés en dernier")
+    p.add_argument("--lb-budget", type=float, default=1.0,
+                   help="cp_k/cp_min: budget (s) du calcul de la borne inférieure (clique, spectrale)")
+    p.add_argument("--cp-symmetry", type=str, choices=CP_SYMMETRY_MODES, default="clique",
+                   help="cp_k/cp_min: premier nœud fixé, clique fixée aux couleurs 0..q-1, ou clique + précédence des valeurs")
+    p.add_argument("--jobs", type=int, default=1,
+                   help="benchmark: nb de processus (les threads CP-SAT sont répartis entre eux); hea: processus de la population; --decompose: parties résolues en parallèle")
+    p.add_argument("--bench-dir", action="append", default=[],
+                   help="benchmark: dossier de fichiers .col/.col.b/.edges (+ .gz), une famille par dossier (répétable)")
+    p.add_argument("--fresh", action="store_true",
+                   help="benchmark: repart de zéro au lieu de reprendre les tâches déjà terminées")
     p.add_argument("--show", action="store_true")
     p.add_argument("--save-fig", type=str, default=None)
     p.add_argument("--save-json", type=str, default=None)
@@ -191,52 +217,202 @@ def print_result(G: nx.Graph, inst_name: str, method: str, used: int, valid: boo
     print(f"Method: {method}")
     if method == "cp_k":
         print(f"k={k} | status={info.get('status')} | colors_used={used} | valid={valid}")
+        print(f"LB={info.get('lb')} ({info.get('lb_method')}, {info.get('lb_time_s', 0.0):.3f}s) | clique={info.get('clique_size')}")
+    elif method == "dynamic":
+        print(f"steps={info.get('steps')} | repairs={info.get('repairs')} | colors_used={used} | valid={valid}")
+        print(f"latence moy={info.get('mean_latency_s', 0.0) * 1e3:.3f}ms max={info.get('max_latency_s', 0.0) * 1e3:.3f}ms")
+        for d in info.get("drift", []):
+            print(f"re-résolution {d['full_method']}: {d['colors_full']} couleurs en {d['full_time_s']:.3f}s | dérive={d['drift']}")
+    elif method == "hea":
+        print(f"k={info.get('k_found')} (non prouvé optimal) | generations={info.get('generations')} | jobs={info.get('jobs')} | colors_used={used} | valid={valid}")
+    elif method in LS_METHODS:
+        print(f"k={info.get('k_found')} (non prouvé optimal) | iterations={info.get('iterations')} | colors_used={used} | valid={valid}")
     elif method == "cp_min":
-        print(f"LB={info.get('lb_clique')} UB={info.get('ub_dsatur')} | k*={info.get('k_found')} | colors_used={used} | valid={valid}")
+        print(f"LB={info.get('lb')} ({info.get('lb_method')}, {info.get('lb_time_s', 0.0):.3f}s) UB={info.get('ub_dsatur')} | k*={info.get('k_found')} | colors_used={used} | valid={valid}")
+        print(f"strategy={info.get('strategy')} | status={info.get('status')} | time_s={info.get('time_s', 0.0):.3f}")
+        print(f"symmetry={info.get('symmetry')} (clique={info.get('clique_size')}) | conflicts={info.get('conflicts')} | branches={info.get('branches')}")
     else:
         print(f"colors_used={used} | valid={valid}")
+    dec = info.get("decomposition")
+    if dec:
+        print(f"decomposition={dec['mode']} | parts={dec['parts']} (max {dec['largest']} sommets) | peeled={dec['peeled']} | jobs={dec['jobs']}")
 
 # ==========================================================
 # Fonctions principales d’exécution
 # ==========================================================
-def run_method(G, pos, inst_name, method, timeout, k, show, save_fig, save_json_path):
+def run_method(G, pos, inst_name, method, timeout, k, show, save_fig, save_json_path, cp_strategy="iterative",
+               cp_symmetry="clique", lb_budget=1.0, warm_start="greedy", jobs=1, decompose="off", peel=False,
+               steps=200, csr=None):
     # Exécute une méthode de coloration donnée
+    # csr: CSR de G déjà construit (Instance.csr), partagé par toutes les étapes
+    csr = as_csr(G, csr)
     coloring = None
     info: dict = {}
     # Préparation des données pour les méthodes CP
     if method in ("cp_k", "cp_min"):
         nodes, edges = list(G.nodes()), list(G.edges())
+        # Borne inférieure en temps borné; sa clique est fixée aux couleurs 0..q-1
+        lower = compute_lower_bound(G, time_budget_s=lb_budget, csr=csr)
+        clique = lower.clique
+        sym = symmetry_options(cp_symmetry, nodes, clique)
+        lb_info = {
+            "lb": lower.value,
+            "lb_method": lower.method,
+            "lb_time_s": lower.time_s,
+            "lb_exact_clique": lower.exact,
+            "lb_details": lower.details,
+            "clique_size": len(clique),
+        }
+
+    if decompose != "off" and method in DECOMPOSE_METHODS:
+        # Parties résolues séparément (en parallèle si --jobs > 1), puis fusionnées
+        (k_found, coloring, dec, parts), dt = timed(lambda: solve_decomposed(
+            G, method, mode=decompose, peel=peel, k=k, timeout_s=timeout, jobs=jobs,
+            cp_strategy=cp_strategy, cp_symmetry=cp_symmetry, lb_budget=lb_budget, csr=csr,
+        ))
+        statuses = {r.status for r in parts}
+        info = {
+            "status": statuses.pop() if len(statuses) == 1 else ("FOUND" if coloring is not None else "NOT_FOUND"),
+            "time_s": dt,
+            "k_found": k_found,
+            "strategy": cp_strategy,
+            "symmetry": cp_symmetry,
+            **(lb_info if method in ("cp_k", "cp_min") else {}),
+            "decomposition": {
+                "mode": decompose, "threshold": dec.threshold, "parts": len(dec.parts),
+                "largest": dec.largest, "peeled": len(dec.peeled), "jobs": jobs,
+            },
+            "log": [{"n": r.n, "m": r.m, "k": r.k, "status": r.status, "time_s": r.time_s} for r in parts],
+        }
 
-    if method == "greedy":
-        coloring, dt = timed(lambda: greedy_coloring(G))
+    elif method == "greedy":
+        coloring, dt = timed(lambda: greedy_coloring(G, csr=csr))
         info = {"status": "OK", "time_s": dt}
 
     elif method == "dsatur":
-        coloring, dt = timed(lambda: dsatur_coloring(G))
+        coloring, dt = timed(lambda: dsatur_coloring(G, csr=csr))
+        info = {"status": "OK", "time_s": dt}
+
+    elif method == "dsatur_naive":
+        coloring, dt = timed(lambda: dsatur_coloring_naive(G))
         info = {"status": "OK", "time_s": dt}
 
     elif method == "cp_k":
         if k is None:
             raise ValueError("cp_k nécessite k.")
-        coloring, si = solve_k_coloring(nodes, edges, k=k, timeout_s=timeout)
-        info = {"status": si.status, "time_s": si.time_s, "conflicts": si.conflicts, "branches": si.branches}
+        # Hint par recherche locale (moitié du timeout), même si elle laisse des conflits
+        hint, ls_info = None, {}
+        if warm_start in LS_METHODS:
+            ls_col, res = local_search_k_coloring(G, k, method=warm_start, time_limit_s=timeout / 2, csr=csr)
+            hint = ls_col if ls_col is not None else csr.to_dict(res.colors)
+            ls_info = {"warm_start": warm_start, "ls_cost": res.cost, "ls_time_s": res.time_s}
+        coloring, si = solve_k_coloring(nodes, edges, k=k, timeout_s=timeout, hint=hint, **sym)
+        info = {
+            "status": si.status, "time_s": si.time_s, "conflicts": si.conflicts, "branches": si.branches,
+            "symmetry": cp_symmetry, **lb_info, **ls_info,
+        }
+
+    elif method in LS_METHODS:
+        # k fixé: une tentative de k-coloration; sinon minimisation depuis DSATUR
+        if k is not None:
+            (coloring, res), dt = timed(lambda: local_search_k_coloring(G, k, method=method, time_limit_s=timeout, csr=csr))
+            log = [(k, res)]
+            k_found = k if coloring is not None else None
+        else:
+            (k_found, coloring, log), dt = timed(lambda: local_search_min_coloring(G, method=method, time_limit_s=timeout, csr=csr))
+        info = {
+            "status": "FOUND" if coloring is not None else "NOT_FOUND",
+            "time_s": dt,
+            "k_found": k_found,
+            "iterations": sum(r.iterations for _, r in log),
+            "log": [{"k": kk, "cost": r.cost, "iterations": r.iterations, "time_s": r.time_s} for kk, r in log],
+        }
+
+    elif method == "dynamic":
+        # Scénario aléatoire depuis DSATUR, puis comparaison avec une re-résolution complète
+        dyn, dt = timed(lambda: simulate(G, steps=steps))
+        drift = [dyn.drift(fm, timeout_s=timeout, lb_budget=lb_budget) for fm in ("dsatur", "cp_min")]
+        # La coloration porte sur le graphe modifié: son CSR est reconstruit
+        G = dyn.G
+        csr = as_csr(G)
+        coloring = dyn.coloring
+        info = {
+            "status": "OK",
+            "time_s": dt,
+            "steps": steps,
+            "edges_final": G.number_of_edges(),
+            "repairs": drift[0].repairs,
+            "mean_latency_s": drift[0].mean_latency_s,
+            "max_latency_s": drift[0].max_latency_s,
+            "drift": [
+                {"full_method": d.full_method, "colors_full": d.colors_full, "full_time_s": d.full_time_s, "drift": d.drift}
+                for d in drift
+            ],
+        }
+
+    elif method == "hea":
+        # Population évaluée sur `jobs` processus; chaque meilleure coloration est
+        # affichée et, si --save-json, écrite aussitôt (status RUNNING)
+        def on_best(kk: int, best: dict, t: float) -> None:
+            print(f"  [{t:7.2f}s] k <= {kk}")
+            if save_json_path:
+                save_json(save_json_path, {
+                    "instance": inst_name, "method": method, "status": "RUNNING", "colors_used": kk,
+                    "time_s": t, "coloring": {str(v): c for v, c in best.items()},
+                })
+
+        if k is not None:
+            (coloring, res), dt = timed(lambda: hea_k_coloring(G, k, time_limit_s=timeout, jobs=jobs, csr=csr))
+            log = [(k, res)]
+            k_found = k if coloring is not None else None
+        else:
+            (k_found, coloring, log), dt = timed(
+                lambda: hea_min_coloring(G, time_limit_s=timeout, jobs=jobs, on_improvement=on_best, csr=csr)
+            )
+        info = {
+            "status": "FOUND" if coloring is not None else "NOT_FOUND",
+            "time_s": dt,
+            "k_found": k_found,
+            "jobs": jobs,
+            "generations": sum(r.generations for _, r in log),
+            "log": [
+                {"k": kk, "cost": r.cost, "generations": r.generations, "iterations": r.iterations, "time_s": r.time_s}
+                for kk, r in log
+            ],
+            "coloring": {str(v): c for v, c in (coloring or {}).items()},
+        }
 
     elif method == "cp_min":
-        lb = lower_bound_clique(G)
-        ub = max(lb, upper_bound_dsatur(G))
+        lb = lower.value
+        ub = max(lb, upper_bound_dsatur(G, csr))
+
+        # Bornes intermédiaires (stratégie "single"): affichées au fil de la recherche
+        def on_improvement(kk: int, bound: int, t: float) -> None:
+            print(f"  [{t:7.2f}s] k <= {kk} (borne inf. {max(lb, bound)})")
 
-        best_k, coloring, log = solve_min_coloring(nodes, edges, k_min=lb, k_max=ub, timeout_per_k_s=timeout)
+        best_k, coloring, log = solve_min_coloring_strategy(
+            cp_strategy, nodes, edges, k_min=lb, k_max=ub, timeout_s=timeout, on_improvement=on_improvement, **sym
+        )
         info = {
-            "lb_clique": lb,
+            "strategy": cp_strategy,
+            "symmetry": cp_symmetry,
+            **lb_info,
             "ub_dsatur": ub,
             "k_found": best_k,
-            "log": [{"k": kk, "status": s.status, "time_s": s.time_s} for kk, s in log],
+            "status": log[-1][1].status if log else "NO_RUN",
+            "time_s": sum(s.time_s for _, s in log) if cp_strategy == "iterative" else (log[-1][1].time_s if log else 0.0),
+            "conflicts": sum(s.conflicts for _, s in log),
+            "branches": sum(s.branches for _, s in log),
+            "log": [
+                {"k": kk, "status": s.status, "time_s": s.time_s, "lower_bound": s.lower_bound}
+                for kk, s in log
+            ],
         }
 
     else:
         raise ValueError(f"Méthode inconnue: {method}")
 
-    valid = is_valid_coloring(G, coloring)
+    valid = is_valid_coloring(G, coloring, csr)
     used = colors_used(coloring) if coloring is not None else 0
 
     print_result(G, inst_name, method, used, valid, info, k)
@@ -260,7 +436,8 @@ def run_method(G, pos, inst_name, method, timeout, k, show, save_fig, save_json_
         print(f"JSON sauvegardé -> {save_json_path}")
 
 
-def run_compare(inst, timeout, show, save_fig, save_json_path):
+def run_compare(inst, timeout, show, save_fig, save_json_path, cp_strategy="iterative", cp_symmetry="clique",
+                lb_budget=1.0):
     methods = ["greedy", "dsatur", "cp_min"]
     for m in methods:
         fig_path = None
@@ -274,16 +451,28 @@ def run_compare(inst, timeout, show, save_fig, save_json_path):
 
         show_now = show and (m == methods[-1])
         print(f"\n=== RUN {m} ===")
-        run_method(inst.graph, inst.pos, inst.name, m, timeout, None, show_now, fig_path, js_path)
+        run_method(inst.graph, inst.pos, inst.name, m, timeout, None, show_now, fig_path, js_path, cp_strategy, cp_symmetry,
+                   lb_budget, csr=inst.csr)
 
 
-def run_bench(timeout: float):
+def run_bench(timeout: float, cp_strategy: str = "iterative", cp_symmetry: str = "clique",
+              jobs: int = 1, fresh: bool = False, file_dirs: Optional[list] = None):
     if run_benchmark is None:
         raise SystemExit("benchmark.py manquant: crée src/benchmark.py ou enlève la méthode benchmark.")
     out_csv = "outputs/benchmark.csv"
     print("\n=== BENCHMARK ===")
-    print(f"Le CSV sera écrit ici : {out_csv}")
-    rows = run_benchmark(out_csv=out_csv, timeout_cp_min=timeout)
+    print(f"Le CSV sera écrit ici : {out_csv} (reprise: {'non' if fresh else 'oui'}, jobs={jobs})")
+
+    def progress(i: int, total: int, key: str, row) -> None:
+        print(f"  [{i}/{total}] {key} | colors={row.colors_used} | {row.time_s:.3f}s | {row.status}")
+
+    try:
+        rows = run_benchmark(out_csv=out_csv, timeout_cp_min=timeout, timeout_ls=timeout, cp_strategy=cp_strategy,
+                             cp_symmetry=[cp_symmetry], jobs=jobs, resume=not fresh, progress=progress,
+                             file_dirs=list(file_dirs or []))
+    except ValueError as e:
+        # Reprise refusée: le JSONL existant a été produit avec d'autres paramètres
+        raise SystemExit(f"{e} (option --fresh)")
     print(f"Benchmark terminé ({len(rows)} lignes) -> {out_csv}")
 
 # ==========================================================
@@ -301,6 +490,8 @@ def main() -> None:
         save_fig = cfg["save_fig"]
         save_js = cfg["save_json"]
         k = cfg["k"]
+        cp_strategy, cp_symmetry, lb_budget, warm_start, jobs = "iterative", "clique", 1.0, "greedy", 1
+        decompose, peel, steps = "off", False, 200
 
         if method == "benchmark":
             run_bench(timeout)
@@ -317,9 +508,15 @@ def main() -> None:
         save_fig = args.save_fig
         save_js = args.save_json
         k = args.k
+        cp_strategy = args.cp_strategy
+        cp_symmetry = args.cp_symmetry
+        lb_budget = float(args.lb_budget)
+        warm_start = args.warm_start
+        jobs = args.jobs
+        decompose, peel, steps = args.decompose, args.peel, args.steps
 
         if method == "benchmark":
-            run_bench(timeout)
+            run_bench(timeout, cp_strategy, cp_symmetry, jobs=args.jobs, fresh=args.fresh, file_dirs=args.bench_dir)
             return
 
         if args.instance is None:
@@ -327,9 +524,11 @@ def main() -> None:
         inst = load_instance(args.instance, n=args.n, p=args.p, seed=args.seed, w=args.w, h=args.h)
 
     if method == "compare":
-        run_compare(inst, timeout=timeout, show=show, save_fig=save_fig, save_json_path=save_js)
+        run_compare(inst, timeout=timeout, show=show, save_fig=save_fig, save_json_path=save_js,
+                    cp_strategy=cp_strategy, cp_symmetry=cp_symmetry, lb_budget=lb_budget)
     else:
-        run_method(inst.graph, inst.pos, inst.name, method, timeout, k, show, save_fig, save_js)
+        run_method(inst.graph, inst.pos, inst.name, method, timeout, k, show, save_fig, save_js, cp_strategy, cp_symmetry,
+                   lb_budget, warm_start, jobs, decompose, peel, steps, inst.csr)
 
 
 if __name__ == "__main__":
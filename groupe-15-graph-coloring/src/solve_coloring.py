@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Hashable, List, Optional, Tuple
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 from ortools.sat.python import cp_model
 
+from graph_csr import CSRGraph, colors_used_array, degree_order, dsatur_csr, from_edges, greedy_clique_csr, greedy_csr
+
 Node = Hashable
 Edge = Tuple[Node, Node]
 
@@ -17,6 +19,8 @@ class SolveInfo:
     time_s: float
     conflicts: int
     branches: int
+    # Borne inférieure prouvée sur le nombre de couleurs (modèle d'optimisation uniquement)
+    lower_bound: Optional[int] = None
 
 # --------------------------------------------------------------------
 # Conversion du code de statut OR-Tools vers une chaîne lisible
@@ -31,27 +35,59 @@ def _status(code: int) -> str:
     }.get(code, "UNKNOWN")
 
 # --------------------------------------------------------------------
-# Génère une solution gloutonne utilisée comme "hint" pour CP-SAT
-# Cela aide souvent le solveur à converger plus rapidement
+# Cassage de symétries (les k! permutations des couleurs sont équivalentes) :
+# -les sommets d'une clique reçoivent les couleurs 0..q-1 (fixées)
+# -option "value precedence": en parcourant les sommets (clique d'abord),
+#  la couleur c ne peut apparaître qu'après la couleur c-1
 # --------------------------------------------------------------------
-def _greedy_hint(nodes: List[Node], edges: List[Edge]) -> Dict[Node, int]:
-    # Construction de la liste d’adjacence et du degré de chaque nœud
-    adj = {v: set() for v in nodes}
-    deg = {v: 0 for v in nodes}
-    for u, v in edges:
-        if u != v and u in adj and v in adj:
-            adj[u].add(v); adj[v].add(u)
-            deg[u] += 1; deg[v] += 1
+def _clique_indices(csr: CSRGraph, clique: Optional[List[Node]]) -> List[int]:
+    # Clique fournie (nœuds) ou clique gloutonne; vérifiée sur le graphe
+    if clique is None:
+        return greedy_clique_csr(csr)
+    idx = [csr.index[v] for v in dict.fromkeys(clique) if v in csr.index]
+    adj = {i: set(csr.neighbors(i).tolist()) for i in idx}
+    if any(j not in adj[i] for a, i in enumerate(idx) for j in idx[a + 1:]):
+        raise ValueError("clique: les sommets fournis ne forment pas une clique")
+    return idx
+
+
+def _symmetry_order(csr: CSRGraph, clique_idx: List[int]) -> List[int]:
+    # Ordre de référence: la clique, puis les autres sommets dans l'ordre des nœuds
+    in_clique = set(clique_idx)
+    return list(clique_idx) + [i for i in range(csr.n) if i not in in_clique]
+
+
+def _canonical_hint(order: List[int], colors: List[int]) -> List[int]:
+    # Renumérote une coloration par ordre de première apparition le long de `order`:
+    # la clique reçoit 0..q-1 et la précédence des valeurs est respectée
+    remap: Dict[int, int] = {}
+    out = list(colors)
+    for i in order:
+        out[i] = remap.setdefault(colors[i], len(remap))
+    return out
 
-    order = sorted(nodes, key=lambda x: deg[x], reverse=True) # Ordre décroissant des nœuds selon leur degré
-    col: Dict[Node, int] = {}
-    for v in order:
-        used = {col[u] for u in adj[v] if u in col}
-        c = 0
-        while c in used:
-            c += 1
-        col[v] = c
-    return col
+
+def _add_symmetry_breaking(model, cvars: List, order: List[int], q: int, value_precedence: bool, k: int) -> None:
+    # cvars[i]: variable de couleur (0..k-1) du sommet d'indice i
+    for pos in range(q):
+        model.Add(cvars[order[pos]] == pos)
+    if not value_precedence or len(order) <= max(q, 1):
+        return
+    # prefix_max = max des couleurs des sommets déjà vus; le suivant vaut au plus prefix_max + 1
+    if q:
+        prefix_max = model.NewConstant(q - 1)
+        start = q
+    else:
+        model.Add(cvars[order[0]] == 0)
+        prefix_max = cvars[order[0]]
+        start = 1
+    for pos in range(start, len(order)):
+        v = cvars[order[pos]]
+        model.Add(v <= prefix_max + 1)
+        if pos < len(order) - 1:
+            nxt = model.NewIntVar(0, k - 1, f"pmax_{pos}")
+            model.AddMaxEquality(nxt, [prefix_max, v])
+            prefix_max = nxt
 
 # --------------------------------------------------------------------
 # Résolution du problème de k-coloration :
@@ -66,6 +102,12 @@ def solve_k_coloring(
     num_workers: int = 8,
     symmetry_breaking: bool = True,
     use_hints: bool = True,
+    # cassage de symétries: clique fixée aux couleurs 0..q-1 (gloutonne si None)
+    clique: Optional[List[Node]] = None,
+    value_precedence: bool = False,
+    # solution de départ (ex. recherche locale, voir local_search.py), même partielle
+    # ou avec conflits; à défaut, glouton par degré décroissant
+    hint: Optional[Dict[Node, int]] = None,
 ) -> Tuple[Optional[Dict[Node, int]], SolveInfo]:
     #Résout un problème de k-coloration avec CP-SAT.
     if k < 1:
@@ -76,25 +118,41 @@ def solve_k_coloring(
         return {}, SolveInfo("OPTIMAL", 0.0, 0, 0)
 
     edges = list(edges)
+    csr = from_edges(nodes, edges)
+    order = list(range(csr.n))
+    clique_idx: List[int] = []
+    if symmetry_breaking:
+        clique_idx = _clique_indices(csr, clique) or [0]
+        # Une clique de plus de k sommets: k-coloration impossible, inutile d'appeler CP-SAT
+        if len(clique_idx) > k:
+            return None, SolveInfo("INFEASIBLE", 0.0, 0, 0)
+        order = _symmetry_order(csr, clique_idx)
+
     # Création du modèle CP-SAT
     model = cp_model.CpModel()
     c = {v: model.NewIntVar(0, k - 1, f"c_{v}") for v in nodes}
+    cvars = [c[v] for v in nodes]
 
-     # on fixe arbitrairement la couleur du premier nœud à 0
+    # Clique fixée aux couleurs 0..q-1 (+ précédence des valeurs en option)
     if symmetry_breaking:
-        model.Add(c[nodes[0]] == 0)
+        _add_symmetry_breaking(model, cvars, order, len(clique_idx), value_precedence, k)
 
     # Contraintes: 2 sommets adjacents doivent avoir des couleurs différentes
-    for u, v in edges:
-        if u != v and u in c and v in c:
-            model.Add(c[u] != c[v])
+    for i, j in zip(csr.src.tolist(), csr.dst.tolist()):
+        model.Add(cvars[i] != cvars[j])
 
     # Ajout de hints (solution initiale) via une heuristique gloutonne(greedy)
+    # ou la solution fournie, renumérotés pour respecter le cassage de symétries
     if use_hints:
-        hint = _greedy_hint(nodes, edges)
-        if max(hint.values(), default=-1) < k:
-            for v, hv in hint.items():
-                model.AddHint(c[v], int(hv))
+        if hint is not None:
+            start = csr.to_array(hint).tolist()
+        else:
+            start = greedy_csr(csr, degree_order(csr).tolist()).tolist()
+        if max(start, default=-1) < k:
+            canonical = _canonical_hint([i for i in order if start[i] >= 0], start)
+            for var, hv, known in zip(cvars, canonical, start):
+                if known >= 0:
+                    model.AddHint(var, int(hv))
 
     # Paramétrage du solveur
     solver = cp_model.CpSolver()
@@ -129,16 +187,23 @@ def solve_min_coloring(
     timeout_per_k_s: float = 3.0,
     num_workers: int = 8,
     symmetry_breaking: bool = True,
+    clique: Optional[List[Node]] = None,
+    value_precedence: bool = False,
 ) -> Tuple[Optional[int], Optional[Dict[Node, int]], List[Tuple[int, SolveInfo]]]:
     # Recherche la coloration minimale en augmentant progressivement k.
     nodes = list(nodes)
     if not nodes:
         return 0, {}, []
+    edges = list(edges)
     # Par défaut, on autorise jusqu’à n couleurs
     if k_max is None:
         k_max = len(nodes)
 
-    k_min = max(1, int(k_min))
+    # La clique (calculée une seule fois) sert aussi de borne inférieure
+    if clique is None:
+        csr = from_edges(nodes, edges)
+        clique = [csr.nodes[i] for i in greedy_clique_csr(csr)]
+    k_min = max(1, int(k_min), len(clique))
     k_max = min(int(k_max), len(nodes))
     if k_min > k_max:
         return None, None, []
@@ -153,6 +218,8 @@ def solve_min_coloring(
             num_workers=num_workers,
             symmetry_breaking=symmetry_breaking,
             use_hints=True,
+            clique=clique,
+            value_precedence=value_precedence,
         )
         log.append((k, info))
         # Dès qu’une solution existe, k est minimal
@@ -161,3 +228,161 @@ def solve_min_coloring(
 
     # Aucune solution trouvée dans les bornes
     return None, None, log
+
+# --------------------------------------------------------------------
+# Recherche de la coloration minimale avec UN SEUL modèle CP-SAT :
+# -domaine des couleurs borné par une solution DSATUR (k_max couleurs)
+# -objectif: minimiser la plus grande couleur utilisée
+# Le solveur garde ses clauses apprises d'une amélioration à l'autre,
+# au lieu de repartir de zéro pour chaque k.
+# --------------------------------------------------------------------
+class _ImprovementLogger(cp_model.CpSolverSolutionCallback):
+    # Appelé par CP-SAT à chaque nouvelle meilleure solution
+    def __init__(self, max_color, on_improvement: Optional[Callable[[int, int, float], None]]):
+        super().__init__()
+        self._max_color = max_color
+        self._on_improvement = on_improvement
+        self.log: List[Tuple[int, SolveInfo]] = []
+
+    def on_solution_callback(self) -> None:
+        k = int(self.Value(self._max_color)) + 1
+        lb = int(self.BestObjectiveBound()) + 1
+        t = float(self.WallTime())
+        self.log.append((k, SolveInfo("FEASIBLE", t, int(self.NumConflicts()), int(self.NumBranches()), lb)))
+        if self._on_improvement is not None:
+            self._on_improvement(k, lb, t)
+
+
+def solve_min_coloring_single(
+    nodes: List[Node],
+    edges: List[Edge],
+    # bornes
+    k_min: int = 1,
+    k_max: Optional[int] = None,
+    # paramètres du solveur
+    timeout_s: float = 10.0,
+    num_workers: int = 8,
+    symmetry_breaking: bool = True,
+    on_improvement: Optional[Callable[[int, int, float], None]] = None,
+    clique: Optional[List[Node]] = None,
+    value_precedence: bool = False,
+) -> Tuple[Optional[int], Optional[Dict[Node, int]], List[Tuple[int, SolveInfo]]]:
+    # Même forme de retour que solve_min_coloring: (k*, coloration, log)
+    # log: une entrée par amélioration (k, SolveInfo FEASIBLE), puis l'entrée finale
+    # on_improvement(k, borne_inf, temps_s): appelé à chaque nouvelle solution
+    nodes = list(nodes)
+    if not nodes:
+        return 0, {}, []
+    edges = list(edges)
+
+    # Borne supérieure + hint: coloration DSATUR
+    csr = from_edges(nodes, edges)
+    dsatur = dsatur_csr(csr)
+    ub = colors_used_array(dsatur)
+    if k_max is None:
+        k_max = ub
+
+    order = list(range(csr.n))
+    clique_idx: List[int] = []
+    if symmetry_breaking:
+        clique_idx = _clique_indices(csr, clique) or [0]
+        order = _symmetry_order(csr, clique_idx)
+
+    # La clique est aussi une borne inférieure
+    k_min = max(1, int(k_min), len(clique_idx))
+    k_max = min(int(k_max), len(nodes))
+    if k_min > k_max:
+        return None, None, []
+
+    model = cp_model.CpModel()
+    c = {v: model.NewIntVar(0, k_max - 1, f"c_{v}") for v in nodes}
+    cvars = [c[v] for v in nodes]
+    max_color = model.NewIntVar(k_min - 1, k_max - 1, "max_color")
+    model.AddMaxEquality(max_color, cvars)
+
+    if symmetry_breaking:
+        _add_symmetry_breaking(model, cvars, order, len(clique_idx), value_precedence, k_max)
+
+    for i, j in zip(csr.src.tolist(), csr.dst.tolist()):
+        model.Add(cvars[i] != cvars[j])
+
+    if ub <= k_max:
+        for var, hv in zip(cvars, _canonical_hint(order, dsatur.tolist())):
+            model.AddHint(var, int(hv))
+
+    model.Minimize(max_color)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(timeout_s)
+    solver.parameters.num_search_workers = int(num_workers)
+
+    logger = _ImprovementLogger(max_color, on_improvement)
+    st = solver.Solve(model, logger)
+
+    log = list(logger.log)
+    found = st in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    best_k = int(solver.Value(max_color)) + 1 if found else None
+    log.append((best_k if found else k_max, SolveInfo(
+        status=_status(st),
+        time_s=float(solver.WallTime()),
+        conflicts=int(solver.NumConflicts()),
+        branches=int(solver.NumBranches()),
+        lower_bound=int(solver.BestObjectiveBound()) + 1 if found else None,
+    )))
+    if not found:
+        return None, None, log
+    return best_k, {v: int(solver.Value(c[v])) for v in nodes}, log
+
+
+# --------------------------------------------------------------------
+# Modes de cassage de symétries (CLI / benchmark)
+# -"first": premier nœud fixé à 0 (comportement d'origine)
+# -"clique": clique fixée aux couleurs 0..q-1 (défaut)
+# -"precedence": clique + précédence des valeurs
+# --------------------------------------------------------------------
+CP_SYMMETRY_MODES = ("first", "clique", "precedence")
+
+
+def symmetry_options(mode: str, nodes: List[Node], clique: Optional[List[Node]] = None) -> dict:
+    # Arguments (clique, value_precedence) à passer aux solveurs pour un mode donné
+    if mode == "first":
+        return {"clique": list(nodes[:1]), "value_precedence": False}
+    if mode == "clique":
+        return {"clique": clique, "value_precedence": False}
+    if mode == "precedence":
+        return {"clique": clique, "value_precedence": True}
+    raise ValueError(f"Mode de symétrie inconnu: {mode} ({'/'.join(CP_SYMMETRY_MODES)})")
+
+
+# --------------------------------------------------------------------
+# Choix de la stratégie de minimisation (même signature de retour)
+# -"iterative": un modèle par k, de k_min à k_max (timeout par k)
+# -"single": un seul modèle d'optimisation (timeout global)
+# --------------------------------------------------------------------
+CP_MIN_STRATEGIES = ("iterative", "single")
+
+
+def solve_min_coloring_strategy(
+    strategy: str,
+    nodes: List[Node],
+    edges: List[Edge],
+    k_min: int = 1,
+    k_max: Optional[int] = None,
+    timeout_s: float = 3.0,
+    num_workers: int = 8,
+    on_improvement: Optional[Callable[[int, int, float], None]] = None,
+    clique: Optional[List[Node]] = None,
+    value_precedence: bool = False,
+) -> Tuple[Optional[int], Optional[Dict[Node, int]], List[Tuple[int, SolveInfo]]]:
+    if strategy == "iterative":
+        return solve_min_coloring(
+            nodes, edges, k_min=k_min, k_max=k_max, timeout_per_k_s=timeout_s, num_workers=num_workers,
+            clique=clique, value_precedence=value_precedence,
+        )
+    if strategy == "single":
+        return solve_min_coloring_single(
+            nodes, edges, k_min=k_min, k_max=k_max, timeout_s=timeout_s,
+            num_workers=num_workers, on_improvement=on_improvement,
+            clique=clique, value_precedence=value_precedence,
+        )
+    raise ValueError(f"Stratégie inconnue: {strategy} ({'/'.join(CP_MIN_STRATEGIES)})")
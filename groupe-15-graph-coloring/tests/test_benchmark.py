@@ -0,0 +1,48 @@
+import csv
+
+import pytest
+
+from benchmark import BenchConfig, BenchTask, run_campaign
+
+
+def _tasks(path):
+    return [
+        BenchTask("grid", "w=3;h=3", 0, "dsatur", {"name": "grid", "w": 3, "h": 3}),
+        BenchTask("files", "file=g.col", 0, "greedy", {"file": str(path)}),
+    ]
+
+
+def _csv_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_resume_retries_errors_without_duplicate_csv_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # cache des fichiers lus (outputs/cache) relatif au dossier courant
+    out_csv, out_jsonl = str(tmp_path / "b.csv"), str(tmp_path / "b.jsonl")
+    graph_file = tmp_path / "g.col"
+    tasks, config = _tasks(graph_file), BenchConfig(timeout_ls=0.1)
+
+    rows = run_campaign(tasks, config, out_csv, out_jsonl)
+    assert rows[1].status.startswith("ERROR")  # fichier absent
+
+    graph_file.write_text("p edge 3 2\ne 1 2\ne 2 3\n")
+    seen = []
+    rows = run_campaign(tasks, config, out_csv, out_jsonl, progress=lambda i, n, key, row: seen.append(key))
+    assert len(seen) == 1  # seule la tâche ERROR est relancée
+    assert [r.status for r in rows] == ["OK", "OK"]
+    assert [r["status"] for r in _csv_rows(out_csv)] == ["OK", "OK"]
+
+
+def test_resume_refuses_other_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    out_csv, out_jsonl = str(tmp_path / "b.csv"), str(tmp_path / "b.jsonl")
+    tasks = _tasks(tmp_path / "g.col")[:1]
+    run_campaign(tasks, BenchConfig(timeout_ls=0.1), out_csv, out_jsonl)
+
+    # cp_workers ne fait pas partie de la configuration comparée
+    run_campaign(tasks, BenchConfig(timeout_ls=0.1, cp_workers=1), out_csv, out_jsonl)
+    with pytest.raises(ValueError):
+        run_campaign(tasks, BenchConfig(timeout_ls=0.5), out_csv, out_jsonl)
+    rows = run_campaign(tasks, BenchConfig(timeout_ls=0.5), out_csv, out_jsonl, resume=False)
+    assert len(rows) == 1 and len(_csv_rows(out_csv)) == 1
@@ -0,0 +1,23 @@
+import networkx as nx
+
+from dynamic import DynamicColoring, simulate
+
+
+def test_repairs_stay_valid_after_edge_swap():
+    dyn = DynamicColoring(nx.path_graph(4))
+    dyn.remove_edge(2, 3)
+    dyn.add_edge(0, 2)
+    assert dyn.is_valid()
+    assert dyn.coloring[0] != dyn.coloring[2]
+
+
+def test_simulate_keeps_coloring_valid():
+    dyn = simulate(nx.gnp_random_graph(40, 0.15, seed=3), steps=80, seed=3, num_workers=1)
+    assert dyn.num_workers == 1
+    assert dyn.is_valid()
+
+
+def test_simulate_on_complete_graph():
+    dyn = simulate(nx.complete_graph(4), steps=5, seed=1, num_workers=1)
+    assert len(dyn.history) == 5
+    assert dyn.is_valid()
@@ -0,0 +1,44 @@
+import networkx as nx
+
+from graph_csr import as_csr, is_valid_coloring
+from heuristics import dsatur_coloring, greedy_coloring
+from instances import load_instance
+
+
+def _swap_edge(G: nx.Graph) -> None:
+    # Même nombre de sommets et d'arêtes, graphe différent
+    G.remove_edge(2, 3)
+    G.add_edge(0, 2)
+
+
+def test_validation_sees_edge_swap():
+    G = nx.path_graph(4)
+    coloring = {0: 0, 1: 1, 2: 0, 3: 1}
+    assert is_valid_coloring(G, coloring)
+    _swap_edge(G)
+    assert not is_valid_coloring(G, coloring)  # arête (0, 2) monochrome
+
+
+def test_heuristics_see_edge_swap():
+    G = nx.path_graph(4)
+    greedy_coloring(G)
+    dsatur_coloring(G)
+    _swap_edge(G)
+    for coloring in (greedy_coloring(G), dsatur_coloring(G)):
+        assert is_valid_coloring(G, coloring)
+
+
+def test_as_csr_rebuilds_after_edge_swap():
+    G = nx.path_graph(4)
+    before = as_csr(G)
+    _swap_edge(G)
+    after = as_csr(G)
+    assert sorted(zip(before.src.tolist(), before.dst.tolist())) != sorted(zip(after.src.tolist(), after.dst.tolist()))
+
+
+def test_instance_csr_matches_graph():
+    inst = load_instance("erdos", n=30, p=0.2, seed=1)
+    assert inst.csr.n == inst.graph.number_of_nodes()
+    assert inst.csr.m == inst.graph.number_of_edges()
+    coloring = dsatur_coloring(inst.graph, csr=inst.csr)
+    assert is_valid_coloring(inst.graph, coloring, inst.csr)
@@ -0,0 +1,27 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from graph_io import load_graph_file
+
+COL = "p edge 4 3\ne 1 2\ne 2 3\ne 3 4\n"
+
+
+def _load(args):
+    path, cache_dir = args
+    return int(load_graph_file(path, cache_dir).src.size)
+
+
+def test_concurrent_loads_share_the_cache(tmp_path):
+    path, cache_dir = tmp_path / "g.col", tmp_path / "cache"
+    path.write_text(COL)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(_load, [(str(path), str(cache_dir))] * 8)) == [3] * 8
+    assert [f.endswith(".npz") for f in os.listdir(cache_dir)] == [True]
+
+
+def test_unwritable_cache_is_not_fatal(tmp_path):
+    path = tmp_path / "g.col"
+    path.write_text(COL)
+    blocker = tmp_path / "cache"
+    blocker.write_text("")  # un fichier à la place du dossier de cache
+    assert load_graph_file(str(path), str(blocker)).src.size == 3
@@ -0,0 +1,27 @@
+import time
+
+import networkx as nx
+
+from graph_csr import from_networkx
+from lower_bounds import compute_lower_bound
+
+
+def test_zero_budget_keeps_greedy_bound_only():
+    G = nx.gnp_random_graph(200, 0.3, seed=2)
+    lb = compute_lower_bound(G, time_budget_s=0.0)
+    assert lb.method == "greedy" and lb.value >= 2
+    assert lb.details["bnb"] == {"skipped": "budget"}
+    assert lb.details["spectral"] == {"skipped": "budget"}
+
+
+def test_budget_is_respected_on_dense_graph():
+    G = nx.fast_gnp_random_graph(800, 0.5, seed=1)
+    csr = from_networkx(G)
+    t0 = time.perf_counter()
+    compute_lower_bound(G, time_budget_s=0.3, csr=csr)
+    assert time.perf_counter() - t0 < 0.6
+
+
+def test_small_graph_bound_is_exact():
+    lb = compute_lower_bound(nx.complete_graph(5))
+    assert lb.value == 5 and lb.exact